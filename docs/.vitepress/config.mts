@@ -54,6 +54,7 @@ export default defineConfig({
               items: [
                 { text: 'データセット', link: '/ja/reference/datasets' },
                 { text: 'トランスフォーム', link: '/ja/reference/transforms' },
+                { text: 'データローディング', link: '/ja/reference/data' },
                 { text: 'IO ユーティリティ', link: '/ja/reference/io' },
               ],
             },
@@ -99,6 +100,7 @@ export default defineConfig({
               items: [
                 { text: 'Datasets', link: '/en/reference/datasets' },
                 { text: 'Transforms', link: '/en/reference/transforms' },
+                { text: 'Data Loading', link: '/en/reference/data' },
                 { text: 'IO Utilities', link: '/en/reference/io' },
               ],
             },
@@ -0,0 +1,24 @@
+use pyo3::prelude::*;
+use pyo3::types::PyByteArray;
+
+/// Element types whose in-memory representation can be exposed as raw bytes.
+///
+/// # Safety
+///
+/// Implementors must be plain-old-data without padding or invalid bit patterns.
+pub unsafe trait Element: Copy {}
+
+unsafe impl Element for u8 {}
+unsafe impl Element for i32 {}
+unsafe impl Element for i64 {}
+unsafe impl Element for f32 {}
+
+pub fn as_bytes<T: Element>(values: &[T]) -> &[u8] {
+    // SAFETY: `Element` guarantees `T` is plain-old-data, so every byte of the
+    // slice is initialized and may be viewed as `u8`.
+    unsafe { std::slice::from_raw_parts(values.as_ptr().cast::<u8>(), size_of_val(values)) }
+}
+
+pub fn to_bytearray<'py, T: Element>(py: Python<'py>, values: &[T]) -> Bound<'py, PyByteArray> {
+    PyByteArray::new(py, as_bytes(values))
+}
@@ -0,0 +1,97 @@
+use crate::pen::GlyphMetrics;
+
+pub(super) type SampleLocation = (usize, Option<usize>, u32, usize, usize);
+
+pub(super) struct GlyphBatch {
+    pub(super) types: Vec<u8>,
+    pub(super) coords: Vec<u8>,
+    pub(super) offsets: Vec<i64>,
+    pub(super) style_indices: Vec<i64>,
+    pub(super) content_indices: Vec<i64>,
+}
+
+impl GlyphBatch {
+    pub(super) fn with_capacity(len: usize) -> Self {
+        let mut offsets = Vec::with_capacity(len + 1);
+        offsets.push(0);
+        Self {
+            types: Vec::new(),
+            coords: Vec::new(),
+            offsets,
+            style_indices: Vec::with_capacity(len),
+            content_indices: Vec::with_capacity(len),
+        }
+    }
+
+    pub(super) fn push(
+        &mut self,
+        types: &[u8],
+        coords: &[u8],
+        style_idx: usize,
+        content_idx: usize,
+    ) {
+        self.types.extend_from_slice(types);
+        self.coords.extend_from_slice(coords);
+        self.offsets.push(self.types.len() as i64);
+        self.style_indices.push(style_idx as i64);
+        self.content_indices.push(content_idx as i64);
+    }
+}
+
+pub(super) struct SampleLocations {
+    pub(super) font_indices: Vec<i64>,
+    pub(super) instance_indices: Vec<i64>,
+    pub(super) codepoints: Vec<i64>,
+    pub(super) style_indices: Vec<i64>,
+    pub(super) content_indices: Vec<i64>,
+}
+
+impl SampleLocations {
+    pub(super) fn with_capacity(len: usize) -> Self {
+        Self {
+            font_indices: Vec::with_capacity(len),
+            instance_indices: Vec::with_capacity(len),
+            codepoints: Vec::with_capacity(len),
+            style_indices: Vec::with_capacity(len),
+            content_indices: Vec::with_capacity(len),
+        }
+    }
+
+    pub(super) fn push(&mut self, location: SampleLocation) {
+        let (font_idx, instance, codepoint, style_idx, content_idx) = location;
+        self.font_indices.push(font_idx as i64);
+        self.instance_indices
+            .push(instance.map_or(-1, |inst_idx| inst_idx as i64));
+        self.codepoints.push(i64::from(codepoint));
+        self.style_indices.push(style_idx as i64);
+        self.content_indices.push(content_idx as i64);
+    }
+}
+
+pub(super) struct MetricColumns {
+    pub(super) commands: Vec<i64>,
+    pub(super) contours: Vec<i64>,
+    pub(super) points: Vec<i64>,
+    pub(super) bbox: Vec<f32>,
+    pub(super) empty: Vec<u8>,
+}
+
+impl MetricColumns {
+    pub(super) fn with_capacity(len: usize) -> Self {
+        Self {
+            commands: Vec::with_capacity(len),
+            contours: Vec::with_capacity(len),
+            points: Vec::with_capacity(len),
+            bbox: Vec::with_capacity(len * 4),
+            empty: Vec::with_capacity(len),
+        }
+    }
+
+    pub(super) fn push(&mut self, metrics: &GlyphMetrics) {
+        self.commands.push(i64::from(metrics.commands));
+        self.contours.push(i64::from(metrics.contours));
+        self.points.push(i64::from(metrics.points));
+        self.bbox.extend_from_slice(&metrics.bbox);
+        self.empty.push(u8::from(metrics.is_empty()));
+    }
+}
@@ -0,0 +1,103 @@
+use std::{
+    collections::{BTreeMap, HashMap},
+    sync::{Arc, Mutex, MutexGuard, PoisonError},
+};
+
+use crate::pen::Outline;
+
+pub(super) struct CacheInfo {
+    pub(super) hits: u64,
+    pub(super) misses: u64,
+    pub(super) evictions: u64,
+    pub(super) entries: usize,
+    pub(super) bytes: usize,
+    pub(super) capacity: usize,
+}
+
+#[derive(Default)]
+struct CacheState {
+    outlines: HashMap<usize, (Arc<Outline>, u64)>,
+    recency: BTreeMap<u64, usize>,
+    tick: u64,
+    bytes: usize,
+    hits: u64,
+    misses: u64,
+    evictions: u64,
+}
+
+pub(super) struct OutlineCache {
+    capacity: usize,
+    state: Mutex<CacheState>,
+}
+
+impl OutlineCache {
+    pub(super) fn new(capacity: usize) -> Self {
+        Self {
+            capacity,
+            state: Mutex::new(CacheState::default()),
+        }
+    }
+
+    pub(super) fn get(&self, key: usize) -> Option<Arc<Outline>> {
+        let mut guard = self.lock();
+        let state = &mut *guard;
+        let Some((outline, stamp)) = state.outlines.get_mut(&key) else {
+            state.misses += 1;
+            return None;
+        };
+
+        state.tick += 1;
+        state.recency.remove(&*stamp);
+        state.recency.insert(state.tick, key);
+        *stamp = state.tick;
+        state.hits += 1;
+        Some(Arc::clone(outline))
+    }
+
+    pub(super) fn insert(&self, key: usize, outline: Arc<Outline>) {
+        let size = outline.nbytes();
+        if size > self.capacity {
+            return;
+        }
+
+        let mut guard = self.lock();
+        let state = &mut *guard;
+        state.tick += 1;
+        if let Some((previous, stamp)) = state.outlines.insert(key, (outline, state.tick)) {
+            state.recency.remove(&stamp);
+            state.bytes -= previous.nbytes();
+        }
+        state.recency.insert(state.tick, key);
+        state.bytes += size;
+
+        while state.bytes > self.capacity {
+            let Some((_, evicted)) = state.recency.pop_first() else {
+                break;
+            };
+            if let Some((outline, _)) = state.outlines.remove(&evicted) {
+                state.bytes -= outline.nbytes();
+                state.evictions += 1;
+            }
+        }
+    }
+
+    pub(super) fn clear(&self) {
+        *self.lock() = CacheState::default();
+    }
+
+    pub(super) fn info(&self) -> CacheInfo {
+        let state = self.lock();
+        CacheInfo {
+            hits: state.hits,
+            misses: state.misses,
+            evictions: state.evictions,
+            entries: state.outlines.len(),
+            bytes: state.bytes,
+            capacity: self.capacity,
+        }
+    }
+
+    fn lock(&self) -> MutexGuard<'_, CacheState> {
+        self.state.lock().unwrap_or_else(PoisonError::into_inner)
+    }
+}
@@ -1,21 +1,27 @@
-use std::sync::Arc;
+use std::sync::{Arc, OnceLock};
 
 use memmap2::Mmap;
 use pyo3::prelude::*;
-use skrifa::raw::{FileRef, TableProvider};
+use skrifa::raw::{
+    FileRef, TableProvider,
+    types::{F2Dot14, NameId},
+};
 use skrifa::{
     GlyphId, MetadataProvider,
     instance::{Location, LocationRef, Size},
-    outline::DrawSettings,
+    outline::{DrawSettings, OutlineGlyphCollection, OutlinePen},
 };
 
 use super::io::map_font;
+use super::snapshot::{Reader, Writer};
 use crate::{
     error::{py_err, py_index_err},
-    pen::SegmentPen,
+    pen::{GlyphMetrics, MetricsPen, Outline, OutlineSpec, SegmentPen},
 };
 
 pub(super) struct FontEntry {
+    // Borrows from `data`; declared first so it is dropped before the mapping.
+    outlines: OnceLock<OutlineGlyphCollection<'static>>,
     data: Arc<Mmap>,
     face_index: u32,
     pub(super) path: String,
@@ -23,6 +29,11 @@ pub(super) struct FontEntry {
     glyph_ids: Vec<GlyphId>,
     units_per_em: f32,
     locations: Vec<Location>,
+    // One name per instance, read from the name table while indexing.
+    pub(super) style_names: Vec<String>,
+    // Per-sample measurements in sample order (instance-major), filled by the
+    // metadata pass.
+    metrics: OnceLock<Vec<GlyphMetrics>>,
 }
 
 impl FontEntry {
@@ -53,98 +64,165 @@ impl FontEntry {
         Ok(entries)
     }
 
+    pub(super) fn count_glyphs(path: &str) -> PyResult<u64> {
+        let mapped = map_font(path)?;
+        let parsed = FileRef::new(&mapped[..])
+            .map_err(|err| py_err(format!("failed to parse '{path}': {err}")))?;
+
+        let mut total = 0;
+        for face in parsed.fonts() {
+            let face = face.map_err(|err| py_err(format!("failed to parse '{path}': {err}")))?;
+            let maxp = face
+                .maxp()
+                .map_err(|_| py_err(format!("font '{path}' is missing a maxp table")))?;
+            total += u64::from(maxp.num_glyphs());
+        }
+        Ok(total)
+    }
+
+    pub(super) fn encode(&self, writer: &mut Writer) {
+        writer.u32(self.face_index);
+        writer.f32(self.units_per_em);
+        writer.u32s(&self.codepoints);
+        let glyph_ids: Vec<u32> = self.glyph_ids.iter().map(|id| id.to_u32()).collect();
+        writer.u32s(&glyph_ids);
+        writer.count(self.locations.len());
+        for location in &self.locations {
+            let coords: Vec<i16> = location.coords().iter().map(|c| c.to_bits()).collect();
+            writer.i16s(&coords);
+        }
+        writer.count(self.style_names.len());
+        for name in &self.style_names {
+            writer.str(name);
+        }
+        writer.flag(self.metrics.get().is_some());
+        if let Some(metrics) = self.metrics.get() {
+            writer.count(metrics.len());
+            for glyph in metrics {
+                writer.u32(glyph.commands);
+                writer.u32(glyph.contours);
+                writer.u32(glyph.points);
+                glyph.bbox.iter().for_each(|&value| writer.f32(value));
+            }
+        }
+    }
+
+    pub(super) fn decode(reader: &mut Reader<'_>, path: &str, data: Arc<Mmap>) -> PyResult<Self> {
+        let face_index = reader.u32()?;
+        let units_per_em = reader.f32()?;
+        let codepoints = reader.u32s()?;
+        let glyph_ids: Vec<GlyphId> = reader.u32s()?.into_iter().map(GlyphId::new).collect();
+        if glyph_ids.len() != codepoints.len() {
+            return Err(py_err(format!(
+                "font index snapshot for '{path}' is corrupt"
+            )));
+        }
+
+        let locations = (0..reader.count()?)
+            .map(|_| {
+                let coords = reader.i16s()?;
+                let mut location = Location::new(coords.len());
+                for (coord, bits) in location.coords_mut().iter_mut().zip(coords) {
+                    *coord = F2Dot14::from_bits(bits);
+                }
+                Ok(location)
+            })
+            .collect::<PyResult<Vec<_>>>()?;
+        let style_names = (0..reader.count()?)
+            .map(|_| reader.str().map(str::to_string))
+            .collect::<PyResult<Vec<_>>>()?;
+        if style_names.len() != locations.len().max(1) {
+            return Err(py_err(format!(
+                "font index snapshot for '{path}' is corrupt"
+            )));
+        }
+
+        let metrics = OnceLock::new();
+        if reader.flag()? {
+            let decoded = (0..reader.count()?)
+                .map(|_| {
+                    Ok(GlyphMetrics {
+                        commands: reader.u32()?,
+                        contours: reader.u32()?,
+                        points: reader.u32()?,
+                        bbox: [reader.f32()?, reader.f32()?, reader.f32()?, reader.f32()?],
+                    })
+                })
+                .collect::<PyResult<Vec<_>>>()?;
+            if decoded.len() != codepoints.len() * style_names.len() {
+                return Err(py_err(format!(
+                    "font index snapshot for '{path}' is corrupt"
+                )));
+            }
+            let _ = metrics.set(decoded);
+        }
+
+        Ok(Self {
+            outlines: OnceLock::new(),
+            data,
+            face_index,
+            path: path.to_string(),
+            codepoints,
+            glyph_ids,
+            units_per_em,
+            locations,
+            style_names,
+            metrics,
+        })
+    }
+
     pub(super) fn glyph(
         &self,
         codepoint: u32,
         instance_index: Option<usize>,
-    ) -> PyResult<(Vec<i32>, Vec<f32>)> {
-        let glyph_id = self.lookup_glyph(codepoint)?;
-        let font = skrifa::FontRef::from_index(&self.data[..], self.face_index).map_err(|err| {
-            py_err(format!(
-                "failed to parse '{}' (face {}): {err}",
-                self.path, self.face_index
-            ))
-        })?;
-        let glyph = font.outline_glyphs().get(glyph_id).ok_or_else(|| {
-            py_err(format!(
-                "glyph id {} missing from '{}'",
-                glyph_id.to_u32(),
-                self.path
-            ))
-        })?;
-
-        let mut pen = SegmentPen::new(self.units_per_em);
-        glyph
-            .draw(
-                DrawSettings::unhinted(Size::unscaled(), self.location_ref(instance_index)?),
-                &mut pen,
-            )
-            .map_err(|err| py_err(format!("failed to draw glyph: {err}")))?;
-
+        spec: OutlineSpec,
+    ) -> PyResult<Outline> {
+        let mut pen = SegmentPen::new(self.units_per_em, spec);
+        self.draw(codepoint, instance_index, &mut pen)?;
         Ok(pen.finish())
     }
 
-    pub(super) fn instance_count(&self) -> usize {
-        self.locations.len().max(1)
+    pub(super) fn metrics(&self) -> Option<&[GlyphMetrics]> {
+        self.metrics.get().map(Vec::as_slice)
     }
 
-    pub(super) fn is_variable(&self) -> bool {
-        !self.locations.is_empty()
+    pub(super) fn set_metrics(&self, metrics: Vec<GlyphMetrics>) {
+        debug_assert_eq!(metrics.len(), self.codepoints.len() * self.instance_count());
+        let _ = self.metrics.set(metrics);
     }
 
-    pub(super) fn named_instance_names(&self) -> Vec<Option<String>> {
-        if !self.is_variable() {
-            return vec![];
-        }
-
-        let font = match skrifa::FontRef::from_index(&self.data[..], self.face_index) {
-            Ok(f) => f,
-            Err(_) => return vec![],
-        };
-
-        font.named_instances()
+    pub(super) fn measure_instance(&self, inst_idx: usize) -> PyResult<Vec<GlyphMetrics>> {
+        let instance = self.is_variable().then_some(inst_idx);
+        self.codepoints
             .iter()
-            .map(|inst| {
-                let name_id = inst.subfamily_name_id();
-                font.localized_strings(name_id)
-                    .english_or_first()
-                    .map(|s| s.to_string())
+            .map(|&codepoint| {
+                let mut pen = MetricsPen::new(self.units_per_em);
+                self.draw(codepoint, instance, &mut pen)?;
+                Ok(pen.finish())
             })
             .collect()
     }
 
-    pub(super) fn family_name(&self) -> String {
-        let font = match skrifa::FontRef::from_index(&self.data[..], self.face_index) {
-            Ok(f) => f,
-            Err(_) => return String::new(),
-        };
-
-        [
-            skrifa::raw::types::NameId::TYPOGRAPHIC_FAMILY_NAME,
-            skrifa::raw::types::NameId::FAMILY_NAME,
-        ]
-        .into_iter()
-        .find_map(|id| {
-            font.localized_strings(id)
-                .english_or_first()
-                .map(|s| s.to_string())
-        })
-        .unwrap_or_default()
+    // Keeps the code points whose flag is set, in every instance at once so
+    // that samples stay laid out as instance-major blocks of equal size.
+    pub(super) fn retain_codepoints(&mut self, keep: &[bool]) {
+        debug_assert_eq!(keep.len(), self.codepoints.len());
+        let mut flags = keep.iter();
+        self.codepoints.retain(|_| *flags.next().unwrap_or(&true));
+        let mut flags = keep.iter();
+        self.glyph_ids.retain(|_| *flags.next().unwrap_or(&true));
+        if let Some(metrics) = self.metrics.get_mut() {
+            let mut flags = keep.iter().cycle();
+            metrics.retain(|_| *flags.next().unwrap_or(&true));
+        }
     }
 
-    pub(super) fn subfamily_name(&self) -> Option<String> {
-        let font = skrifa::FontRef::from_index(&self.data[..], self.face_index).ok()?;
+    pub(super) fn instance_count(&self) -> usize {
+        self.locations.len().max(1)
+    }
 
-        [
-            skrifa::raw::types::NameId::TYPOGRAPHIC_SUBFAMILY_NAME,
-            skrifa::raw::types::NameId::SUBFAMILY_NAME,
-        ]
-        .into_iter()
-        .find_map(|id| {
-            font.localized_strings(id)
-                .english_or_first()
-                .map(|s| s.to_string())
-        })
+    pub(super) fn is_variable(&self) -> bool {
+        !self.locations.is_empty()
     }
 
     fn from_face(
@@ -174,13 +252,15 @@ impl FontEntry {
         mappings.sort_unstable_by_key(|entry| entry.0);
         let (codepoints, glyph_ids): (Vec<_>, Vec<_>) = mappings.into_iter().unzip();
 
-        let locations = font
+        let locations: Vec<Location> = font
             .named_instances()
             .iter()
             .map(|inst| inst.location())
             .collect();
+        let style_names = style_names(&font, !locations.is_empty());
 
         Ok(Self {
+            outlines: OnceLock::new(),
             path: base_path.to_string(),
             data,
             face_index,
@@ -188,9 +268,54 @@ impl FontEntry {
             glyph_ids,
             units_per_em: upem as f32,
             locations,
+            style_names,
+            metrics: OnceLock::new(),
         })
     }
 
+    fn draw(
+        &self,
+        codepoint: u32,
+        instance_index: Option<usize>,
+        pen: &mut impl OutlinePen,
+    ) -> PyResult<()> {
+        let glyph_id = self.lookup_glyph(codepoint)?;
+        let glyph = self.outlines()?.get(glyph_id).ok_or_else(|| {
+            py_err(format!(
+                "glyph id {} missing from '{}'",
+                glyph_id.to_u32(),
+                self.path
+            ))
+        })?;
+
+        glyph
+            .draw(
+                DrawSettings::unhinted(Size::unscaled(), self.location_ref(instance_index)?),
+                pen,
+            )
+            .map_err(|err| py_err(format!("failed to draw glyph: {err}")))?;
+        Ok(())
+    }
+
+    fn outlines(&self) -> PyResult<&OutlineGlyphCollection<'static>> {
+        if let Some(outlines) = self.outlines.get() {
+            return Ok(outlines);
+        }
+
+        // SAFETY: the mapping lives as long as `self.data`, and `self.outlines`
+        // never hands out the `'static` borrows beyond the lifetime of `self`.
+        let data: &'static [u8] =
+            unsafe { std::slice::from_raw_parts(self.data.as_ptr(), self.data.len()) };
+        let font = skrifa::FontRef::from_index(data, self.face_index).map_err(|err| {
+            py_err(format!(
+                "failed to parse '{}' (face {}): {err}",
+                self.path, self.face_index
+            ))
+        })?;
+        let outlines = font.outline_glyphs();
+        Ok(self.outlines.get_or_init(|| outlines))
+    }
+
     fn lookup_glyph(&self, codepoint: u32) -> PyResult<GlyphId> {
         self.codepoints
             .binary_search(&codepoint)
@@ -217,3 +342,49 @@ impl FontEntry {
         }
     }
 }
+
+fn style_names(font: &skrifa::FontRef<'_>, is_variable: bool) -> Vec<String> {
+    let family_name = family_name(font);
+    let instance_names: Vec<Option<String>> = if is_variable {
+        font.named_instances()
+            .iter()
+            .map(|inst| localized_name(font, inst.subfamily_name_id()))
+            .collect()
+    } else {
+        vec![]
+    };
+
+    if instance_names.is_empty() {
+        return vec![match subfamily_name(font) {
+            Some(subfamily) => format!("{family_name} {subfamily}"),
+            None => family_name,
+        }];
+    }
+
+    instance_names
+        .into_iter()
+        .map(|name| match name.filter(|name| !name.is_empty()) {
+            Some(instance_name) => format!("{family_name} {instance_name}"),
+            None => family_name.clone(),
+        })
+        .collect()
+}
+
+fn family_name(font: &skrifa::FontRef<'_>) -> String {
+    [NameId::TYPOGRAPHIC_FAMILY_NAME, NameId::FAMILY_NAME]
+        .into_iter()
+        .find_map(|id| localized_name(font, id))
+        .unwrap_or_default()
+}
+
+fn subfamily_name(font: &skrifa::FontRef<'_>) -> Option<String> {
+    [NameId::TYPOGRAPHIC_SUBFAMILY_NAME, NameId::SUBFAMILY_NAME]
+        .into_iter()
+        .find_map(|id| localized_name(font, id))
+}
+
+fn localized_name(font: &skrifa::FontRef<'_>, id: NameId) -> Option<String> {
+    font.localized_strings(id)
+        .english_or_first()
+        .map(|s| s.to_string())
+}
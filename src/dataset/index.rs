@@ -1,67 +1,552 @@
+use super::batch::{MetricColumns, SampleLocation, SampleLocations};
 use super::entry::FontEntry;
+use super::io::{FileStamp, discover_font_files, stat_files};
+use super::snapshot::{Reader, Writer, index_key, read_index, write_index};
 use crate::error::py_index_err;
+use crate::parallel::par_map;
+use crate::pen::GlyphMetrics;
 use pyo3::prelude::*;
+use std::collections::{HashMap, HashSet};
+use std::path::PathBuf;
 
 pub(super) struct DatasetIndex {
     pub(super) sample_offsets: Vec<usize>,
     pub(super) inst_offsets: Vec<usize>,
     pub(super) content_classes: Vec<u32>,
+    // Content class of every code point of each font, aligned with `codepoints`.
+    pub(super) font_contents: Vec<Vec<u32>>,
 }
 
 impl DatasetIndex {
-    pub(super) fn content_index(&self, codepoint: u32) -> PyResult<usize> {
-        self.content_classes
-            .binary_search(&codepoint)
-            .map_err(|_| py_index_err(format!("codepoint U+{codepoint:04X} missing from index")))
+    pub(super) fn new(entries: &[FontEntry]) -> Self {
+        let sample_offsets = std::iter::once(0)
+            .chain(
+                entries
+                    .iter()
+                    .map(|entry| entry.codepoints.len() * entry.instance_count()),
+            )
+            .scan(0usize, |total, delta| {
+                *total += delta;
+                Some(*total)
+            })
+            .collect();
+
+        let inst_offsets = std::iter::once(0)
+            .chain(entries.iter().map(FontEntry::instance_count))
+            .scan(0usize, |total, delta| {
+                *total += delta;
+                Some(*total)
+            })
+            .collect();
+
+        let mut content_classes: Vec<u32> = entries
+            .iter()
+            .flat_map(|entry| entry.codepoints.iter().copied())
+            .collect();
+        content_classes.sort_unstable();
+        content_classes.dedup();
+
+        // Both sides are sorted, so one merge pass per font replaces a binary
+        // search per sample.
+        let font_contents = entries
+            .iter()
+            .map(|entry| {
+                let mut class_idx = 0;
+                entry
+                    .codepoints
+                    .iter()
+                    .map(|&codepoint| {
+                        while content_classes[class_idx] < codepoint {
+                            class_idx += 1;
+                        }
+                        class_idx as u32
+                    })
+                    .collect()
+            })
+            .collect();
+
+        Self {
+            sample_offsets,
+            inst_offsets,
+            content_classes,
+            font_contents,
+        }
     }
 }
 
-pub(super) fn load_entries_and_index(
-    files: Vec<String>,
+pub(super) fn load_entries(
+    files: &[String],
+    filter: Option<&[u32]>,
+    threads: usize,
+) -> PyResult<Vec<FontEntry>> {
+    Ok(load_file_entries(files, filter, threads)?
+        .into_iter()
+        .flatten()
+        .collect())
+}
+
+pub(super) fn load_file_entries(
+    files: &[String],
     filter: Option<&[u32]>,
-) -> PyResult<(Vec<FontEntry>, DatasetIndex)> {
-    let mut entries = Vec::new();
-    let mut all_cps = Vec::new();
-
-    for path in files {
-        let mut faces = FontEntry::load_faces(&path, filter)?;
-        all_cps.extend(
-            faces
+    threads: usize,
+) -> PyResult<Vec<Vec<FontEntry>>> {
+    par_map(files, threads, |path| FontEntry::load_faces(path, filter))
+        .into_iter()
+        .collect()
+}
+
+// Runs the metadata pass over every entry that has not been measured yet and
+// reports whether anything was computed.
+pub(super) fn measure_entries(entries: &[FontEntry], threads: usize) -> PyResult<bool> {
+    // One task per instance keeps large variable fonts from serializing on a
+    // single thread.
+    let units: Vec<(usize, usize)> = entries
+        .iter()
+        .enumerate()
+        .filter(|(_, entry)| entry.metrics().is_none())
+        .flat_map(|(font_idx, entry)| {
+            (0..entry.instance_count()).map(move |inst_idx| (font_idx, inst_idx))
+        })
+        .collect();
+    if units.is_empty() {
+        return Ok(false);
+    }
+
+    let measured = par_map(&units, threads, |&(font_idx, inst_idx)| {
+        entries[font_idx].measure_instance(inst_idx)
+    });
+    let mut pending: Option<(usize, Vec<GlyphMetrics>)> = None;
+    for (&(font_idx, _), metrics) in units.iter().zip(measured) {
+        let metrics = metrics?;
+        match pending.as_mut() {
+            Some((current, collected)) if *current == font_idx => collected.extend(metrics),
+            _ => {
+                if let Some((done, collected)) = pending.replace((font_idx, metrics)) {
+                    entries[done].set_metrics(collected);
+                }
+            }
+        }
+    }
+    if let Some((done, collected)) = pending {
+        entries[done].set_metrics(collected);
+    }
+    Ok(true)
+}
+
+#[derive(Clone, Default)]
+pub(super) struct GlyphFilter {
+    pub(super) max_commands: Option<u32>,
+    pub(super) min_contours: Option<u32>,
+    pub(super) drop_empty: bool,
+}
+
+impl GlyphFilter {
+    pub(super) fn is_active(&self) -> bool {
+        self.max_commands.is_some() || self.min_contours.is_some() || self.drop_empty
+    }
+
+    pub(super) fn encode(&self, writer: &mut Writer) {
+        writer.u32(self.max_commands.unwrap_or(u32::MAX));
+        writer.u32(self.min_contours.unwrap_or(0));
+        writer.flag(self.drop_empty);
+    }
+
+    pub(super) fn decode(reader: &mut Reader<'_>) -> PyResult<Self> {
+        let max_commands = Some(reader.u32()?).filter(|&max| max != u32::MAX);
+        let min_contours = Some(reader.u32()?).filter(|&min| min != 0);
+        Ok(Self {
+            max_commands,
+            min_contours,
+            drop_empty: reader.flag()?,
+        })
+    }
+
+    fn accepts(&self, metrics: &GlyphMetrics) -> bool {
+        self.max_commands.is_none_or(|max| metrics.commands <= max)
+            && self.min_contours.is_none_or(|min| metrics.contours >= min)
+            && !(self.drop_empty && metrics.is_empty())
+    }
+
+    // A code point is dropped from a face when any of its instances is
+    // rejected, which keeps every instance covering the same code points.
+    pub(super) fn prune(&self, entries: &mut [FontEntry], threads: usize) -> PyResult<()> {
+        if !self.is_active() {
+            return Ok(());
+        }
+        measure_entries(entries, threads)?;
+        for entry in entries.iter_mut() {
+            let cp_count = entry.codepoints.len();
+            let mut keep = vec![true; cp_count];
+            if let Some(metrics) = entry.metrics() {
+                for (sample, metrics) in metrics.iter().enumerate() {
+                    if !self.accepts(metrics) {
+                        keep[sample % cp_count] = false;
+                    }
+                }
+            }
+            entry.retain_codepoints(&keep);
+        }
+        Ok(())
+    }
+}
+
+pub(super) struct IndexedFonts {
+    pub(super) entries: Vec<FontEntry>,
+    pub(super) index: DatasetIndex,
+    pub(super) style_classes: Vec<String>,
+    style_lookup: HashMap<String, usize>,
+    content_lookup: HashMap<u32, usize>,
+}
+
+impl IndexedFonts {
+    pub(super) fn new(entries: Vec<FontEntry>) -> Self {
+        let index = DatasetIndex::new(&entries);
+        let style_classes: Vec<String> = entries
+            .iter()
+            .flat_map(|entry| entry.style_names.iter().cloned())
+            .collect();
+        // Later duplicates win, matching `dict` construction on the Python side.
+        let style_lookup = style_classes
+            .iter()
+            .enumerate()
+            .map(|(idx, name)| (name.clone(), idx))
+            .collect();
+        let content_lookup = index
+            .content_classes
+            .iter()
+            .enumerate()
+            .map(|(idx, &codepoint)| (codepoint, idx))
+            .collect();
+
+        Self {
+            entries,
+            index,
+            style_classes,
+            style_lookup,
+            content_lookup,
+        }
+    }
+
+    pub(super) fn style_index(&self, name: &str) -> Option<usize> {
+        self.style_lookup.get(name).copied()
+    }
+
+    pub(super) fn content_index(&self, codepoint: u32) -> Option<usize> {
+        self.content_lookup.get(&codepoint).copied()
+    }
+
+    pub(super) fn into_file_entries(self) -> HashMap<String, Vec<FontEntry>> {
+        let mut by_path: HashMap<String, Vec<FontEntry>> = HashMap::new();
+        for entry in self.entries {
+            by_path.entry(entry.path.clone()).or_default().push(entry);
+        }
+        by_path
+    }
+
+    pub(super) fn sample_count(&self) -> usize {
+        self.index.sample_offsets.last().copied().unwrap_or(0)
+    }
+
+    pub(super) fn write_targets(&self, out: &mut [u8], wide: bool) {
+        let width = if wide { 8 } else { 4 };
+        let put = |slot: &mut [u8], value: usize| {
+            if wide {
+                slot.copy_from_slice(&(value as i64).to_ne_bytes());
+            } else {
+                slot.copy_from_slice(&(value as i32).to_ne_bytes());
+            }
+        };
+
+        let mut pairs = out.chunks_exact_mut(2 * width);
+        for (font_idx, entry) in self.entries.iter().enumerate() {
+            let inst_offset = self.index.inst_offsets[font_idx];
+            for inst_idx in 0..entry.instance_count() {
+                for &content_idx in &self.index.font_contents[font_idx] {
+                    let Some(pair) = pairs.next() else {
+                        return;
+                    };
+                    let (style, content) = pair.split_at_mut(width);
+                    put(style, inst_offset + inst_idx);
+                    put(content, content_idx as usize);
+                }
+            }
+        }
+    }
+
+    // Callers run `measure_entries` first; unmeasured faces are skipped.
+    pub(super) fn metric_columns(&self) -> MetricColumns {
+        let mut columns = MetricColumns::with_capacity(self.sample_count());
+        for entry in &self.entries {
+            entry
+                .metrics()
+                .unwrap_or_default()
                 .iter()
-                .flat_map(|entry| entry.codepoints.iter().copied()),
+                .for_each(|metrics| columns.push(metrics));
+        }
+        columns
+    }
+
+    pub(super) fn sequence_lengths(&self) -> Vec<i64> {
+        self.entries
+            .iter()
+            .flat_map(|entry| entry.metrics().unwrap_or_default())
+            .map(|metrics| i64::from(metrics.commands))
+            .collect()
+    }
+
+    pub(super) fn locate(&self, idx: usize) -> PyResult<SampleLocation> {
+        self.check_bounds(idx)?;
+        Ok(self.locate_in(self.font_of(idx), idx))
+    }
+
+    pub(super) fn locate_many(&self, indices: &[usize]) -> PyResult<SampleLocations> {
+        let mut locations = SampleLocations::with_capacity(indices.len());
+        for &idx in indices {
+            self.check_bounds(idx)?;
+            locations.push(self.locate_in(self.font_of(idx), idx));
+        }
+        Ok(locations)
+    }
+
+    pub(super) fn locate_range(&self, start: usize, stop: usize) -> PyResult<SampleLocations> {
+        let mut locations = SampleLocations::with_capacity(stop.saturating_sub(start));
+        if start >= stop {
+            return Ok(locations);
+        }
+        self.check_bounds(stop - 1)?;
+
+        // Walk the sorted offsets alongside the range instead of searching
+        // them once per sample.
+        let offsets = &self.index.sample_offsets;
+        let mut font_idx = self.font_of(start);
+        for idx in start..stop {
+            while offsets[font_idx + 1] <= idx {
+                font_idx += 1;
+            }
+            locations.push(self.locate_in(font_idx, idx));
+        }
+        Ok(locations)
+    }
+
+    fn check_bounds(&self, idx: usize) -> PyResult<()> {
+        let total = self.sample_count();
+        if idx >= total {
+            return Err(py_index_err(format!(
+                "sample index {idx} out of range (len={total})"
+            )));
+        }
+        Ok(())
+    }
+
+    fn font_of(&self, idx: usize) -> usize {
+        self.index
+            .sample_offsets
+            .partition_point(|offset| *offset <= idx)
+            - 1
+    }
+
+    fn locate_in(&self, font_idx: usize, idx: usize) -> SampleLocation {
+        let entry = &self.entries[font_idx];
+        let font_start = self.index.sample_offsets[font_idx];
+        let sample_idx = idx - font_start;
+        let cp_count = entry.codepoints.len();
+        debug_assert!(
+            cp_count > 0,
+            "font '{}' has no indexed code points",
+            &entry.path
         );
-        entries.append(&mut faces);
+
+        let inst_start = self.index.inst_offsets[font_idx];
+        let inst_idx = sample_idx / cp_count;
+        debug_assert!(
+            inst_idx < entry.instance_count(),
+            "instance index {} out of range for font '{}'",
+            inst_idx,
+            &entry.path
+        );
+
+        let cp_offset = sample_idx % cp_count;
+        let cp = entry.codepoints[cp_offset];
+        let style_idx = inst_start + inst_idx;
+        let content_idx = self.index.font_contents[font_idx][cp_offset] as usize;
+        let instance = entry.is_variable().then_some(inst_idx);
+
+        (font_idx, instance, cp, style_idx, content_idx)
     }
+}
 
-    let sample_offsets = std::iter::once(0)
-        .chain(
-            entries
-                .iter()
-                .map(|entry| entry.codepoints.len() * entry.instance_count()),
-        )
-        .scan(0usize, |total, delta| {
-            *total += delta;
-            Some(*total)
-        })
-        .collect();
+pub(super) struct FontSource {
+    pub(super) root: PathBuf,
+    pub(super) patterns: Option<Vec<String>>,
+    pub(super) filter: Option<Vec<u32>>,
+    pub(super) index_cache: Option<PathBuf>,
+    pub(super) revision: Option<String>,
+    pub(super) glyph_filter: GlyphFilter,
+}
+
+impl FontSource {
+    pub(super) fn discover(
+        &self,
+        threads: usize,
+    ) -> PyResult<(Vec<FileStamp>, Option<Vec<FontEntry>>)> {
+        let cached = self
+            .index_cache
+            .as_deref()
+            .and_then(|cache_path| read_index(cache_path, &self.key()));
+
+        // A pinned revision identifies the tree on its own, so the walk can be
+        // skipped entirely; otherwise the cache is only trusted while every
+        // discovered file still matches its recorded size and mtime.
+        let cached = match cached {
+            Some((files, entries)) if self.revision.is_some() => {
+                return Ok((files, Some(entries)));
+            }
+            cached => cached,
+        };
 
-    let inst_offsets = std::iter::once(0)
-        .chain(entries.iter().map(FontEntry::instance_count))
-        .scan(0usize, |total, delta| {
-            *total += delta;
-            Some(*total)
+        let files = self.scan(threads)?;
+        let entries = cached
+            .filter(|(cached_files, _)| *cached_files == files)
+            .map(|(_, entries)| entries);
+        Ok((files, entries))
+    }
+
+    pub(super) fn encode(&self, writer: &mut Writer) {
+        writer.str(&self.root.to_string_lossy());
+        writer.flag(self.patterns.is_some());
+        if let Some(patterns) = &self.patterns {
+            writer.count(patterns.len());
+            patterns.iter().for_each(|pattern| writer.str(pattern));
+        }
+        writer.flag(self.filter.is_some());
+        if let Some(filter) = &self.filter {
+            writer.u32s(filter);
+        }
+        writer.flag(self.index_cache.is_some());
+        if let Some(index_cache) = &self.index_cache {
+            writer.str(&index_cache.to_string_lossy());
+        }
+        writer.flag(self.revision.is_some());
+        if let Some(revision) = &self.revision {
+            writer.str(revision);
+        }
+        self.glyph_filter.encode(writer);
+    }
+
+    pub(super) fn decode(reader: &mut Reader<'_>) -> PyResult<Self> {
+        let root = PathBuf::from(reader.str()?);
+        let patterns = if reader.flag()? {
+            Some(
+                (0..reader.count()?)
+                    .map(|_| reader.str().map(str::to_string))
+                    .collect::<PyResult<Vec<_>>>()?,
+            )
+        } else {
+            None
+        };
+        let filter = if reader.flag()? {
+            Some(reader.u32s()?)
+        } else {
+            None
+        };
+        let index_cache = if reader.flag()? {
+            Some(PathBuf::from(reader.str()?))
+        } else {
+            None
+        };
+        let revision = if reader.flag()? {
+            Some(reader.str()?.to_string())
+        } else {
+            None
+        };
+        Ok(Self {
+            root,
+            patterns,
+            filter,
+            index_cache,
+            revision,
+            glyph_filter: GlyphFilter::decode(reader)?,
         })
-        .collect();
+    }
+
+    pub(super) fn scan(&self, threads: usize) -> PyResult<Vec<FileStamp>> {
+        let paths = discover_font_files(&self.root, self.patterns.as_deref(), threads)?;
+        stat_files(&paths, threads)
+    }
+
+    pub(super) fn parse(&self, files: &[FileStamp], threads: usize) -> PyResult<Vec<FontEntry>> {
+        let paths: Vec<String> = files.iter().map(|file| file.path.clone()).collect();
+        let mut entries = load_entries(&paths, self.filter.as_deref(), threads)?;
+        self.glyph_filter.prune(&mut entries, threads)?;
+        self.store(files, &entries)?;
+        Ok(entries)
+    }
+
+    pub(super) fn load(&self, paths: &[String], threads: usize) -> PyResult<Vec<Vec<FontEntry>>> {
+        let mut parsed = load_file_entries(paths, self.filter.as_deref(), threads)?;
+        for entries in &mut parsed {
+            self.glyph_filter.prune(entries, threads)?;
+        }
+        Ok(parsed)
+    }
 
-    let mut content_classes = all_cps;
-    content_classes.sort_unstable();
-    content_classes.dedup();
+    pub(super) fn store(&self, files: &[FileStamp], entries: &[FontEntry]) -> PyResult<()> {
+        match &self.index_cache {
+            Some(cache_path) => write_index(cache_path, &self.key(), files, entries),
+            None => Ok(()),
+        }
+    }
+
+    fn key(&self) -> Vec<u8> {
+        index_key(
+            &self.root,
+            self.patterns.as_deref(),
+            self.filter.as_deref(),
+            self.revision.as_deref(),
+            &self.glyph_filter,
+        )
+    }
+}
+
+pub(super) struct FileChanges {
+    pub(super) added: Vec<String>,
+    pub(super) modified: Vec<String>,
+    pub(super) removed: Vec<String>,
+}
+
+impl FileChanges {
+    pub(super) fn between(before: &[FileStamp], after: &[FileStamp]) -> Self {
+        let previous: HashMap<&str, &FileStamp> = before
+            .iter()
+            .map(|file| (file.path.as_str(), file))
+            .collect();
+        let current: HashSet<&str> = after.iter().map(|file| file.path.as_str()).collect();
+
+        let mut changes = Self {
+            added: Vec::new(),
+            modified: Vec::new(),
+            removed: Vec::new(),
+        };
+        for file in after {
+            match previous.get(file.path.as_str()) {
+                None => changes.added.push(file.path.clone()),
+                Some(&old) if old != file => changes.modified.push(file.path.clone()),
+                Some(_) => {}
+            }
+        }
+        changes.removed = before
+            .iter()
+            .filter(|file| !current.contains(file.path.as_str()))
+            .map(|file| file.path.clone())
+            .collect();
+        changes
+    }
 
-    let index = DatasetIndex {
-        sample_offsets,
-        inst_offsets,
-        content_classes,
-    };
+    pub(super) fn is_empty(&self) -> bool {
+        self.added.is_empty() && self.modified.is_empty() && self.removed.is_empty()
+    }
 
-    Ok((entries, index))
+    pub(super) fn stale_paths(&self) -> Vec<String> {
+        self.added.iter().chain(&self.modified).cloned().collect()
+    }
 }
@@ -1,13 +1,22 @@
 use crate::error::py_err;
-use ignore::{WalkBuilder, overrides::OverrideBuilder};
+use crate::parallel::par_map;
+use ignore::{WalkBuilder, WalkState, overrides::OverrideBuilder};
 use memmap2::Mmap;
 use pyo3::prelude::*;
 use std::{
     fs,
     path::{Path, PathBuf},
-    sync::Arc,
+    sync::{Arc, Mutex, PoisonError},
+    time::UNIX_EPOCH,
 };
 
+#[derive(Clone, PartialEq, Eq)]
+pub(super) struct FileStamp {
+    pub(super) path: String,
+    pub(super) size: u64,
+    pub(super) modified: u64,
+}
+
 pub(super) fn canonicalize_root(root: &str) -> PyResult<PathBuf> {
     let expanded = shellexpand::tilde(root);
     let path = PathBuf::from(expanded.as_ref());
@@ -22,29 +31,73 @@ pub(super) fn canonicalize_root(root: &str) -> PyResult<PathBuf> {
 pub(super) fn discover_font_files(
     root: &Path,
     patterns: Option<&[String]>,
+    threads: usize,
 ) -> PyResult<Vec<String>> {
     let mut builder = WalkBuilder::new(root);
+    builder.threads(threads);
     if let Some(patterns) = patterns.filter(|p| !p.is_empty()) {
         builder.overrides(build_overrides(root, patterns)?);
     }
 
-    let mut files = Vec::new();
+    let found = Mutex::new(Vec::new());
+    let failure = Mutex::new(None);
+    let (files, error) = (&found, &failure);
 
-    for result in builder.build() {
-        let entry =
-            result.map_err(|err| py_err(format!("failed to walk '{}': {err}", root.display())))?;
+    builder.build_parallel().run(move || {
+        Box::new(move |result: Result<ignore::DirEntry, ignore::Error>| {
+            let entry = match result {
+                Ok(entry) => entry,
+                Err(err) => {
+                    let mut slot = error.lock().unwrap_or_else(PoisonError::into_inner);
+                    slot.get_or_insert_with(|| {
+                        py_err(format!("failed to walk '{}': {err}", root.display()))
+                    });
+                    return WalkState::Quit;
+                }
+            };
 
-        let path = entry.path();
+            let path = entry.path();
 
-        if entry.file_type().is_some_and(|ft| ft.is_file()) && has_font_extension(path) {
-            files.push(path.to_string_lossy().into_owned());
-        }
+            if entry.file_type().is_some_and(|ft| ft.is_file()) && has_font_extension(path) {
+                files
+                    .lock()
+                    .unwrap_or_else(PoisonError::into_inner)
+                    .push(path.to_string_lossy().into_owned());
+            }
+            WalkState::Continue
+        })
+    });
+
+    if let Some(err) = failure.into_inner().unwrap_or_else(PoisonError::into_inner) {
+        return Err(err);
     }
 
+    let mut files = found.into_inner().unwrap_or_else(PoisonError::into_inner);
     files.sort_unstable();
     Ok(files)
 }
 
+pub(super) fn stat_files(paths: &[String], threads: usize) -> PyResult<Vec<FileStamp>> {
+    par_map(paths, threads, |path| stat_file(path))
+        .into_iter()
+        .collect()
+}
+
+fn stat_file(path: &str) -> PyResult<FileStamp> {
+    let metadata =
+        fs::metadata(path).map_err(|err| py_err(format!("failed to stat '{path}': {err}")))?;
+    let modified = metadata
+        .modified()
+        .ok()
+        .and_then(|time| time.duration_since(UNIX_EPOCH).ok())
+        .map_or(0, |elapsed| elapsed.as_nanos() as u64);
+    Ok(FileStamp {
+        path: path.to_string(),
+        size: metadata.len(),
+        modified,
+    })
+}
+
 fn has_font_extension(path: &Path) -> bool {
     path.extension()
         .and_then(|ext| ext.to_str())
@@ -1,147 +1,490 @@
+mod batch;
+mod cache;
 mod entry;
 mod index;
 mod io;
+mod snapshot;
 
-use crate::error::py_index_err;
+use crate::buffer::to_bytearray;
+use crate::error::{py_err, py_index_err};
+use crate::parallel::{default_threads, par_map};
+use crate::pen::{CoordFormat, Outline, OutlineSpec};
+use batch::{GlyphBatch, SampleLocation, SampleLocations};
+use cache::OutlineCache;
 use entry::FontEntry;
-use index::{DatasetIndex, load_entries_and_index};
-use io::{canonicalize_root, discover_font_files};
+use index::{FileChanges, FontSource, GlyphFilter, IndexedFonts, measure_entries};
+use io::{FileStamp, canonicalize_root};
 use pyo3::prelude::*;
-use pyo3::types::PyBytes;
+use pyo3::pybacked::PyBackedBytes;
+use pyo3::types::{PyByteArray, PyBytes};
+use snapshot::{decode_dataset, encode_dataset};
+use std::path::PathBuf;
+use std::sync::{Arc, OnceLock};
 
 #[pyclass]
 pub struct FontDataset {
-    entries: Vec<FontEntry>,
-    index: DatasetIndex,
+    files: Vec<FileStamp>,
+    fonts: OnceLock<IndexedFonts>,
+    source: Option<FontSource>,
+    glyph_counts: OnceLock<Vec<u64>>,
+    threads: usize,
+    cache: Option<OutlineCache>,
+    spec: OutlineSpec,
 }
 
+type Buffer<'py> = Bound<'py, PyByteArray>;
+type Columns<'py> = (
+    Buffer<'py>,
+    Buffer<'py>,
+    Buffer<'py>,
+    Buffer<'py>,
+    Buffer<'py>,
+);
+// (max_len, patch_size, normalize, close_path, eos, compact) of a native transform.
+type SpecArgs = (Option<usize>, Option<usize>, bool, bool, bool, bool);
+
 #[pymethods]
 impl FontDataset {
     #[new]
+    #[pyo3(signature = (
+        root,
+        codepoint_filter,
+        patterns,
+        cache_bytes=None,
+        num_threads=None,
+        index_cache=None,
+        revision=None,
+        lazy=false,
+        max_commands=None,
+        min_contours=None,
+        drop_empty=false,
+        outline_spec=None,
+        coord_format="float32",
+    ))]
+    #[allow(clippy::too_many_arguments)]
     pub fn new(
+        py: Python<'_>,
         root: String,
         codepoint_filter: Option<Vec<u32>>,
         patterns: Option<Vec<String>>,
+        cache_bytes: Option<usize>,
+        num_threads: Option<usize>,
+        index_cache: Option<PathBuf>,
+        revision: Option<String>,
+        lazy: bool,
+        max_commands: Option<u32>,
+        min_contours: Option<u32>,
+        drop_empty: bool,
+        outline_spec: Option<SpecArgs>,
+        coord_format: &str,
     ) -> PyResult<Self> {
+        let spec = resolve_spec(outline_spec, coord_format)?;
         let filter = codepoint_filter.map(|mut values| {
             values.sort_unstable();
             values.dedup();
             values
         });
 
-        let root_path = canonicalize_root(&root)?;
-        let files = discover_font_files(&root_path, patterns.as_deref())?;
-        let (entries, index) = load_entries_and_index(files, filter.as_deref())?;
+        let threads = resolve_threads(num_threads);
+        py.detach(|| {
+            let source = FontSource {
+                root: canonicalize_root(&root)?,
+                patterns,
+                filter,
+                index_cache,
+                revision,
+                glyph_filter: GlyphFilter {
+                    max_commands,
+                    min_contours,
+                    drop_empty,
+                },
+            };
+            let (files, cached) = source.discover(threads)?;
+            let dataset = Self::from_parts(files, Some(source), cache_bytes, threads, spec);
+
+            if let Some(entries) = cached {
+                let _ = dataset.fonts.set(IndexedFonts::new(entries));
+            } else if lazy {
+                dataset.load_glyph_counts()?;
+            } else {
+                dataset.fonts()?;
+            }
+            Ok(dataset)
+        })
+    }
+
+    #[staticmethod]
+    #[pyo3(signature = (
+        data,
+        cache_bytes=None,
+        num_threads=None,
+        outline_spec=None,
+        coord_format="float32",
+    ))]
+    pub fn from_bytes(
+        py: Python<'_>,
+        data: PyBackedBytes,
+        cache_bytes: Option<usize>,
+        num_threads: Option<usize>,
+        outline_spec: Option<SpecArgs>,
+        coord_format: &str,
+    ) -> PyResult<Self> {
+        let spec = resolve_spec(outline_spec, coord_format)?;
+        let data: &[u8] = &data;
+        let threads = resolve_threads(num_threads);
+        let (source, files, entries) = py.detach(|| decode_dataset(data, threads))?;
+        let dataset = Self::from_parts(files, source, cache_bytes, threads, spec);
+        let _ = dataset.fonts.set(IndexedFonts::new(entries));
+        Ok(dataset)
+    }
+
+    pub fn to_bytes<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyBytes>> {
+        let data = py.detach(|| {
+            let fonts = self.fonts()?;
+            Ok::<_, PyErr>(encode_dataset(
+                self.source.as_ref(),
+                &self.files,
+                &fonts.entries,
+            ))
+        })?;
+        Ok(PyBytes::new(py, &data))
+    }
+
+    pub fn materialize(&self, py: Python<'_>) -> PyResult<()> {
+        py.detach(|| self.fonts().map(|_| ()))
+    }
 
-        Ok(Self { entries, index })
+    #[getter]
+    pub fn is_materialized(&self) -> bool {
+        self.fonts.get().is_some()
     }
 
     #[getter]
-    pub fn sample_count(&self) -> usize {
-        self.index.sample_offsets.last().copied().unwrap_or(0)
+    pub fn font_files(&self) -> Vec<String> {
+        self.files.iter().map(|file| file.path.clone()).collect()
+    }
+
+    pub fn glyph_counts(&self, py: Python<'_>) -> PyResult<Vec<u64>> {
+        py.detach(|| self.load_glyph_counts().cloned())
     }
 
     #[getter]
-    pub fn content_classes(&self) -> Vec<u32> {
-        self.index.content_classes.clone()
+    pub fn sample_count(&self, py: Python<'_>) -> PyResult<usize> {
+        Ok(py.detach(|| self.fonts())?.sample_count())
     }
 
     #[getter]
-    pub fn style_classes(&self) -> Vec<String> {
-        let mut names = Vec::new();
-        for entry in self.entries.iter() {
-            let family_name = entry.family_name();
-            if entry.is_variable() {
-                let instance_names = entry.named_instance_names();
-                if instance_names.is_empty() {
-                    if let Some(subfamily) = entry.subfamily_name() {
-                        names.push(format!("{family_name} {subfamily}"));
-                    } else {
-                        names.push(family_name);
-                    }
-                } else {
-                    for name_opt in instance_names.iter() {
-                        let instance_name = name_opt.as_deref().unwrap_or("");
-                        if instance_name.is_empty() {
-                            names.push(family_name.clone());
-                        } else {
-                            names.push(format!("{family_name} {instance_name}"));
-                        }
-                    }
-                }
-            } else if let Some(subfamily) = entry.subfamily_name() {
-                names.push(format!("{family_name} {subfamily}"));
-            } else {
-                names.push(family_name);
-            }
+    pub fn content_classes(&self, py: Python<'_>) -> PyResult<Vec<u32>> {
+        Ok(py.detach(|| self.fonts())?.index.content_classes.clone())
+    }
+
+    #[getter]
+    pub fn style_classes(&self, py: Python<'_>) -> PyResult<Vec<String>> {
+        Ok(py.detach(|| self.fonts())?.style_classes.clone())
+    }
+
+    pub fn sample_offsets<'py>(&self, py: Python<'py>) -> PyResult<Buffer<'py>> {
+        let fonts = py.detach(|| self.fonts())?;
+        Ok(offsets_buffer(py, &fonts.index.sample_offsets))
+    }
+
+    pub fn inst_offsets<'py>(&self, py: Python<'py>) -> PyResult<Buffer<'py>> {
+        let fonts = py.detach(|| self.fonts())?;
+        Ok(offsets_buffer(py, &fonts.index.inst_offsets))
+    }
+
+    pub fn sequence_lengths<'py>(&self, py: Python<'py>) -> PyResult<Buffer<'py>> {
+        let lengths = py.detach(|| Ok::<_, PyErr>(self.measured_fonts()?.sequence_lengths()))?;
+        Ok(to_bytearray(py, &lengths))
+    }
+
+    pub fn glyph_metrics<'py>(&self, py: Python<'py>) -> PyResult<Columns<'py>> {
+        let columns = py.detach(|| Ok::<_, PyErr>(self.measured_fonts()?.metric_columns()))?;
+        Ok((
+            to_bytearray(py, &columns.commands),
+            to_bytearray(py, &columns.contours),
+            to_bytearray(py, &columns.points),
+            to_bytearray(py, &columns.bbox),
+            to_bytearray(py, &columns.empty),
+        ))
+    }
+
+    pub fn style_index(&self, py: Python<'_>, name: &str) -> PyResult<Option<usize>> {
+        Ok(py.detach(|| self.fonts())?.style_index(name))
+    }
+
+    pub fn content_index(&self, py: Python<'_>, codepoint: u32) -> PyResult<Option<usize>> {
+        Ok(py.detach(|| self.fonts())?.content_index(codepoint))
+    }
+
+    pub fn locate(&self, py: Python<'_>, idx: usize) -> PyResult<SampleLocation> {
+        py.detach(|| self.fonts()?.locate(idx))
+    }
+
+    pub fn locate_many<'py>(
+        &self,
+        py: Python<'py>,
+        indices: PyBackedBytes,
+    ) -> PyResult<Columns<'py>> {
+        let indices: &[u8] = &indices;
+        let locations = py.detach(|| {
+            let indices = indices
+                .chunks_exact(size_of::<i64>())
+                .map(|chunk| {
+                    let idx = i64::from_ne_bytes(chunk.try_into().unwrap_or_default());
+                    usize::try_from(idx)
+                        .map_err(|_| py_index_err(format!("sample index {idx} is negative")))
+                })
+                .collect::<PyResult<Vec<_>>>()?;
+            self.fonts()?.locate_many(&indices)
+        })?;
+        Ok(location_columns(py, &locations))
+    }
+
+    pub fn locate_range<'py>(
+        &self,
+        py: Python<'py>,
+        start: usize,
+        stop: usize,
+    ) -> PyResult<Columns<'py>> {
+        let locations = py.detach(|| self.fonts()?.locate_range(start, stop))?;
+        Ok(location_columns(py, &locations))
+    }
+
+    pub fn item<'py>(
+        &self,
+        py: Python<'py>,
+        idx: usize,
+    ) -> PyResult<(Buffer<'py>, Buffer<'py>, usize, usize)> {
+        let (outline, style_idx, content_idx) = py.detach(|| self.draw(idx))?;
+        Ok((
+            to_bytearray(py, &outline.types),
+            to_bytearray(py, &outline.coords),
+            style_idx,
+            content_idx,
+        ))
+    }
+
+    #[pyo3(signature = (indices, num_threads=None))]
+    pub fn items<'py>(
+        &self,
+        py: Python<'py>,
+        indices: Vec<usize>,
+        num_threads: Option<usize>,
+    ) -> PyResult<Columns<'py>> {
+        let threads = num_threads
+            .filter(|&count| count > 0)
+            .unwrap_or(self.threads);
+        let batch = py.detach(|| self.draw_batch(&indices, threads))?;
+        Ok((
+            to_bytearray(py, &batch.types),
+            to_bytearray(py, &batch.coords),
+            to_bytearray(py, &batch.offsets),
+            to_bytearray(py, &batch.style_indices),
+            to_bytearray(py, &batch.content_indices),
+        ))
+    }
+
+    #[pyo3(signature = (revision=None))]
+    pub fn refresh(
+        &mut self,
+        py: Python<'_>,
+        revision: Option<String>,
+    ) -> PyResult<(Vec<String>, Vec<String>, Vec<String>)> {
+        let changes = py.detach(|| self.refresh_files(revision))?;
+        Ok((changes.added, changes.modified, changes.removed))
+    }
+
+    pub fn cache_info(&self) -> (u64, u64, u64, usize, usize, usize) {
+        self.cache.as_ref().map_or((0, 0, 0, 0, 0, 0), |cache| {
+            let info = cache.info();
+            (
+                info.hits,
+                info.misses,
+                info.evictions,
+                info.entries,
+                info.bytes,
+                info.capacity,
+            )
+        })
+    }
+
+    pub fn cache_clear(&self) {
+        if let Some(cache) = &self.cache {
+            cache.clear();
+        }
+    }
+
+    #[pyo3(signature = (wide=true))]
+    pub fn targets<'py>(&self, py: Python<'py>, wide: bool) -> PyResult<Buffer<'py>> {
+        let fonts = py.detach(|| self.fonts())?;
+        let width = if wide { 8 } else { 4 };
+        PyByteArray::new_with(py, fonts.sample_count() * 2 * width, |buf| {
+            py.detach(|| fonts.write_targets(buf, wide));
+            Ok(())
+        })
+    }
+}
+
+impl FontDataset {
+    fn from_parts(
+        files: Vec<FileStamp>,
+        source: Option<FontSource>,
+        cache_bytes: Option<usize>,
+        threads: usize,
+        spec: OutlineSpec,
+    ) -> Self {
+        Self {
+            files,
+            fonts: OnceLock::new(),
+            source,
+            glyph_counts: OnceLock::new(),
+            threads,
+            cache: cache_bytes
+                .filter(|&capacity| capacity > 0)
+                .map(OutlineCache::new),
+            spec,
         }
-        names
     }
 
-    pub fn locate(&self, idx: usize) -> PyResult<(usize, Option<usize>, u32, usize, usize)> {
-        let total = self.sample_count();
-        if idx >= total {
-            return Err(py_index_err(format!(
-                "sample index {idx} out of range (len={total})"
-            )));
+    fn fonts(&self) -> PyResult<&IndexedFonts> {
+        if let Some(fonts) = self.fonts.get() {
+            return Ok(fonts);
         }
 
-        let font_idx = self
-            .index
-            .sample_offsets
-            .partition_point(|offset| *offset <= idx)
-            - 1;
-
-        let entry = &self.entries[font_idx];
-        let font_start = self.index.sample_offsets[font_idx];
-        let sample_idx = idx - font_start;
-        let cp_count = entry.codepoints.len();
-        debug_assert!(
-            cp_count > 0,
-            "font '{}' has no indexed code points",
-            &entry.path
-        );
-
-        let inst_start = self.index.inst_offsets[font_idx];
-        let inst_idx = sample_idx / cp_count;
-        debug_assert!(
-            inst_idx < entry.instance_count(),
-            "instance index {} out of range for font '{}'",
-            inst_idx,
-            &entry.path
-        );
-
-        let cp_offset = sample_idx % cp_count;
-        let cp = entry.codepoints[cp_offset];
-        let style_idx = inst_start + inst_idx;
-        let content_idx = self.index.content_index(cp)?;
-        let instance = entry.is_variable().then_some(inst_idx);
-
-        Ok((font_idx, instance, cp, style_idx, content_idx))
-    }
-
-    pub fn item(&self, idx: usize) -> PyResult<(Vec<i32>, Vec<f32>, usize, usize)> {
-        let (font_idx, inst_idx, codepoint, style_idx, content_idx) = self.locate(idx)?;
-        self.entries[font_idx]
-            .glyph(codepoint, inst_idx)
-            .map(|(types, coords)| (types, coords, style_idx, content_idx))
-    }
-
-    pub fn targets<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyBytes>> {
-        let total = self.sample_count();
-        let mut flat: Vec<i64> = Vec::with_capacity(total * 2);
-        for (font_idx, entry) in self.entries.iter().enumerate() {
-            let inst_offset = self.index.inst_offsets[font_idx];
-            for inst_idx in 0..entry.instance_count() {
-                let style_idx = inst_offset + inst_idx;
-                for &cp in &entry.codepoints {
-                    let content_idx = self.index.content_index(cp)?;
-                    flat.push(style_idx as i64);
-                    flat.push(content_idx as i64);
-                }
+        let source = self.source()?;
+        let entries = source.parse(&self.files, self.threads)?;
+        Ok(self.fonts.get_or_init(|| IndexedFonts::new(entries)))
+    }
+
+    fn source(&self) -> PyResult<&FontSource> {
+        self.source
+            .as_ref()
+            .ok_or_else(|| py_err("dataset restored from a snapshot has no font source"))
+    }
+
+    fn refresh_files(&mut self, revision: Option<String>) -> PyResult<FileChanges> {
+        let threads = self.threads;
+        let source = self.source()?;
+        let files = source.scan(threads)?;
+        let changes = FileChanges::between(&self.files, &files);
+
+        // Parse before touching any state so a failure leaves the index intact.
+        let stale = changes.stale_paths();
+        let parsed = match self.fonts.get() {
+            Some(_) => source.load(&stale, threads)?,
+            None => Vec::new(),
+        };
+
+        if let Some(fonts) = self.fonts.take() {
+            let mut by_path = fonts.into_file_entries();
+            by_path.extend(stale.into_iter().zip(parsed));
+            let entries: Vec<FontEntry> = files
+                .iter()
+                .flat_map(|file| by_path.remove(&file.path).unwrap_or_default())
+                .collect();
+            let _ = self.fonts.set(IndexedFonts::new(entries));
+        }
+        self.files = files;
+        self.glyph_counts.take();
+        if !changes.is_empty() {
+            self.cache_clear();
+        }
+
+        if let Some(source) = self.source.as_mut() {
+            source.revision = revision;
+            if let Some(fonts) = self.fonts.get() {
+                source.store(&self.files, &fonts.entries)?;
             }
         }
-        let bytes: Vec<u8> = flat.iter().flat_map(|&v| v.to_ne_bytes()).collect();
-        Ok(PyBytes::new(py, &bytes))
+        Ok(changes)
     }
+
+    fn measured_fonts(&self) -> PyResult<&IndexedFonts> {
+        let fonts = self.fonts()?;
+        // Persist the metadata pass so warm starts can skip it.
+        let measured = measure_entries(&fonts.entries, self.threads)?;
+        if let Some(source) = self.source.as_ref().filter(|_| measured) {
+            source.store(&self.files, &fonts.entries)?;
+        }
+        Ok(fonts)
+    }
+
+    fn load_glyph_counts(&self) -> PyResult<&Vec<u64>> {
+        if let Some(counts) = self.glyph_counts.get() {
+            return Ok(counts);
+        }
+
+        let counts = par_map(&self.files, self.threads, |file| {
+            FontEntry::count_glyphs(&file.path)
+        })
+        .into_iter()
+        .collect::<PyResult<Vec<_>>>()?;
+        Ok(self.glyph_counts.get_or_init(|| counts))
+    }
+
+    fn draw(&self, idx: usize) -> PyResult<(Arc<Outline>, usize, usize)> {
+        let fonts = self.fonts()?;
+        let (font_idx, inst_idx, codepoint, style_idx, content_idx) = fonts.locate(idx)?;
+        if let Some(outline) = self.cache.as_ref().and_then(|cache| cache.get(idx)) {
+            return Ok((outline, style_idx, content_idx));
+        }
+
+        let outline = Arc::new(fonts.entries[font_idx].glyph(codepoint, inst_idx, self.spec)?);
+        if let Some(cache) = &self.cache {
+            cache.insert(idx, Arc::clone(&outline));
+        }
+        Ok((outline, style_idx, content_idx))
+    }
+
+    fn draw_batch(&self, indices: &[usize], threads: usize) -> PyResult<GlyphBatch> {
+        // Index once up front instead of racing to do so on every worker thread.
+        self.fonts()?;
+        let samples = par_map(indices, threads, |&idx| self.draw(idx));
+        let mut batch = GlyphBatch::with_capacity(indices.len());
+        for sample in samples {
+            let (outline, style_idx, content_idx) = sample?;
+            batch.push(&outline.types, &outline.coords, style_idx, content_idx);
+        }
+        Ok(batch)
+    }
+}
+
+fn resolve_threads(num_threads: Option<usize>) -> usize {
+    num_threads
+        .filter(|&count| count > 0)
+        .unwrap_or_else(default_threads)
+}
+
+fn resolve_spec(args: Option<SpecArgs>, coord_format: &str) -> PyResult<OutlineSpec> {
+    let format = CoordFormat::parse(coord_format)
+        .ok_or_else(|| py_err(format!("unsupported coord_format '{coord_format}'")))?;
+    let spec = args.map_or_else(
+        OutlineSpec::default,
+        |(max_len, patch_size, normalize, close_path, eos, compact)| OutlineSpec {
+            max_len,
+            patch_size: patch_size.filter(|&size| size > 0),
+            normalize,
+            close_path,
+            eos,
+            compact,
+            ..OutlineSpec::default()
+        },
+    );
+    Ok(OutlineSpec { format, ..spec })
+}
+
+fn offsets_buffer<'py>(py: Python<'py>, offsets: &[usize]) -> Buffer<'py> {
+    let offsets: Vec<i64> = offsets.iter().map(|&offset| offset as i64).collect();
+    to_bytearray(py, &offsets)
+}
+
+fn location_columns<'py>(py: Python<'py>, locations: &SampleLocations) -> Columns<'py> {
+    (
+        to_bytearray(py, &locations.font_indices),
+        to_bytearray(py, &locations.instance_indices),
+        to_bytearray(py, &locations.codepoints),
+        to_bytearray(py, &locations.style_indices),
+        to_bytearray(py, &locations.content_indices),
+    )
 }
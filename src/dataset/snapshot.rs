@@ -0,0 +1,316 @@
+use std::{fs, path::Path, sync::Arc};
+
+use pyo3::prelude::*;
+
+use super::entry::FontEntry;
+use super::index::{FontSource, GlyphFilter};
+use super::io::{FileStamp, map_font, stat_files};
+use crate::error::py_err;
+
+const MAGIC: &[u8; 8] = b"TFINDEX\0";
+const VERSION: u32 = 3;
+
+#[derive(Default)]
+pub(super) struct Writer {
+    buf: Vec<u8>,
+}
+
+impl Writer {
+    pub(super) fn finish(self) -> Vec<u8> {
+        self.buf
+    }
+
+    pub(super) fn u32(&mut self, value: u32) {
+        self.buf.extend_from_slice(&value.to_le_bytes());
+    }
+
+    pub(super) fn u64(&mut self, value: u64) {
+        self.buf.extend_from_slice(&value.to_le_bytes());
+    }
+
+    pub(super) fn f32(&mut self, value: f32) {
+        self.buf.extend_from_slice(&value.to_le_bytes());
+    }
+
+    pub(super) fn count(&mut self, value: usize) {
+        self.u64(value as u64);
+    }
+
+    pub(super) fn flag(&mut self, value: bool) {
+        self.buf.push(u8::from(value));
+    }
+
+    pub(super) fn blob(&mut self, value: &[u8]) {
+        self.count(value.len());
+        self.buf.extend_from_slice(value);
+    }
+
+    pub(super) fn str(&mut self, value: &str) {
+        self.blob(value.as_bytes());
+    }
+
+    pub(super) fn u32s(&mut self, values: &[u32]) {
+        self.count(values.len());
+        values.iter().for_each(|&value| self.u32(value));
+    }
+
+    pub(super) fn i16s(&mut self, values: &[i16]) {
+        self.count(values.len());
+        for value in values {
+            self.buf.extend_from_slice(&value.to_le_bytes());
+        }
+    }
+}
+
+pub(super) struct Reader<'a> {
+    data: &'a [u8],
+    pos: usize,
+}
+
+impl<'a> Reader<'a> {
+    pub(super) fn new(data: &'a [u8]) -> Self {
+        Self { data, pos: 0 }
+    }
+
+    pub(super) fn is_exhausted(&self) -> bool {
+        self.pos == self.data.len()
+    }
+
+    fn take(&mut self, len: usize) -> PyResult<&'a [u8]> {
+        let end = self
+            .pos
+            .checked_add(len)
+            .filter(|&end| end <= self.data.len())
+            .ok_or_else(|| py_err("font index snapshot is truncated or corrupt"))?;
+        let bytes = &self.data[self.pos..end];
+        self.pos = end;
+        Ok(bytes)
+    }
+
+    fn array<const N: usize>(&mut self) -> PyResult<[u8; N]> {
+        let mut out = [0; N];
+        out.copy_from_slice(self.take(N)?);
+        Ok(out)
+    }
+
+    pub(super) fn u32(&mut self) -> PyResult<u32> {
+        self.array().map(u32::from_le_bytes)
+    }
+
+    pub(super) fn u64(&mut self) -> PyResult<u64> {
+        self.array().map(u64::from_le_bytes)
+    }
+
+    pub(super) fn f32(&mut self) -> PyResult<f32> {
+        self.array().map(f32::from_le_bytes)
+    }
+
+    pub(super) fn count(&mut self) -> PyResult<usize> {
+        usize::try_from(self.u64()?)
+            .map_err(|_| py_err("font index snapshot is truncated or corrupt"))
+    }
+
+    pub(super) fn flag(&mut self) -> PyResult<bool> {
+        Ok(self.take(1)?[0] != 0)
+    }
+
+    pub(super) fn blob(&mut self) -> PyResult<&'a [u8]> {
+        let len = self.count()?;
+        self.take(len)
+    }
+
+    pub(super) fn str(&mut self) -> PyResult<&'a str> {
+        std::str::from_utf8(self.blob()?)
+            .map_err(|_| py_err("font index snapshot is truncated or corrupt"))
+    }
+
+    pub(super) fn u32s(&mut self) -> PyResult<Vec<u32>> {
+        let len = self.count()?;
+        let bytes = self.take(len.saturating_mul(4))?;
+        Ok(bytes
+            .chunks_exact(4)
+            .map(|chunk| u32::from_le_bytes([chunk[0], chunk[1], chunk[2], chunk[3]]))
+            .collect())
+    }
+
+    pub(super) fn i16s(&mut self) -> PyResult<Vec<i16>> {
+        let len = self.count()?;
+        let bytes = self.take(len.saturating_mul(2))?;
+        Ok(bytes
+            .chunks_exact(2)
+            .map(|chunk| i16::from_le_bytes([chunk[0], chunk[1]]))
+            .collect())
+    }
+}
+
+pub(super) fn index_key(
+    root: &Path,
+    patterns: Option<&[String]>,
+    filter: Option<&[u32]>,
+    revision: Option<&str>,
+    glyph_filter: &GlyphFilter,
+) -> Vec<u8> {
+    let mut writer = Writer::default();
+    writer.str(&root.to_string_lossy());
+    writer.flag(patterns.is_some());
+    if let Some(patterns) = patterns {
+        writer.count(patterns.len());
+        patterns.iter().for_each(|pattern| writer.str(pattern));
+    }
+    writer.flag(filter.is_some());
+    if let Some(filter) = filter {
+        writer.u32s(filter);
+    }
+    writer.flag(revision.is_some());
+    if let Some(revision) = revision {
+        writer.str(revision);
+    }
+    glyph_filter.encode(&mut writer);
+    writer.finish()
+}
+
+pub(super) fn encode_fonts(writer: &mut Writer, files: &[FileStamp], entries: &[FontEntry]) {
+    writer.count(files.len());
+    let mut remaining = entries;
+    for file in files {
+        let face_count = remaining
+            .iter()
+            .take_while(|entry| entry.path == file.path)
+            .count();
+        let (faces, rest) = remaining.split_at(face_count);
+        writer.str(&file.path);
+        writer.u64(file.size);
+        writer.u64(file.modified);
+        writer.count(faces.len());
+        faces.iter().for_each(|entry| entry.encode(writer));
+        remaining = rest;
+    }
+}
+
+pub(super) fn decode_fonts(reader: &mut Reader<'_>) -> PyResult<(Vec<FileStamp>, Vec<FontEntry>)> {
+    let mut files = Vec::new();
+    let mut entries = Vec::new();
+    for _ in 0..reader.count()? {
+        let path = reader.str()?.to_string();
+        let size = reader.u64()?;
+        let modified = reader.u64()?;
+        let data = map_font(&path)?;
+        for _ in 0..reader.count()? {
+            entries.push(FontEntry::decode(reader, &path, Arc::clone(&data))?);
+        }
+        files.push(FileStamp {
+            path,
+            size,
+            modified,
+        });
+    }
+    Ok((files, entries))
+}
+
+pub(super) fn encode_snapshot(key: &[u8], files: &[FileStamp], entries: &[FontEntry]) -> Vec<u8> {
+    let mut writer = Writer::default();
+    writer.buf.extend_from_slice(MAGIC);
+    writer.u32(VERSION);
+    writer.blob(key);
+    encode_fonts(&mut writer, files, entries);
+    writer.finish()
+}
+
+pub(super) fn decode_snapshot(
+    data: &[u8],
+    key: &[u8],
+) -> PyResult<(Vec<FileStamp>, Vec<FontEntry>)> {
+    let (mut reader, stored_key) = open_snapshot(data)?;
+    if stored_key != key {
+        return Err(py_err(
+            "font index snapshot was built for different options",
+        ));
+    }
+    finish_snapshot(&mut reader)
+}
+
+// Worker snapshots carry the font source in place of the cache key, so
+// restored datasets can still refresh and re-index.
+pub(super) fn encode_dataset(
+    source: Option<&FontSource>,
+    files: &[FileStamp],
+    entries: &[FontEntry],
+) -> Vec<u8> {
+    let mut header = Writer::default();
+    header.flag(source.is_some());
+    if let Some(source) = source {
+        source.encode(&mut header);
+    }
+    encode_snapshot(&header.finish(), files, entries)
+}
+
+pub(super) fn decode_dataset(
+    data: &[u8],
+    threads: usize,
+) -> PyResult<(Option<FontSource>, Vec<FileStamp>, Vec<FontEntry>)> {
+    let (mut reader, header) = open_snapshot(data)?;
+    let mut header = Reader::new(header);
+    let source = if header.flag()? {
+        Some(FontSource::decode(&mut header)?)
+    } else {
+        None
+    };
+    if !header.is_exhausted() {
+        return Err(py_err("font index snapshot is truncated or corrupt"));
+    }
+
+    let (files, entries) = finish_snapshot(&mut reader)?;
+    let paths: Vec<String> = files.iter().map(|file| file.path.clone()).collect();
+    if stat_files(&paths, threads)? != files {
+        return Err(py_err(
+            "font files changed since the index snapshot was taken",
+        ));
+    }
+    Ok((source, files, entries))
+}
+
+fn open_snapshot(data: &[u8]) -> PyResult<(Reader<'_>, &[u8])> {
+    let mut reader = Reader::new(data);
+    if reader.take(MAGIC.len())? != MAGIC || reader.u32()? != VERSION {
+        return Err(py_err("not a font index snapshot of a supported version"));
+    }
+    let key = reader.blob()?;
+    Ok((reader, key))
+}
+
+fn finish_snapshot(reader: &mut Reader<'_>) -> PyResult<(Vec<FileStamp>, Vec<FontEntry>)> {
+    let fonts = decode_fonts(reader)?;
+    if !reader.is_exhausted() {
+        return Err(py_err("font index snapshot is truncated or corrupt"));
+    }
+    Ok(fonts)
+}
+
+pub(super) fn read_index(path: &Path, key: &[u8]) -> Option<(Vec<FileStamp>, Vec<FontEntry>)> {
+    let data = fs::read(path).ok()?;
+    decode_snapshot(&data, key).ok()
+}
+
+pub(super) fn write_index(
+    path: &Path,
+    key: &[u8],
+    files: &[FileStamp],
+    entries: &[FontEntry],
+) -> PyResult<()> {
+    let write_err = |err: std::io::Error| {
+        py_err(format!(
+            "failed to write index cache '{}': {err}",
+            path.display()
+        ))
+    };
+    if let Some(parent) = path
+        .parent()
+        .filter(|parent| !parent.as_os_str().is_empty())
+    {
+        fs::create_dir_all(parent).map_err(write_err)?;
+    }
+    let mut staging = path.as_os_str().to_owned();
+    staging.push(format!(".{}.tmp", std::process::id()));
+    fs::write(&staging, encode_snapshot(key, files, entries)).map_err(write_err)?;
+    fs::rename(&staging, path).map_err(write_err)
+}
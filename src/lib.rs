@@ -1,11 +1,13 @@
+mod buffer;
 mod dataset;
 mod error;
+mod parallel;
 mod pen;
 
 use dataset::FontDataset;
 use pyo3::{Bound, prelude::*, types::PyModule};
 
-#[pymodule]
+#[pymodule(gil_used = false)]
 fn _torchfont(_py: Python<'_>, m: Bound<'_, PyModule>) -> PyResult<()> {
     m.add_class::<FontDataset>()?;
     Ok(())
@@ -0,0 +1,50 @@
+use std::{
+    num::NonZeroUsize,
+    sync::atomic::{AtomicUsize, Ordering},
+    thread,
+};
+
+pub fn default_threads() -> usize {
+    thread::available_parallelism().map_or(1, NonZeroUsize::get)
+}
+
+// Scoped threads are spawned per call instead of keeping a global pool so the
+// backend stays usable in DataLoader workers created with `fork`.
+pub fn par_map<T, R, F>(items: &[T], threads: usize, f: F) -> Vec<R>
+where
+    T: Sync,
+    R: Send,
+    F: Fn(&T) -> R + Sync,
+{
+    let threads = threads.clamp(1, items.len().max(1));
+    if threads == 1 {
+        return items.iter().map(f).collect();
+    }
+
+    let next = AtomicUsize::new(0);
+    let mut results: Vec<(usize, R)> = thread::scope(|scope| {
+        let workers: Vec<_> = (0..threads)
+            .map(|_| {
+                scope.spawn(|| {
+                    let mut local = Vec::new();
+                    loop {
+                        let idx = next.fetch_add(1, Ordering::Relaxed);
+                        let Some(item) = items.get(idx) else {
+                            break;
+                        };
+                        local.push((idx, f(item)));
+                    }
+                    local
+                })
+            })
+            .collect();
+
+        workers
+            .into_iter()
+            .flat_map(|worker| worker.join().expect("parallel worker panicked"))
+            .collect()
+    });
+
+    results.sort_unstable_by_key(|(idx, _)| *idx);
+    results.into_iter().map(|(_, value)| value).collect()
+}
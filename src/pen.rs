@@ -1,7 +1,11 @@
+use std::ops::Range;
+
 use skrifa::outline::OutlinePen;
 
+use crate::buffer::as_bytes;
+
 #[derive(Clone, Copy)]
-#[repr(i32)]
+#[repr(u8)]
 enum Command {
     MoveTo = 1,
     LineTo = 2,
@@ -10,16 +14,146 @@ enum Command {
     End = 5,
 }
 
+impl Command {
+    // Coordinate pairs of a 6-wide row that hold points rather than zeros.
+    fn point_pairs(command: u8) -> Range<usize> {
+        match command {
+            c if c == Self::MoveTo as u8 || c == Self::LineTo as u8 => 2..3,
+            c if c == Self::CurveTo as u8 => 0..3,
+            _ => 0..0,
+        }
+    }
+}
+
+pub struct Outline {
+    pub types: Vec<u8>,
+    // Native-endian elements in the `CoordFormat` of the spec that drew them.
+    pub coords: Vec<u8>,
+}
+
+impl Outline {
+    pub fn nbytes(&self) -> usize {
+        size_of::<Self>() + size_of_val(&self.types[..]) + size_of_val(&self.coords[..])
+    }
+}
+
+// Steps per em unit of `CoordFormat::I16`, which covers about +/-8 em.
+pub const FIXED_POINT_SCALE: f32 = 4096.0;
+
+// Element type of the coordinates handed to Python.
+#[derive(Clone, Copy, Default)]
+pub enum CoordFormat {
+    #[default]
+    F32,
+    F16,
+    BF16,
+    // Fixed point with `FIXED_POINT_SCALE` steps per unit, saturating.
+    I16,
+}
+
+impl CoordFormat {
+    pub fn parse(name: &str) -> Option<Self> {
+        match name {
+            "float32" => Some(Self::F32),
+            "float16" => Some(Self::F16),
+            "bfloat16" => Some(Self::BF16),
+            "int16" => Some(Self::I16),
+            _ => None,
+        }
+    }
+
+    fn encode(self, values: &[f32]) -> Vec<u8> {
+        let encode16 =
+            |convert: fn(f32) -> [u8; 2]| values.iter().flat_map(|&value| convert(value)).collect();
+        match self {
+            Self::F32 => as_bytes(values).to_vec(),
+            Self::F16 => encode16(|value| f16_bits(value).to_ne_bytes()),
+            Self::BF16 => encode16(|value| bf16_bits(value).to_ne_bytes()),
+            Self::I16 => {
+                encode16(|value| ((value * FIXED_POINT_SCALE).round() as i16).to_ne_bytes())
+            }
+        }
+    }
+}
+
+// IEEE binary16 bits of `value`, rounding half to even like `torch.float16`.
+fn f16_bits(value: f32) -> u16 {
+    let bits = value.to_bits();
+    let sign = ((bits >> 16) & 0x8000) as u16;
+    let exponent = ((bits >> 23) & 0xff) as i32;
+    let mantissa = bits & 0x7f_ffff;
+    if exponent == 0xff {
+        return sign | 0x7c00 | if mantissa == 0 { 0 } else { 0x200 };
+    }
+    let exponent = exponent - 112;
+    if exponent >= 0x1f {
+        return sign | 0x7c00;
+    }
+    if exponent <= 0 {
+        if exponent < -10 {
+            return sign;
+        }
+        return sign | round_shift(mantissa | 0x80_0000, (14 - exponent) as u32) as u16;
+    }
+    // A carry out of the mantissa bumps the exponent, up to infinity.
+    sign | round_shift(((exponent as u32) << 23) | mantissa, 13) as u16
+}
+
+// bfloat16 bits of `value`, rounding half to even like `torch.bfloat16`.
+fn bf16_bits(value: f32) -> u16 {
+    if value.is_nan() {
+        return ((value.to_bits() >> 16) | 0x40) as u16;
+    }
+    round_shift(value.to_bits(), 16) as u16
+}
+
+fn round_shift(value: u32, shift: u32) -> u32 {
+    let half = 1 << (shift - 1);
+    let rest = value & ((1 << shift) - 1);
+    let quotient = value >> shift;
+    quotient + u32::from(rest > half || (rest == half && quotient & 1 == 1))
+}
+
+// Declarative post-processing applied while an outline is drawn.
+#[derive(Clone, Copy)]
+pub struct OutlineSpec {
+    pub max_len: Option<usize>,
+    pub patch_size: Option<usize>,
+    // Fit the control box into [-1, 1] around its center, keeping the aspect.
+    pub normalize: bool,
+    pub close_path: bool,
+    pub eos: bool,
+    // Store only the points of each command instead of 6-wide rows.
+    pub compact: bool,
+    pub format: CoordFormat,
+}
+
+impl Default for OutlineSpec {
+    fn default() -> Self {
+        Self {
+            max_len: None,
+            patch_size: None,
+            normalize: false,
+            close_path: true,
+            eos: true,
+            compact: false,
+            format: CoordFormat::F32,
+        }
+    }
+}
+
 pub struct SegmentPen {
-    commands: Vec<i32>,
+    commands: Vec<u8>,
     coords: Vec<f32>,
     scale: f32,
     current: (f32, f32),
     start: (f32, f32),
+    spec: OutlineSpec,
+    bbox: Option<[f32; 4]>,
 }
 
 impl SegmentPen {
-    pub fn new(units_per_em: f32) -> Self {
+    pub fn new(units_per_em: f32, spec: OutlineSpec) -> Self {
         debug_assert!(units_per_em > 0.0, "units_per_em must be positive");
         let scale = units_per_em.recip();
         Self {
@@ -28,18 +162,88 @@ impl SegmentPen {
             scale,
             current: (0.0, 0.0),
             start: (0.0, 0.0),
+            spec,
+            bbox: None,
         }
     }
 
-    pub fn finish(mut self) -> (Vec<i32>, Vec<f32>) {
-        self.push(Command::End, [0.0; 6]);
-        (self.commands, self.coords)
+    pub fn finish(mut self) -> Outline {
+        if self.spec.eos {
+            self.push(Command::End, [0.0; 6]);
+        }
+        if self.spec.normalize {
+            self.normalize();
+        }
+        if let Some(size) = self.spec.patch_size {
+            let padded = self.commands.len().div_ceil(size) * size;
+            self.commands.resize(padded, 0);
+            // Padding commands hold no points in the compact layout.
+            if !self.spec.compact {
+                self.coords.resize(padded * 6, 0.0);
+            }
+        }
+        Outline {
+            types: self.commands,
+            coords: self.spec.format.encode(&self.coords),
+        }
     }
 
     fn push(&mut self, command: Command, values: [f32; 6]) {
-        self.commands.push(command as i32);
         let scaled = values.map(|value| value * self.scale);
-        self.coords.extend_from_slice(&scaled);
+        // Track the box over every point, including those past `max_len`, so
+        // normalization does not depend on where the sequence is cut.
+        if self.spec.normalize {
+            for pair in Command::point_pairs(command as u8) {
+                let (x, y) = (scaled[2 * pair], scaled[2 * pair + 1]);
+                let bbox = self.bbox.get_or_insert([x, y, x, y]);
+                *bbox = [
+                    bbox[0].min(x),
+                    bbox[1].min(y),
+                    bbox[2].max(x),
+                    bbox[3].max(y),
+                ];
+            }
+        }
+        if self
+            .spec
+            .max_len
+            .is_some_and(|max_len| self.commands.len() >= max_len)
+        {
+            return;
+        }
+        self.commands.push(command as u8);
+        if self.spec.compact {
+            let points = Command::point_pairs(command as u8);
+            self.coords
+                .extend_from_slice(&scaled[2 * points.start..2 * points.end]);
+        } else {
+            self.coords.extend_from_slice(&scaled);
+        }
+    }
+
+    fn normalize(&mut self) {
+        let Some([x_min, y_min, x_max, y_max]) = self.bbox else {
+            return;
+        };
+        let half = (x_max - x_min).max(y_max - y_min) / 2.0;
+        if half <= 0.0 {
+            return;
+        }
+        let center = [(x_min + x_max) / 2.0, (y_min + y_max) / 2.0];
+        let normalize = |point: &mut [f32]| {
+            for (value, center) in point.iter_mut().zip(center) {
+                *value = (*value - center) / half;
+            }
+        };
+        if self.spec.compact {
+            self.coords.chunks_exact_mut(2).for_each(normalize);
+            return;
+        }
+        for (&command, row) in self.commands.iter().zip(self.coords.chunks_exact_mut(6)) {
+            for pair in Command::point_pairs(command) {
+                normalize(&mut row[2 * pair..2 * pair + 2]);
+            }
+        }
     }
 }
 
@@ -71,7 +275,89 @@ impl OutlinePen for SegmentPen {
     }
 
     fn close(&mut self) {
-        self.push(Command::ClosePath, [0.0; 6]);
+        if self.spec.close_path {
+            self.push(Command::ClosePath, [0.0; 6]);
+        }
         self.current = self.start;
     }
 }
+
+#[derive(Clone, Copy, Default, PartialEq)]
+pub struct GlyphMetrics {
+    // Includes the trailing `End` command emitted by `SegmentPen`.
+    pub commands: u32,
+    pub contours: u32,
+    // On- and off-curve points of the source outline.
+    pub points: u32,
+    // Control box as (x_min, y_min, x_max, y_max) in em units; zero when empty.
+    pub bbox: [f32; 4],
+}
+
+impl GlyphMetrics {
+    pub fn is_empty(&self) -> bool {
+        self.contours == 0
+    }
+}
+
+// Measures an outline without storing its commands or coordinates.
+pub struct MetricsPen {
+    metrics: GlyphMetrics,
+    scale: f32,
+}
+
+impl MetricsPen {
+    pub fn new(units_per_em: f32) -> Self {
+        debug_assert!(units_per_em > 0.0, "units_per_em must be positive");
+        Self {
+            metrics: GlyphMetrics::default(),
+            scale: units_per_em.recip(),
+        }
+    }
+
+    pub fn finish(mut self) -> GlyphMetrics {
+        self.metrics.commands += 1;
+        self.metrics
+    }
+
+    fn segment(&mut self, points: &[(f32, f32)]) {
+        self.metrics.commands += 1;
+        for &(x, y) in points {
+            let (x, y) = (x * self.scale, y * self.scale);
+            let bbox = &mut self.metrics.bbox;
+            if self.metrics.points == 0 {
+                *bbox = [x, y, x, y];
+            } else {
+                *bbox = [
+                    bbox[0].min(x),
+                    bbox[1].min(y),
+                    bbox[2].max(x),
+                    bbox[3].max(y),
+                ];
+            }
+            self.metrics.points += 1;
+        }
+    }
+}
+
+impl OutlinePen for MetricsPen {
+    fn move_to(&mut self, x: f32, y: f32) {
+        self.metrics.contours += 1;
+        self.segment(&[(x, y)]);
+    }
+
+    fn line_to(&mut self, x: f32, y: f32) {
+        self.segment(&[(x, y)]);
+    }
+
+    fn quad_to(&mut self, cx0: f32, cy0: f32, x: f32, y: f32) {
+        self.segment(&[(cx0, cy0), (x, y)]);
+    }
+
+    fn curve_to(&mut self, cx0: f32, cy0: f32, cx1: f32, cy1: f32, x: f32, y: f32) {
+        self.segment(&[(cx0, cy0), (cx1, cy1), (x, y)]);
+    }
+
+    fn close(&mut self) {
+        self.segment(&[]);
+    }
+}
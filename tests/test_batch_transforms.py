@@ -0,0 +1,118 @@
+import torch
+from torch.nn.utils.rnn import pad_sequence
+
+from torchfont.io.outline import TYPE_TO_IDX
+from torchfont.transforms import (
+    BatchCompose,
+    BatchLimitSequenceLength,
+    BatchNormalize,
+    BatchPatchify,
+    BatchRandomAffine,
+    BatchRandomFlip,
+    BatchRandomJitter,
+    LimitSequenceLength,
+    NativeTransform,
+    Patchify,
+)
+
+MOVE, LINE, CURVE, CLOSE, EOS = (
+    TYPE_TO_IDX[name] for name in ("moveTo", "lineTo", "curveTo", "closePath", "eos")
+)
+
+
+def _glyph(points: list[tuple[float, float]]) -> tuple[torch.Tensor, torch.Tensor]:
+    types = [MOVE] + [LINE] * (len(points) - 1) + [CLOSE, EOS]
+    coords = torch.zeros(len(types), 6)
+    coords[: len(points), 4:] = torch.tensor(points)
+    return torch.tensor(types), coords
+
+
+def _batch() -> tuple[list, torch.Tensor, torch.Tensor, torch.Tensor]:
+    samples = [
+        _glyph([(0.0, 0.0), (2.0, 0.0), (2.0, 1.0)]),
+        _glyph([(1.0, 1.0), (1.5, 3.0), (0.5, 2.0), (1.0, 1.5), (0.8, 1.2)]),
+    ]
+    curve_types = torch.tensor([MOVE, CURVE, CLOSE, EOS])
+    curve_coords = torch.zeros(4, 6)
+    curve_coords[0, 4:] = torch.tensor([0.0, 0.0])
+    curve_coords[1] = torch.tensor([0.0, 1.0, 1.0, 1.0, 1.0, 0.0])
+    samples.append((curve_types, curve_coords))
+
+    types = pad_sequence([t for t, _ in samples], batch_first=True)
+    coords = pad_sequence([c for _, c in samples], batch_first=True)
+    return samples, types, coords, types == 0
+
+
+def test_batch_transforms_match_per_sample_counterparts() -> None:
+    """Test that batch transforms match their per-sample counterparts."""
+    samples, types, coords, padding_mask = _batch()
+
+    limited = BatchLimitSequenceLength(4)(types, coords, padding_mask)
+    patched = BatchPatchify(3)(*limited)
+    for row, (sample_types, sample_coords) in enumerate(samples):
+        expected = Patchify(3)(*LimitSequenceLength(4)(sample_types, sample_coords))
+        num_patches = expected[0].size(0)
+        assert torch.equal(patched[0][row, :num_patches], expected[0])
+        assert torch.equal(patched[1][row, :num_patches], expected[1])
+        assert not patched[2][row, :num_patches].any()
+        assert patched[2][row, num_patches:].all()
+
+    normalized = BatchNormalize()(types, coords, padding_mask)
+    for row, (sample_types, sample_coords) in enumerate(samples):
+        expected = NativeTransform(normalize=True)(sample_types, sample_coords)
+        length = sample_types.numel()
+        assert torch.allclose(normalized[1][row, :length], expected[1])
+        assert not normalized[1][row, length:].any()
+
+
+def test_batch_geometric_transforms_keep_zero_columns() -> None:
+    """Test that geometric batch transforms keep unused coordinates at zero."""
+    _, types, coords, padding_mask = _batch()
+    zeros = coords == 0
+    generator = torch.Generator().manual_seed(0)
+    augment = BatchCompose(
+        [
+            BatchNormalize(),
+            BatchRandomAffine(
+                degrees=30.0,
+                scale=(0.5, 1.5),
+                shear=10.0,
+                translate=0.2,
+                generator=generator,
+            ),
+            BatchRandomJitter(0.05, generator=generator),
+            BatchRandomFlip(p_x=0.5, p_y=0.5, generator=generator),
+        ]
+    )
+    out_types, out_coords, out_mask = augment(types, coords, padding_mask)
+
+    assert torch.equal(out_types, types)
+    assert torch.equal(out_mask, padding_mask)
+    assert not out_coords[:, :, :4][
+        zeros[:, :, :4] & (types != CURVE).unsqueeze(-1)
+    ].any()
+    assert not out_coords[types >= CLOSE].any()
+    assert not out_coords[padding_mask].any()
+    assert not torch.equal(out_coords, coords)
+
+
+def test_batch_random_transforms_are_reproducible() -> None:
+    """Test that random batch transforms are reproducible with a generator."""
+    _, types, coords, padding_mask = _batch()
+
+    def run(seed: int) -> torch.Tensor:
+        generator = torch.Generator().manual_seed(seed)
+        affine = BatchRandomAffine(degrees=45.0, generator=generator)
+        return affine(types, coords, padding_mask)[1]
+
+    assert torch.equal(run(1), run(1))
+    assert not torch.equal(run(1), run(2))
+
+
+def test_batch_random_flip_mirrors_about_box_center() -> None:
+    """Test that the random flip mirrors glyphs about their box center."""
+    _, types, coords, padding_mask = _batch()
+    flipped = BatchRandomFlip(p_x=1.0)(types, coords, padding_mask)[1]
+
+    assert torch.allclose(flipped[0, :3, 4], torch.tensor([2.0, 0.0, 0.0]))
+    assert torch.equal(flipped[0, :3, 5], coords[0, :3, 5])
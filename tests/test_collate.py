@@ -0,0 +1,183 @@
+import pytest
+import torch
+from torch.nn.utils.rnn import pad_sequence
+from torch.utils.data import DataLoader
+
+from torchfont.data import GlyphCollate, PackedCollate, to_nested
+from torchfont.datasets import FontFolder
+from torchfont.io.outline import expand_points, point_offsets
+from torchfont.transforms import (
+    Compose,
+    LimitSequenceLength,
+    NativeTransform,
+    Patchify,
+)
+
+
+def test_glyph_collate_matches_pad_sequence() -> None:
+    """Test that GlyphCollate pads samples like pad_sequence."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf", "roboto/Roboto*.ttf"),
+        codepoint_filter=range(0x41, 0x5B),
+    )
+
+    samples = [dataset[idx] for idx in (0, 9, 30, -1)]
+    batch = GlyphCollate()(samples)
+
+    types = pad_sequence([sample[0] for sample in samples], batch_first=True)
+    coords = pad_sequence([sample[1] for sample in samples], batch_first=True)
+    assert torch.equal(batch.types, types)
+    assert torch.equal(batch.coords, coords)
+    assert torch.equal(batch.padding_mask, types == 0)
+    assert batch.style_idx.tolist() == [sample[2] for sample in samples]
+    assert batch.content_idx.tolist() == [sample[3] for sample in samples]
+
+
+def test_glyph_collate_fixed_and_rounded_length() -> None:
+    """Test that GlyphCollate pads to a fixed length or a rounded multiple."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf", "roboto/Roboto*.ttf"),
+        codepoint_filter=range(0x41, 0x5B),
+    )
+
+    samples = [dataset[idx] for idx in range(8)]
+    longest = max(sample[0].numel() for sample in samples)
+
+    rounded = GlyphCollate(pad_to_multiple=64)(samples)
+    assert rounded.types.shape == (8, -(-longest // 64) * 64)
+
+    fixed = GlyphCollate(length=16)(samples)
+    assert fixed.coords.shape == (8, 16, 6)
+    assert torch.equal(fixed.types[0], samples[0][0][:16])
+    assert fixed.padding_mask.sum(1).tolist() == [
+        max(16 - sample[0].numel(), 0) for sample in samples
+    ]
+
+
+def test_glyph_collate_pads_packed_batch() -> None:
+    """Test that padding a packed batch matches collating its samples."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf", "roboto/Roboto*.ttf"),
+        codepoint_filter=range(0x41, 0x5B),
+    )
+
+    indices = [3, 1, 4, 1, 5]
+    collate_fn = GlyphCollate(pad_to_multiple=8)
+
+    packed = collate_fn.pad(dataset.get_batch(indices))
+    listed = collate_fn([dataset[idx] for idx in indices])
+    for actual, expected in zip(packed, listed, strict=True):
+        assert torch.equal(actual, expected)
+
+
+def test_glyph_collate_accepts_patched_samples() -> None:
+    """Test that GlyphCollate pads patched samples by patch count."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf", "roboto/Roboto*.ttf"),
+        codepoint_filter=range(0x41, 0x5B),
+        transform=Compose([LimitSequenceLength(100), Patchify(32)]),
+    )
+
+    loader = DataLoader(dataset, batch_size=6, collate_fn=GlyphCollate())
+    batch = next(iter(loader))
+    patches = [dataset[idx][0].size(0) for idx in range(6)]
+
+    assert batch.types.shape == (6, max(patches), 32)
+    assert batch.coords.shape == (6, max(patches), 32, 6)
+    assert batch.padding_mask.sum(1).tolist() == [max(patches) - n for n in patches]
+
+    with pytest.raises(ValueError, match="empty"):
+        GlyphCollate()([])
+    with pytest.raises(ValueError, match="length"):
+        GlyphCollate(length=0)
+
+
+def test_packed_collate_matches_limit_sequence_length() -> None:
+    """Test that PackedCollate truncates like LimitSequenceLength."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf", "roboto/Roboto*.ttf"),
+        codepoint_filter=range(0x41, 0x5B),
+    )
+    limited = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf", "roboto/Roboto*.ttf"),
+        codepoint_filter=range(0x41, 0x5B),
+        transform=LimitSequenceLength(12),
+    )
+
+    indices = [0, 8, 21, -1]
+
+    packed = PackedCollate(max_len=12).pack(dataset.get_batch(indices))
+    listed = PackedCollate()([limited[idx] for idx in indices])
+    for actual, expected in zip(packed, listed, strict=True):
+        assert torch.equal(actual, expected)
+
+    whole = dataset.get_batch(indices)
+    assert PackedCollate().pack(whole) is whole
+
+
+def test_to_nested_views_packed_batch() -> None:
+    """Test that to_nested splits a packed batch into its samples."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf", "roboto/Roboto*.ttf"),
+        codepoint_filter=range(0x41, 0x5B),
+    )
+
+    indices = [2, 5, 13]
+    types, coords = to_nested(PackedCollate()([dataset[idx] for idx in indices]))
+
+    assert types.is_nested
+    assert coords.size(0) == len(indices)
+    assert coords.size(2) == 6
+    for idx, sample_types, sample_coords in zip(
+        indices, types.unbind(), coords.unbind(), strict=True
+    ):
+        assert torch.equal(sample_types, dataset[idx][0])
+        assert torch.equal(sample_coords, dataset[idx][1])
+
+    with pytest.raises(ValueError, match="max_len"):
+        PackedCollate(max_len=0)
+
+
+def test_compact_samples_expand_and_collate() -> None:
+    """Test that compact samples collate like full-layout samples."""
+    plain = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf", "roboto/Roboto*.ttf"),
+        codepoint_filter=range(0x41, 0x5B),
+    )
+    compact = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf", "roboto/Roboto*.ttf"),
+        codepoint_filter=range(0x41, 0x5B),
+        transform=NativeTransform(compact=True),
+    )
+
+    indices = [0, 9, 30, -1]
+
+    batch = compact.get_batch(indices)
+    assert batch.coords.shape[1:] == (2,)
+    assert batch.coords.numel() < plain.get_batch(indices).coords.numel()
+    expanded = expand_points(batch.types, batch.coords)
+    assert torch.equal(expanded, plain.get_batch(indices).coords)
+
+    samples = compact.__getitems__(indices)
+    expected = GlyphCollate()([plain[idx] for idx in indices])
+    for actual, wanted in zip(GlyphCollate()(samples), expected, strict=True):
+        assert torch.equal(actual, wanted)
+
+    packed = PackedCollate(max_len=12)(samples)
+    limited = PackedCollate(max_len=12)([plain[idx] for idx in indices])
+    assert torch.equal(packed.types, limited.types)
+    assert torch.equal(expand_points(packed.types, packed.coords), limited.coords)
+
+    _, points = to_nested(packed)
+    bounds = point_offsets(packed.types, packed.offsets).tolist()
+    for row in range(len(indices)):
+        assert torch.equal(points[row], packed.coords[bounds[row] : bounds[row + 1]])
@@ -1,13 +1,20 @@
 import multiprocessing as mp
+import os
 import pickle
+import shutil
 import warnings
-from unittest.mock import PropertyMock, patch
+from pathlib import Path
+from unittest.mock import Mock, PropertyMock, patch
 
 import pytest
 import torch
 from torch.utils.data import DataLoader
 
+from torchfont import _torchfont
 from torchfont.datasets import FontFolder
+from torchfont.datasets.folder import GlyphBatch
+from torchfont.io.outline import TYPE_TO_IDX
+from torchfont.transforms import Dequantize, NativeTransform
 
 
 def test_font_folder_static_fonts() -> None:
@@ -73,6 +80,23 @@ def test_font_folder_getitem() -> None:
     assert 0 <= content_idx < len(dataset.content_classes)
 
 
+def test_font_folder_getitem_buffers() -> None:
+    """Test that backend buffers decode into a well-formed glyph sequence."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf",),
+        codepoint_filter=[ord("A")],
+    )
+
+    types, coords, _, _ = dataset[0]
+
+    assert types.shape[0] == coords.shape[0]
+    assert types[-1].item() == TYPE_TO_IDX["eos"]
+    assert types[0].item() == TYPE_TO_IDX["moveTo"]
+    assert coords.is_contiguous()
+    assert torch.all(coords[-1] == 0)
+
+
 def test_font_folder_negative_indexing() -> None:
     """Test that negative indexing works correctly."""
     dataset = FontFolder(
@@ -108,6 +132,34 @@ def test_font_folder_negative_indexing() -> None:
         assert content_sl == content_exp2
 
 
+def test_font_folder_getitems_matches_getitem() -> None:
+    """Test that batched loading returns the same samples as __getitem__."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=("roboto/Roboto*.ttf",),
+        codepoint_filter=range(0x41, 0x44),
+    )
+
+    indices = [0, len(dataset) - 1, 1, -2]
+    batch = dataset.__getitems__(indices)
+
+    assert len(batch) == len(indices)
+    for idx, (types, coords, style_idx, content_idx) in zip(
+        indices,
+        batch,
+        strict=True,
+    ):
+        expected_types, expected_coords, expected_style, expected_content = dataset[idx]
+        assert torch.equal(types, expected_types)
+        assert torch.equal(coords, expected_coords)
+        assert style_idx == expected_style
+        assert content_idx == expected_content
+
+    assert dataset.__getitems__([]) == []
+    with pytest.raises(IndexError):
+        dataset.__getitems__([len(dataset)])
+
+
 def test_font_folder_index_out_of_bounds() -> None:
     """Test that out of bounds indices raise IndexError."""
     dataset = FontFolder(
@@ -417,3 +469,610 @@ def test_targets_survives_pickle() -> None:
     restored = pickle.loads(pickle.dumps(dataset))  # noqa: S301
 
     assert torch.equal(restored.targets, original_targets)
+
+
+def test_pickle_restores_index_from_snapshot() -> None:
+    """Test that unpickling restores the index from the snapshot."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=("*.ttf",),
+        codepoint_filter=range(0x41, 0x44),
+    )
+
+    state = dataset.__getstate__()
+    snapshot = state["_index_snapshot"]
+    assert isinstance(snapshot, torch.Tensor)
+    assert snapshot.dtype == torch.uint8
+
+    # The snapshot, not the constructor arguments, defines the restored index.
+    state["patterns"] = ("does-not-exist/*.ttf",)
+    restored = FontFolder.__new__(FontFolder)
+    restored.__setstate__(state)
+
+    assert len(restored) == len(dataset)
+    assert restored.style_classes == dataset.style_classes
+    assert torch.equal(restored.targets, dataset.targets)
+    assert torch.equal(restored[-1][1], dataset[-1][1])
+
+
+def test_from_bytes_rejects_corrupt_snapshot() -> None:
+    """Test that from_bytes raises ValueError for a corrupt snapshot."""
+    with pytest.raises(ValueError, match="snapshot"):
+        _torchfont.FontDataset.from_bytes(b"not a snapshot")
+
+
+def test_pickle_rebuilds_index_from_stale_snapshot(tmp_path: Path) -> None:
+    """Test that a snapshot of since-modified fonts falls back to re-indexing."""
+    shutil.copy("tests/fonts/lato/Lato-Regular.ttf", tmp_path)
+    dataset = FontFolder(root=tmp_path, codepoint_filter=range(0x41, 0x5B))
+    state = dataset.__getstate__()
+    snapshot = state["_index_snapshot"]
+    assert isinstance(snapshot, torch.Tensor)
+
+    os.utime(tmp_path / "Lato-Regular.ttf", ns=(0, 0))
+    with pytest.raises(ValueError, match="changed"):
+        _torchfont.FontDataset.from_bytes(snapshot.numpy().tobytes())
+
+    restored = FontFolder.__new__(FontFolder)
+    restored.__setstate__(state)
+    assert len(restored) == len(dataset)
+    assert restored.refresh() == ([], [], [])
+
+
+def test_pickled_dataset_can_refresh(tmp_path: Path) -> None:
+    """Test that a dataset restored from a snapshot keeps its font source."""
+    shutil.copy("tests/fonts/lato/Lato-Regular.ttf", tmp_path)
+    dataset = FontFolder(root=tmp_path, codepoint_filter=range(0x41, 0x5B))
+    restored = pickle.loads(pickle.dumps(dataset))  # noqa: S301
+
+    shutil.copy("tests/fonts/ubuntu/Ubuntu-Regular.ttf", tmp_path)
+    diff = restored.refresh()
+
+    assert [path.name for path in diff.added] == ["Ubuntu-Regular.ttf"]
+    assert len(restored) == len(
+        FontFolder(root=tmp_path, codepoint_filter=range(0x41, 0x5B))
+    )
+
+
+def test_outline_cache_hits_and_misses() -> None:
+    """Test that the outline cache counts hits and misses."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf",),
+        codepoint_filter=range(0x41, 0x44),
+        cache_bytes=1 << 20,
+    )
+
+    first_types, first_coords, _, _ = dataset[0]
+    second_types, second_coords, _, _ = dataset[0]
+
+    assert torch.equal(first_types, second_types)
+    assert torch.equal(first_coords, second_coords)
+
+    info = dataset.cache_info()
+    assert info.misses == 1
+    assert info.hits == 1
+    assert info.entries == 1
+    assert 0 < info.bytes <= info.capacity == 1 << 20
+
+    dataset.cache_clear()
+    assert dataset.cache_info().entries == 0
+
+
+def test_outline_cache_evicts_least_recently_used() -> None:
+    """Test that the outline cache evicts outlines to stay within budget."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf",),
+        codepoint_filter=range(0x41, 0x5B),
+        cache_bytes=4096,
+    )
+
+    for idx in range(len(dataset)):
+        dataset[idx]
+
+    info = dataset.cache_info()
+    assert info.evictions > 0
+    assert info.bytes <= 4096
+
+
+def test_outline_cache_disabled_by_default() -> None:
+    """Test that the outline cache is disabled without cache_bytes."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf",),
+        codepoint_filter=range(0x41, 0x44),
+    )
+
+    dataset[0]
+
+    assert dataset.cache_info() == (0, 0, 0, 0, 0, 0)
+    with pytest.raises(ValueError, match="cache_bytes"):
+        FontFolder(root="tests/fonts", cache_bytes=-1)
+
+
+def test_font_folder_index_independent_of_num_threads() -> None:
+    """Test that the index does not depend on num_threads."""
+    serial, parallel = (
+        FontFolder(
+            root="tests/fonts",
+            patterns=("*.ttf",),
+            codepoint_filter=range(0x41, 0x5B),
+            num_threads=num_threads,
+        )
+        for num_threads in (1, 4)
+    )
+
+    assert len(serial) == len(parallel)
+    assert serial.style_classes == parallel.style_classes
+    assert serial.content_classes == parallel.content_classes
+    assert torch.equal(serial.targets, parallel.targets)
+
+    with pytest.raises(ValueError, match="num_threads"):
+        FontFolder(root="tests/fonts", num_threads=0)
+
+
+def test_workers_draw_batches_on_one_native_thread() -> None:
+    """Test that DataLoader workers draw batches on a single native thread."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf",),
+        codepoint_filter=range(0x41, 0x44),
+    )
+    backend = dataset._dataset  # noqa: SLF001
+    proxy = Mock(wraps=backend, sample_count=backend.sample_count)
+
+    with patch.object(dataset, "_dataset", proxy):
+        dataset.get_batch([0, 1])
+        with patch("torchfont.datasets.folder.get_worker_info", return_value=object()):
+            dataset.get_batch([0, 1])
+
+    calls = [call.args for call in proxy.items.call_args_list]
+    assert calls == [([0, 1], None), ([0, 1], 1)]
+
+
+def test_font_folder_index_cache_round_trip(tmp_path: Path) -> None:
+    """Test that a warm start from index_cache matches a cold build."""
+    index_cache = tmp_path / "index.bin"
+    cold, warm = (
+        FontFolder(
+            root="tests/fonts",
+            patterns=("*.ttf",),
+            codepoint_filter=range(0x41, 0x5B),
+            index_cache=index_cache,
+        )
+        for _ in range(2)
+    )
+    assert index_cache.is_file()
+
+    assert len(warm) == len(cold)
+    assert warm.style_classes == cold.style_classes
+    assert warm.content_classes == cold.content_classes
+    assert torch.equal(warm.targets, cold.targets)
+    for idx in (0, len(cold) // 2, -1):
+        assert torch.equal(warm[idx][1], cold[idx][1])
+
+
+def test_font_folder_index_cache_rebuilds_on_key_change(tmp_path: Path) -> None:
+    """Test that index_cache is rebuilt when the options change."""
+    index_cache = tmp_path / "index.bin"
+    FontFolder(
+        root="tests/fonts",
+        patterns=("*.ttf",),
+        codepoint_filter=[0x41],
+        index_cache=index_cache,
+    )
+    wider = FontFolder(
+        root="tests/fonts",
+        patterns=("*.ttf",),
+        codepoint_filter=[0x41, 0x42],
+        index_cache=index_cache,
+    )
+    reference = FontFolder(
+        root="tests/fonts",
+        patterns=("*.ttf",),
+        codepoint_filter=[0x41, 0x42],
+    )
+
+    assert len(wider) == len(reference)
+    assert wider.content_classes == ["A", "B"]
+
+
+def test_font_folder_index_cache_ignores_corrupt_file(tmp_path: Path) -> None:
+    """Test that a corrupt index_cache file is ignored and rewritten."""
+    index_cache = tmp_path / "index.bin"
+    index_cache.write_bytes(b"not an index")
+
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=("*.ttf",),
+        codepoint_filter=[0x41],
+        index_cache=index_cache,
+    )
+
+    assert len(dataset) > 0
+    assert index_cache.read_bytes() != b"not an index"
+
+
+def test_font_folder_lazy_defers_indexing() -> None:
+    """Test that lazy datasets index on first use."""
+    lazy = FontFolder(
+        root="tests/fonts",
+        patterns=("*.ttf",),
+        codepoint_filter=range(0x41, 0x5B),
+        lazy=True,
+    )
+    eager = FontFolder(
+        root="tests/fonts",
+        patterns=("*.ttf",),
+        codepoint_filter=range(0x41, 0x5B),
+    )
+
+    assert not lazy.is_materialized
+    assert lazy.font_files == eager.font_files
+    assert lazy.glyph_counts == eager.glyph_counts
+    assert all(count > 0 for count in lazy.glyph_counts)
+    assert not lazy.is_materialized
+
+    assert len(lazy) == len(eager)
+    assert lazy.is_materialized
+    assert torch.equal(lazy.targets, eager.targets)
+    assert torch.equal(lazy[-1][1], eager[-1][1])
+
+
+def test_font_folder_materialize_is_idempotent() -> None:
+    """Test that materialize can be called more than once."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/*.ttf",),
+        codepoint_filter=[0x41],
+        lazy=True,
+    )
+
+    dataset.materialize()
+    dataset.materialize()
+
+    assert dataset.is_materialized
+    assert len(dataset) == len(dataset.targets)
+
+
+def test_font_folder_refresh_reindexes_changed_files(tmp_path: Path) -> None:
+    """Test that refresh reports and re-indexes changed font files."""
+    shutil.copy("tests/fonts/lato/Lato-Regular.ttf", tmp_path)
+    shutil.copy("tests/fonts/ubuntu/Ubuntu-Regular.ttf", tmp_path)
+    dataset = FontFolder(root=tmp_path, codepoint_filter=range(0x41, 0x5B))
+
+    assert dataset.refresh() == ([], [], [])
+
+    (tmp_path / "Ubuntu-Regular.ttf").unlink()
+    shutil.copy("tests/fonts/ptsans/PT_Sans-Web-Regular.ttf", tmp_path)
+    diff = dataset.refresh()
+
+    assert [path.name for path in diff.added] == ["PT_Sans-Web-Regular.ttf"]
+    assert diff.modified == []
+    assert [path.name for path in diff.removed] == ["Ubuntu-Regular.ttf"]
+
+    rebuilt = FontFolder(root=tmp_path, codepoint_filter=range(0x41, 0x5B))
+    assert len(dataset) == len(rebuilt)
+    assert dataset.style_classes == rebuilt.style_classes
+    assert torch.equal(dataset.targets, rebuilt.targets)
+    assert torch.equal(dataset[-1][1], rebuilt[-1][1])
+
+
+def test_targets_is_cached() -> None:
+    """Test that targets is built once and cached."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf",),
+        codepoint_filter=range(0x41, 0x44),
+    )
+
+    assert dataset.targets is dataset.targets
+
+
+def test_targets_int32_dtype() -> None:
+    """Test that targets_dtype selects int32 targets."""
+    wide = FontFolder(
+        root="tests/fonts",
+        patterns=("*.ttf",),
+        codepoint_filter=range(0x41, 0x5B),
+    )
+    narrow = FontFolder(
+        root="tests/fonts",
+        patterns=("*.ttf",),
+        codepoint_filter=range(0x41, 0x5B),
+        targets_dtype=torch.int32,
+    )
+
+    assert narrow.targets.dtype == torch.int32
+    assert narrow.targets.shape == wide.targets.shape
+    assert torch.equal(narrow.targets.long(), wide.targets)
+
+    with pytest.raises(ValueError, match="targets_dtype"):
+        FontFolder(root="tests/fonts", targets_dtype=torch.float32)
+
+
+def test_class_lists_and_mappings_are_cached() -> None:
+    """Test that the class lists and mappings are cached."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=("*.ttf",),
+        codepoint_filter=range(0x41, 0x44),
+    )
+
+    assert dataset.style_classes is dataset.style_classes
+    assert dataset.style_class_to_idx is dataset.style_class_to_idx
+    assert dataset.content_classes is dataset.content_classes
+    assert dataset.content_class_to_idx is dataset.content_class_to_idx
+
+
+def test_style_and_content_index_match_mappings() -> None:
+    """Test that single-name lookups agree with the class mappings."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=("*.ttf",),
+        codepoint_filter=range(0x41, 0x44),
+    )
+
+    for name, idx in dataset.style_class_to_idx.items():
+        assert dataset.style_index(name) == idx
+    for char, idx in dataset.content_class_to_idx.items():
+        assert dataset.content_index(char) == idx
+    assert dataset.style_index("No Such Style") is None
+    assert dataset.content_index("\U0010ffff") is None
+
+
+def test_locate_matches_scalar_lookup() -> None:
+    """Test that locate matches the per-sample native lookup."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=("*.ttf",),
+        codepoint_filter=range(0x41, 0x5B),
+    )
+    backend = dataset._dataset  # noqa: SLF001
+
+    full = dataset.locate(range(len(dataset)))
+    picked = dataset.locate(torch.tensor([len(dataset) - 1, 0, -1]))
+
+    assert all(column.shape == (len(dataset),) for column in full)
+    assert torch.equal(full.style_idx, dataset.targets[:, 0])
+    assert torch.equal(full.content_idx, dataset.targets[:, 1])
+    for idx in (0, len(dataset) // 3, len(dataset) - 1):
+        font_idx, instance, codepoint, style_idx, content_idx = backend.locate(idx)
+        assert full.font_idx[idx] == font_idx
+        assert full.instance_idx[idx] == (-1 if instance is None else instance)
+        assert full.codepoint[idx] == codepoint
+        assert full.style_idx[idx] == style_idx
+        assert full.content_idx[idx] == content_idx
+    for column, expected in zip(picked, full, strict=True):
+        assert torch.equal(column, expected[[-1, 0, -1]])
+
+    with pytest.raises(IndexError):
+        dataset.locate([len(dataset)])
+
+
+def test_glyph_metrics_match_drawn_samples() -> None:
+    """Test that glyph_metrics agrees with the drawn samples."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf", "roboto/Roboto*.ttf"),
+        codepoint_filter=[0x20, 0x41, 0x4F],
+    )
+    metrics = dataset.glyph_metrics
+    space = dataset.content_class_to_idx[" "]
+
+    assert metrics.bbox.shape == (len(dataset), 4)
+    assert torch.equal(metrics.commands, dataset.sequence_lengths)
+    for idx in range(len(dataset)):
+        types, _, _, content_idx = dataset[idx]
+        assert int(metrics.commands[idx]) == types.numel()
+        assert bool(metrics.empty[idx]) == (content_idx == space)
+        assert int(metrics.contours[idx]) == int((types == TYPE_TO_IDX["moveTo"]).sum())
+    assert torch.all(
+        metrics.bbox[~metrics.empty, 2:] > metrics.bbox[~metrics.empty, :2]
+    )
+
+
+def test_glyph_metrics_prune_code_points(tmp_path: Path) -> None:
+    """Test that glyph filters prune code points and persist in the cache."""
+    full = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf", "roboto/Roboto*.ttf"),
+        codepoint_filter=range(0x20, 0x5B),
+    )
+    no_empty = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf", "roboto/Roboto*.ttf"),
+        codepoint_filter=range(0x20, 0x5B),
+        drop_empty=True,
+    )
+
+    limit = int(full.sequence_lengths.median())
+    index_cache = tmp_path / "index.bin"
+    short = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf", "roboto/Roboto*.ttf"),
+        codepoint_filter=range(0x20, 0x5B),
+        max_commands=limit,
+        index_cache=index_cache,
+    )
+    warm = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf", "roboto/Roboto*.ttf"),
+        codepoint_filter=range(0x20, 0x5B),
+        max_commands=limit,
+        index_cache=index_cache,
+    )
+
+    assert " " in full.content_classes
+    assert " " not in no_empty.content_classes
+    assert not no_empty.glyph_metrics.empty.any()
+    assert 0 < len(short) < len(full)
+    assert int(short.sequence_lengths.max()) <= limit
+    assert torch.equal(warm.targets, short.targets)
+    assert torch.equal(warm.glyph_metrics.bbox, short.glyph_metrics.bbox)
+
+    with pytest.raises(ValueError, match="max_commands"):
+        FontFolder(root="tests/fonts", max_commands=-1)
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        NativeTransform(max_len=24),
+        NativeTransform(max_len=40, patch_size=16),
+        NativeTransform(normalize=True, close_path=False),
+        NativeTransform(max_len=20, normalize=True, eos=False, patch_size=8),
+        NativeTransform(normalize=True, compact=True),
+        NativeTransform(max_len=30, patch_size=8, compact=True),
+    ],
+)
+def test_native_transform_matches_python_fallback(spec: NativeTransform) -> None:
+    """Test that a NativeTransform matches its Python fallback."""
+    plain = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf", "roboto/Roboto*.ttf"),
+        codepoint_filter=range(0x20, 0x5B),
+    )
+    fused = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf", "roboto/Roboto*.ttf"),
+        codepoint_filter=range(0x20, 0x5B),
+        transform=spec,
+    )
+
+    assert len(fused) == len(plain)
+    for idx in (0, 5, len(plain) // 2, -1):
+        types, coords, style_idx, content_idx = fused[idx]
+        expected = spec(*plain[idx][:2])
+        assert torch.equal(types, expected[0])
+        assert torch.allclose(coords, expected[1], atol=1e-6)
+        assert (style_idx, content_idx) == plain[idx][2:]
+
+
+def test_native_transform_batches_and_pickles() -> None:
+    """Test that native transforms apply to batches and survive pickling."""
+    spec = NativeTransform(max_len=40, patch_size=16)
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf", "roboto/Roboto*.ttf"),
+        codepoint_filter=range(0x20, 0x5B),
+        transform=spec,
+    )
+
+    batch = dataset.get_batch([0, 3, -1])
+
+    assert batch.types.shape[1:] == (16,)
+    assert batch.coords.shape[1:] == (16, 6)
+    for row, idx in enumerate((0, 3, -1)):
+        start, stop = batch.offsets[row : row + 2].tolist()
+        assert torch.equal(batch.types[start:stop], dataset[idx][0])
+
+    restored = pickle.loads(pickle.dumps(dataset))  # noqa: S301
+    assert torch.equal(restored[3][1], dataset[3][1])
+    assert restored[3][0].shape[1] == 16
+
+    with pytest.raises(ValueError, match="patch_size"):
+        NativeTransform(patch_size=0)
+
+
+def test_assigned_native_transform_is_fused() -> None:
+    """Test that assigning a NativeTransform later fuses it into the backend."""
+    spec = NativeTransform(max_len=40, patch_size=16)
+    fused = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf", "roboto/Roboto*.ttf"),
+        codepoint_filter=range(0x20, 0x5B),
+        transform=spec,
+    )
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf", "roboto/Roboto*.ttf"),
+        codepoint_filter=range(0x20, 0x5B),
+    )
+
+    dataset.transform = spec
+
+    assert dataset.transform is spec
+    batch = dataset.get_batch([0, 3, -1])
+    expected = fused.get_batch([0, 3, -1])
+    assert torch.equal(batch.types, expected.types)
+    assert torch.equal(batch.offsets, expected.offsets)
+    for idx in (0, 3, -1):
+        assert torch.equal(dataset[idx][1], fused[idx][1])
+    restored = pickle.loads(pickle.dumps(dataset))  # noqa: S301
+    assert torch.equal(restored[3][1], fused[3][1])
+
+    dataset.transform = None
+
+    assert dataset[3][0].ndim == 1
+
+
+@pytest.mark.parametrize(
+    ("coords_dtype", "atol"),
+    [(torch.float16, 1e-3), (torch.bfloat16, 1e-2), (torch.int16, 2e-4)],
+)
+def test_reduced_precision_dequantizes_to_float32(
+    coords_dtype: torch.dtype,
+    atol: float,
+) -> None:
+    """Test that reduced-precision samples dequantize to float32."""
+    plain = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf", "roboto/Roboto*.ttf"),
+        codepoint_filter=range(0x20, 0x5B),
+    )
+    reduced = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf", "roboto/Roboto*.ttf"),
+        codepoint_filter=range(0x20, 0x5B),
+        coords_dtype=coords_dtype,
+        types_dtype=torch.uint8,
+    )
+
+    batch = reduced.get_batch([0, 3, -1])
+    assert batch.types.dtype == torch.uint8
+    assert batch.coords.dtype == coords_dtype
+    for idx in (0, 3, -1):
+        types, coords, style_idx, content_idx = reduced[idx]
+        expected = plain[idx]
+        assert types.dtype == torch.uint8
+        assert coords.dtype == coords_dtype
+        types, coords = Dequantize()(types, coords)
+        assert torch.equal(types, expected[0])
+        assert torch.allclose(coords, expected[1], atol=atol)
+        assert (style_idx, content_idx) == expected[2:]
+
+    restored = pickle.loads(pickle.dumps(reduced))  # noqa: S301
+    assert torch.equal(restored[3][1], reduced[3][1])
+
+    with pytest.raises(ValueError, match="coords_dtype"):
+        FontFolder(root="tests/fonts", coords_dtype=torch.float64)
+    with pytest.raises(ValueError, match="types_dtype"):
+        FontFolder(root="tests/fonts", types_dtype=torch.float32)
+
+
+def test_compact_getitems_splits_points_by_command_type() -> None:
+    """Test that compact samples split by point count when it equals commands."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf",),
+        codepoint_filter=[ord("A")],
+        transform=NativeTransform(compact=True),
+    )
+
+    types = torch.tensor([1, 3, 4, 5, 1, 2, 2, 4, 5, 1, 3, 3, 4, 5])
+    points = torch.arange(28, dtype=torch.float32).view(-1, 2)
+    batch = GlyphBatch(
+        types=types,
+        coords=points,
+        offsets=torch.tensor([0, 4, 9, 14]),
+        style_idx=torch.zeros(3, dtype=torch.long),
+        content_idx=torch.zeros(3, dtype=torch.long),
+    )
+
+    with patch.object(FontFolder, "get_batch", return_value=batch):
+        samples = dataset.__getitems__([0, 0, 0])
+
+    assert [sample[1].size(0) for sample in samples] == [4, 3, 7]
+    assert torch.equal(torch.cat([sample[1] for sample in samples]), points)
@@ -0,0 +1,144 @@
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+import torch
+
+from torchfont.data import ThreadedLoader
+from torchfont.datasets import FontFolder
+
+
+def collate_labels(
+    batch: list[tuple[torch.Tensor, torch.Tensor, int, int]],
+) -> list[int]:
+    return [content_idx for _, _, _, content_idx in batch]
+
+
+def test_threaded_loader_preserves_order() -> None:
+    """Test that ThreadedLoader yields batches in sampler order."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf",),
+        codepoint_filter=range(0x41, 0x5B),
+    )
+
+    loader = ThreadedLoader(
+        dataset,
+        batch_size=4,
+        collate_fn=collate_labels,
+        num_threads=3,
+    )
+
+    batches = list(loader)
+
+    assert len(batches) == len(loader)
+    flat = [label for batch in batches for label in batch]
+    assert flat == dataset.targets[:, 1].tolist()
+
+
+def test_threaded_loader_shuffle_covers_dataset() -> None:
+    """Test that a shuffled ThreadedLoader visits every sample once."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf",),
+        codepoint_filter=range(0x41, 0x5B),
+    )
+
+    loader = ThreadedLoader(
+        dataset,
+        batch_size=5,
+        shuffle=True,
+        collate_fn=lambda batch: [sample[3] for sample in batch],
+        generator=torch.Generator().manual_seed(0),
+    )
+
+    flat = sorted(label for batch in loader for label in batch)
+    assert flat == sorted(dataset.targets[:, 1].tolist())
+
+
+def test_threaded_loader_default_collate() -> None:
+    """Test that ThreadedLoader falls back to the default collate."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf",),
+        codepoint_filter=range(0x41, 0x5B),
+    )
+
+    loader = ThreadedLoader(dataset, batch_size=1, num_threads=2)
+
+    types, coords, style_idx, content_idx = next(iter(loader))
+
+    assert types.shape[0] == 1
+    assert coords.shape[2] == 6
+    assert style_idx.dtype == torch.long
+    assert content_idx.dtype == torch.long
+
+
+def test_threaded_loader_shared_dataset_across_threads() -> None:
+    """Test that one dataset can be drawn from many threads."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf",),
+        codepoint_filter=range(0x41, 0x5B),
+    )
+
+    expected = [dataset[i] for i in range(len(dataset))]
+    errors: list[BaseException] = []
+
+    def worker() -> None:
+        try:
+            for i in range(len(dataset)):
+                types, coords, _, _ = dataset[i]
+                assert torch.equal(types, expected[i][0])
+                assert torch.equal(coords, expected[i][1])
+        except BaseException as exc:  # noqa: BLE001
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+
+
+def test_threaded_loader_splits_native_threads() -> None:
+    """Test that loader threads draw on an equal share of the CPUs."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf",),
+        codepoint_filter=range(0x41, 0x5B),
+    )
+    backend = dataset._dataset  # noqa: SLF001
+    proxy = Mock(wraps=backend, sample_count=backend.sample_count)
+
+    with (
+        patch("torchfont.data.loader.os.cpu_count", return_value=8),
+        patch.object(dataset, "_dataset", proxy),
+    ):
+        loader = ThreadedLoader(
+            dataset,
+            batch_size=4,
+            collate_fn=collate_labels,
+            num_threads=2,
+        )
+        list(loader)
+        dataset.get_batch([0, 1])
+
+    budgets = [call.args[1] for call in proxy.items.call_args_list]
+    assert budgets == [4] * len(loader) + [None]
+
+
+def test_threaded_loader_rejects_invalid_options() -> None:
+    """Test that ThreadedLoader rejects invalid options."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf",),
+        codepoint_filter=range(0x41, 0x5B),
+    )
+
+    with pytest.raises(ValueError, match="num_threads"):
+        ThreadedLoader(dataset, num_threads=0)
+    with pytest.raises(ValueError, match="prefetch_factor"):
+        ThreadedLoader(dataset, prefetch_factor=0)
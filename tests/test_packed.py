@@ -0,0 +1,162 @@
+import pickle
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+import torch
+
+from torchfont.datasets import FontFolder, PackedGlyphDataset, pack_dataset
+from torchfont.datasets.folder import GlyphBatch
+
+
+def test_get_batch_matches_getitem() -> None:
+    """Test that get_batch matches indexing sample by sample."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf", "roboto/Roboto*.ttf"),
+        codepoint_filter=range(0x41, 0x5B),
+    )
+
+    batch = dataset.get_batch([0, 7, -1])
+
+    assert batch.offsets.tolist()[0] == 0
+    assert batch.offsets.numel() == 4
+    for row, idx in enumerate((0, 7, -1)):
+        types, coords, style_idx, content_idx = dataset[idx]
+        start, stop = batch.offsets[row : row + 2].tolist()
+        assert torch.equal(batch.types[start:stop], types)
+        assert torch.equal(batch.coords[start:stop], coords)
+        assert batch.style_idx[row].item() == style_idx
+        assert batch.content_idx[row].item() == content_idx
+
+    empty = dataset.get_batch([])
+    assert empty.offsets.tolist() == [0]
+    assert empty.types.numel() == 0
+
+
+def test_packed_dataset_round_trip(tmp_path: Path) -> None:
+    """Test that packed shards serve the samples of the source dataset."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf", "roboto/Roboto*.ttf"),
+        codepoint_filter=range(0x41, 0x5B),
+    )
+
+    out_dir = pack_dataset(dataset, tmp_path / "packed", shard_size=40, batch_size=16)
+    packed = PackedGlyphDataset(out_dir)
+
+    assert len(packed) == len(dataset)
+    assert len(list(out_dir.glob("shard-*.offsets.bin"))) == -(-len(dataset) // 40)
+    assert packed.style_classes == dataset.style_classes
+    assert packed.content_classes == dataset.content_classes
+    assert packed.content_class_to_idx == dataset.content_class_to_idx
+    assert torch.equal(packed.targets, dataset.targets)
+
+    for idx in (0, 39, 40, len(dataset) - 1, -1):
+        types, coords, style_idx, content_idx = packed[idx]
+        expected = dataset[idx]
+        assert torch.equal(types, expected[0])
+        assert torch.equal(coords, expected[1])
+        assert (style_idx, content_idx) == expected[2:]
+
+    with pytest.raises(IndexError):
+        packed[len(packed)]
+
+
+def test_packed_dataset_leaves_shards_unchanged(tmp_path: Path) -> None:
+    """Test that in-place edits of returned samples do not reach the shards."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf",),
+        codepoint_filter=range(0x41, 0x5B),
+    )
+
+    out_dir = pack_dataset(dataset, tmp_path / "packed", shard_size=40)
+    shards = sorted(out_dir.glob("shard-*.coords.bin"))
+    before = [path.read_bytes() for path in shards]
+    packed = PackedGlyphDataset(out_dir)
+    packed[0][1].mul_(2)
+
+    assert [path.read_bytes() for path in shards] == before
+    assert torch.equal(PackedGlyphDataset(out_dir)[0][1], dataset[0][1])
+
+
+def test_packed_dataset_pickles_without_arrays(tmp_path: Path) -> None:
+    """Test that pickling a packed dataset leaves out its memory maps."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf", "roboto/Roboto*.ttf"),
+        codepoint_filter=range(0x41, 0x5B),
+    )
+
+    out_dir = pack_dataset(dataset, tmp_path)
+    packed = PackedGlyphDataset(out_dir)
+    payload = pickle.dumps(packed)
+    restored = pickle.loads(payload)  # noqa: S301
+
+    assert len(payload) < 16 * 1024
+    assert torch.equal(restored[3][1], packed[3][1])
+
+
+def test_packed_dataset_applies_transform(tmp_path: Path) -> None:
+    """Test that PackedGlyphDataset applies its transform."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf", "roboto/Roboto*.ttf"),
+        codepoint_filter=range(0x41, 0x5B),
+    )
+
+    out_dir = pack_dataset(dataset, tmp_path)
+    packed = PackedGlyphDataset(
+        out_dir,
+        transform=lambda types, coords: (types, coords * 2),
+    )
+    plain = PackedGlyphDataset(out_dir)
+
+    assert torch.equal(packed[0][1], plain[0][1] * 2)
+
+
+def test_packed_dataset_rejects_unknown_format(tmp_path: Path) -> None:
+    """Test that PackedGlyphDataset rejects an unknown format."""
+    (tmp_path / "meta.json").write_text('{"format": "other"}', encoding="utf-8")
+
+    with pytest.raises(ValueError, match="supported packed"):
+        PackedGlyphDataset(tmp_path)
+
+
+def test_packed_dataset_keeps_reduced_precision(tmp_path: Path) -> None:
+    """Test that packing keeps the dataset's coords_dtype."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf",),
+        codepoint_filter=range(0x41, 0x5B),
+        coords_dtype=torch.bfloat16,
+    )
+
+    packed = PackedGlyphDataset(pack_dataset(dataset, tmp_path / "packed"))
+
+    assert packed.coords_dtype == torch.bfloat16
+    for idx in (0, -1):
+        assert torch.equal(packed[idx][1], dataset[idx][1])
+
+
+def test_pack_dataset_writes_empty_patched_batches(tmp_path: Path) -> None:
+    """Test that patched batches without any patches are packed as empty."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf",),
+        codepoint_filter=[ord("A")],
+    )
+
+    batch = GlyphBatch(
+        types=torch.empty(0, 4, dtype=torch.long),
+        coords=torch.empty(0, 4, 6),
+        offsets=torch.zeros(2, dtype=torch.long),
+        style_idx=torch.zeros(1, dtype=torch.long),
+        content_idx=torch.zeros(1, dtype=torch.long),
+    )
+    with patch.object(FontFolder, "get_batch", return_value=batch):
+        packed = PackedGlyphDataset(pack_dataset(dataset, tmp_path / "packed"))
+
+    assert len(packed) == 1
+    assert packed[0][0].numel() == 0
@@ -0,0 +1,268 @@
+import pytest
+
+from torchfont.data import BlockShuffleSampler, BucketBatchSampler, FontShardSampler
+from torchfont.datasets import FontFolder
+
+
+def _fonts(dataset: FontFolder, indices: list[int]) -> set[int]:
+    return set(dataset.locate(indices).font_idx.tolist())
+
+
+def test_font_shard_sampler_keeps_fonts_on_one_rank() -> None:
+    """Test that FontShardSampler keeps every font on one rank."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=(
+            "lato/Lato-Regular.ttf",
+            "ubuntu/Ubuntu-Regular.ttf",
+            "ptsans/PT_Sans-Web-Regular.ttf",
+            "roboto/Roboto*.ttf",
+        ),
+        codepoint_filter=range(0x41, 0x5B),
+    )
+
+    samplers = [
+        FontShardSampler(dataset, num_replicas=2, rank=rank, shuffle=False)
+        for rank in range(2)
+    ]
+    shards = [list(sampler) for sampler in samplers]
+
+    assert all(len(shard) == len(samplers[0]) for shard in shards)
+    assert not _fonts(dataset, shards[0]) & _fonts(dataset, shards[1])
+
+
+def test_font_shard_sampler_rotates_partitions() -> None:
+    """Test that FontShardSampler rotates partitions across epochs."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=(
+            "lato/Lato-Regular.ttf",
+            "ubuntu/Ubuntu-Regular.ttf",
+            "ptsans/PT_Sans-Web-Regular.ttf",
+            "roboto/Roboto*.ttf",
+        ),
+        codepoint_filter=range(0x41, 0x5B),
+    )
+
+    sampler = FontShardSampler(dataset, num_replicas=2, rank=0, seed=5)
+    first = list(sampler)
+
+    assert list(sampler) == first
+    sampler.set_epoch(1)
+    second = list(sampler)
+    assert not _fonts(dataset, first) & _fonts(dataset, second)
+
+
+def test_font_shard_sampler_groups_by_style() -> None:
+    """Test that grouping by style keeps every instance on one rank."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=(
+            "lato/Lato-Regular.ttf",
+            "ubuntu/Ubuntu-Regular.ttf",
+            "ptsans/PT_Sans-Web-Regular.ttf",
+            "roboto/Roboto*.ttf",
+        ),
+        codepoint_filter=range(0x41, 0x5B),
+    )
+
+    sampler = FontShardSampler(dataset, shuffle=False, group_by="style")
+
+    assert list(sampler) == list(range(len(dataset)))
+
+    shards = [
+        dataset.locate(
+            list(FontShardSampler(dataset, num_replicas=2, rank=rank, group_by="style"))
+        ).style_idx.tolist()
+        for rank in range(2)
+    ]
+    assert not set(shards[0]) & set(shards[1])
+
+    with pytest.raises(ValueError, match="group_by"):
+        FontShardSampler(dataset, group_by="glyph")  # ty: ignore[invalid-argument-type]
+
+
+def test_font_shard_sampler_drop_last_trims() -> None:
+    """Test that drop_last trims every rank to N // num_replicas."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=(
+            "lato/Lato-Regular.ttf",
+            "ubuntu/Ubuntu-Regular.ttf",
+            "ptsans/PT_Sans-Web-Regular.ttf",
+            "roboto/Roboto*.ttf",
+        ),
+        codepoint_filter=range(0x41, 0x5B),
+    )
+
+    sampler = FontShardSampler(dataset, num_replicas=3, rank=1, drop_last=True)
+
+    assert len(sampler) == len(dataset) // 3
+    assert len(list(sampler)) == len(sampler)
+
+
+def test_font_shard_sampler_visits_trimmed_tails() -> None:
+    """Test that trimmed tails are visited in later epochs without shuffle."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=(
+            "lato/Lato-Regular.ttf",
+            "ubuntu/Ubuntu-Regular.ttf",
+            "ptsans/PT_Sans-Web-Regular.ttf",
+            "roboto/Roboto*.ttf",
+        ),
+        codepoint_filter=range(0x41, 0x5B),
+    )
+
+    visited = set()
+    for rank in range(3):
+        sampler = FontShardSampler(
+            dataset,
+            num_replicas=3,
+            rank=rank,
+            shuffle=False,
+            drop_last=True,
+        )
+        for epoch in range(-(-len(dataset) // len(sampler))):
+            sampler.set_epoch(epoch)
+            visited.update(sampler)
+
+    assert visited == set(range(len(dataset)))
+
+
+def test_font_shard_sampler_fills_empty_partitions() -> None:
+    """Test that ranks without a font still yield num_samples indices."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=("lato/Lato-Regular.ttf",),
+        codepoint_filter=range(0x41, 0x5B),
+    )
+
+    shards = [
+        list(FontShardSampler(dataset, num_replicas=3, rank=rank, shuffle=False))
+        for rank in range(3)
+    ]
+
+    assert [len(shard) for shard in shards] == [len(shards[0])] * 3
+    assert len(shards[0]) == -(-len(dataset) // 3)
+    assert shards[1] != shards[2]
+    assert all(0 <= idx < len(dataset) for shard in shards for idx in shard)
+
+
+def test_block_shuffle_sampler_visits_every_sample() -> None:
+    """Test that BlockShuffleSampler visits every sample once per epoch."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=(
+            "lato/Lato-Regular.ttf",
+            "ubuntu/Ubuntu-Regular.ttf",
+            "ptsans/PT_Sans-Web-Regular.ttf",
+            "roboto/Roboto*.ttf",
+        ),
+        codepoint_filter=range(0x41, 0x5B),
+    )
+
+    sampler = BlockShuffleSampler(dataset, block_size=8, window=2, seed=1)
+    indices = list(sampler)
+
+    assert len(indices) == len(sampler) == len(dataset)
+    assert sorted(indices) == list(range(len(dataset)))
+    assert list(sampler) == indices
+    sampler.set_epoch(1)
+    assert list(sampler) != indices
+
+
+def test_block_shuffle_sampler_keeps_windows_font_local() -> None:
+    """Test that BlockShuffleSampler keeps each window font-local."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=(
+            "lato/Lato-Regular.ttf",
+            "ubuntu/Ubuntu-Regular.ttf",
+            "ptsans/PT_Sans-Web-Regular.ttf",
+            "roboto/Roboto*.ttf",
+        ),
+        codepoint_filter=range(0x41, 0x5B),
+    )
+
+    sampler = BlockShuffleSampler(dataset, block_size=16, window=1)
+    indices = list(sampler)
+    styles = dataset.locate(indices).style_idx
+    block_count = int(((dataset.targets[:, 0].bincount() + 15) // 16).sum())
+
+    assert int((styles.diff() != 0).sum()) <= block_count - 1
+
+    with pytest.raises(ValueError, match="block_size"):
+        BlockShuffleSampler(dataset, block_size=0)
+
+
+def test_sequence_lengths_match_drawn_samples() -> None:
+    """Test that sequence_lengths matches the drawn samples."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=(
+            "lato/Lato-Regular.ttf",
+            "ubuntu/Ubuntu-Regular.ttf",
+            "ptsans/PT_Sans-Web-Regular.ttf",
+            "roboto/Roboto*.ttf",
+        ),
+        codepoint_filter=range(0x41, 0x5B),
+    )
+
+    lengths = dataset.sequence_lengths
+
+    assert lengths.shape == (len(dataset),)
+    for idx in (0, 17, len(dataset) - 1):
+        assert int(lengths[idx]) == dataset[idx][0].numel()
+
+
+def test_bucket_batch_sampler_respects_token_budget() -> None:
+    """Test that BucketBatchSampler keeps batches within max_tokens."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=(
+            "lato/Lato-Regular.ttf",
+            "ubuntu/Ubuntu-Regular.ttf",
+            "ptsans/PT_Sans-Web-Regular.ttf",
+            "roboto/Roboto*.ttf",
+        ),
+        codepoint_filter=range(0x41, 0x5B),
+    )
+
+    sampler = BucketBatchSampler(dataset, max_tokens=512, seed=2)
+    batches = list(sampler)
+    lengths = dataset.sequence_lengths
+
+    assert len(batches) == len(sampler)
+    assert sorted(idx for batch in batches for idx in batch) == list(
+        range(len(dataset))
+    )
+    for batch in batches:
+        longest = int(lengths[batch].max())
+        assert len(batch) == 1 or len(batch) * longest <= 512
+    assert list(sampler) == batches
+
+
+def test_bucket_batch_sampler_splits_ranks_evenly() -> None:
+    """Test that BucketBatchSampler gives every rank the same batch count."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=(
+            "lato/Lato-Regular.ttf",
+            "ubuntu/Ubuntu-Regular.ttf",
+            "ptsans/PT_Sans-Web-Regular.ttf",
+            "roboto/Roboto*.ttf",
+        ),
+        codepoint_filter=range(0x41, 0x5B),
+    )
+
+    shards = [
+        list(BucketBatchSampler(dataset, batch_size=8, num_replicas=2, rank=rank))
+        for rank in range(2)
+    ]
+
+    assert len(shards[0]) == len(shards[1])
+    assert all(len(batch) <= 8 for shard in shards for batch in shard)
+
+    with pytest.raises(ValueError, match="batch_size or max_tokens"):
+        BucketBatchSampler(dataset)
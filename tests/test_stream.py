@@ -0,0 +1,123 @@
+import pytest
+import torch
+
+from torchfont.datasets import FontFolder, FontStream
+
+
+def _keys(samples: list[tuple[torch.Tensor, torch.Tensor, int, int]]) -> list:
+    return [(style_idx, content_idx) for _, _, style_idx, content_idx in samples]
+
+
+def test_font_stream_without_shuffle_follows_index() -> None:
+    """Test that an unshuffled FontStream follows the index order."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=(
+            "lato/Lato-Regular.ttf",
+            "ubuntu/Ubuntu-Regular.ttf",
+            "roboto/Roboto*.ttf",
+        ),
+        codepoint_filter=range(0x41, 0x5B),
+    )
+
+    stream = FontStream(dataset, shuffle=False)
+    samples = list(stream)
+
+    assert len(samples) == len(stream) == len(dataset)
+    assert _keys(samples) == dataset.targets.tolist()
+    assert torch.equal(samples[5][1], dataset[5][1])
+
+
+def test_font_stream_shards_whole_faces_across_ranks() -> None:
+    """Test that FontStream keeps every face on one rank."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=(
+            "lato/Lato-Regular.ttf",
+            "ubuntu/Ubuntu-Regular.ttf",
+            "roboto/Roboto*.ttf",
+        ),
+        codepoint_filter=range(0x41, 0x5B),
+    )
+
+    styles = []
+    for rank in range(2):
+        stream = FontStream(dataset, seed=3, num_replicas=2, rank=rank)
+        rank_keys = _keys(list(stream))
+        assert len(rank_keys) == len(stream)
+        styles.append({style_idx for style_idx, _ in rank_keys})
+
+    assert not styles[0] & styles[1]
+
+    offsets = dataset.sample_offsets
+    assert offsets[0] == 0
+    assert offsets[-1] == len(dataset)
+
+
+def test_font_stream_yields_equal_lengths_across_ranks() -> None:
+    """Test that every rank yields the same number of samples."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=(
+            "lato/Lato-Regular.ttf",
+            "ubuntu/Ubuntu-Regular.ttf",
+            "roboto/Roboto*.ttf",
+        ),
+        codepoint_filter=range(0x41, 0x5B),
+    )
+
+    for num_replicas in (2, 3, 5):
+        for drop_last in (False, True):
+            streams = [
+                FontStream(
+                    dataset,
+                    num_replicas=num_replicas,
+                    rank=rank,
+                    drop_last=drop_last,
+                )
+                for rank in range(num_replicas)
+            ]
+            expected = len(dataset) // num_replicas
+            if not drop_last:
+                expected = -(-len(dataset) // num_replicas)
+
+            assert [len(stream) for stream in streams] == [expected] * num_replicas
+            assert all(len(list(stream)) == expected for stream in streams)
+
+
+def test_font_stream_is_deterministic_per_epoch() -> None:
+    """Test that FontStream repeats its order within an epoch."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=(
+            "lato/Lato-Regular.ttf",
+            "ubuntu/Ubuntu-Regular.ttf",
+            "roboto/Roboto*.ttf",
+        ),
+        codepoint_filter=range(0x41, 0x5B),
+    )
+
+    stream = FontStream(dataset, buffer_size=16, seed=7)
+    first = _keys(list(stream))
+
+    assert _keys(list(stream)) == first
+    stream.set_epoch(1)
+    assert _keys(list(stream)) != first
+
+
+def test_font_stream_validates_arguments() -> None:
+    """Test that FontStream rejects invalid arguments."""
+    dataset = FontFolder(
+        root="tests/fonts",
+        patterns=(
+            "lato/Lato-Regular.ttf",
+            "ubuntu/Ubuntu-Regular.ttf",
+            "roboto/Roboto*.ttf",
+        ),
+        codepoint_filter=range(0x41, 0x5B),
+    )
+
+    with pytest.raises(ValueError, match="buffer_size"):
+        FontStream(dataset, buffer_size=0)
+    with pytest.raises(ValueError, match="rank"):
+        FontStream(dataset, num_replicas=2, rank=2)
@@ -6,7 +6,34 @@ class FontDataset:
         root: str,
         codepoint_filter: Sequence[int] | None = ...,
         patterns: Sequence[str] | None = ...,
+        cache_bytes: int | None = ...,
+        num_threads: int | None = ...,
+        index_cache: str | None = ...,
+        revision: str | None = ...,
+        lazy: bool = ...,
+        max_commands: int | None = ...,
+        min_contours: int | None = ...,
+        drop_empty: bool = ...,
+        outline_spec: tuple[int | None, int | None, bool, bool, bool, bool]
+        | None = ...,
+        coord_format: str = ...,
     ) -> None: ...
+    @staticmethod
+    def from_bytes(
+        data: bytes,
+        cache_bytes: int | None = ...,
+        num_threads: int | None = ...,
+        outline_spec: tuple[int | None, int | None, bool, bool, bool, bool]
+        | None = ...,
+        coord_format: str = ...,
+    ) -> FontDataset: ...
+    def to_bytes(self) -> bytes: ...
+    def materialize(self) -> None: ...
+    def glyph_counts(self) -> list[int]: ...
+
+    is_materialized: bool
+
+    font_files: list[str]
 
     sample_count: int
 
@@ -17,9 +44,37 @@ class FontDataset:
     def item(
         self,
         idx: int,
-    ) -> tuple[list[int], list[float], int, int]: ...
+    ) -> tuple[bytearray, bytearray, int, int]: ...
+    def items(
+        self,
+        indices: Sequence[int],
+        num_threads: int | None = ...,
+    ) -> tuple[bytearray, bytearray, bytearray, bytearray, bytearray]: ...
+    def sample_offsets(self) -> bytearray: ...
+    def inst_offsets(self) -> bytearray: ...
+    def sequence_lengths(self) -> bytearray: ...
+    def glyph_metrics(
+        self,
+    ) -> tuple[bytearray, bytearray, bytearray, bytearray, bytearray]: ...
+    def style_index(self, name: str) -> int | None: ...
+    def content_index(self, codepoint: int) -> int | None: ...
     def locate(
         self,
         idx: int,
     ) -> tuple[int, int | None, int, int, int]: ...
-    def targets(self) -> bytes: ...
+    def refresh(
+        self,
+        revision: str | None = ...,
+    ) -> tuple[list[str], list[str], list[str]]: ...
+    def locate_many(
+        self,
+        indices: bytes,
+    ) -> tuple[bytearray, bytearray, bytearray, bytearray, bytearray]: ...
+    def locate_range(
+        self,
+        start: int,
+        stop: int,
+    ) -> tuple[bytearray, bytearray, bytearray, bytearray, bytearray]: ...
+    def cache_info(self) -> tuple[int, int, int, int, int, int]: ...
+    def cache_clear(self) -> None: ...
+    def targets(self, wide: bool = ...) -> bytearray: ...
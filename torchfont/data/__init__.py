@@ -0,0 +1,29 @@
+"""Data loading utilities that complement :mod:`torch.utils.data`.
+
+Examples:
+    Stream batches from a shared dataset using background threads::
+
+        from torchfont.data import ThreadedLoader
+        from torchfont.datasets import FontFolder
+
+        loader = ThreadedLoader(FontFolder(root="~/fonts"), batch_size=64)
+
+"""
+
+from torchfont.data.collate import GlyphCollate, PackedCollate, to_nested
+from torchfont.data.loader import ThreadedLoader
+from torchfont.data.sampler import (
+    BlockShuffleSampler,
+    BucketBatchSampler,
+    FontShardSampler,
+)
+
+__all__ = [
+    "BlockShuffleSampler",
+    "BucketBatchSampler",
+    "FontShardSampler",
+    "GlyphCollate",
+    "PackedCollate",
+    "ThreadedLoader",
+    "to_nested",
+]
@@ -0,0 +1,46 @@
+"""Helpers shared by samplers and datasets that split fonts across ranks."""
+
+import heapq
+
+import torch
+import torch.distributed as dist
+from torch import Tensor
+
+
+def resolve_replicas(num_replicas: int | None, rank: int | None) -> tuple[int, int]:
+    """Fill in the world size and rank from the default process group.
+
+    Raises:
+        ValueError: If ``rank`` is out of range for ``num_replicas``.
+
+    """
+    distributed = dist.is_available() and dist.is_initialized()
+    if num_replicas is None:
+        num_replicas = dist.get_world_size() if distributed else 1
+    if rank is None:
+        rank = dist.get_rank() if distributed else 0
+    if not 0 <= rank < num_replicas:
+        msg = f"rank {rank} is out of range for {num_replicas} replicas"
+        raise ValueError(msg)
+    return num_replicas, rank
+
+
+def balance(sizes: Tensor, num_parts: int) -> list[list[int]]:
+    """Split items into ``num_parts`` groups with near-equal total size.
+
+    Greedy longest-processing-time assignment: the largest remaining item goes
+    to the group with the smallest total, ties broken by group index. Empty
+    items are skipped and each group is returned in ascending item order.
+    """
+    loads = [(0, part) for part in range(num_parts)]
+    groups: list[list[int]] = [[] for _ in range(num_parts)]
+    order = torch.argsort(sizes, descending=True, stable=True).tolist()
+    for item, size in zip(order, sizes[order].tolist(), strict=True):
+        if size == 0:
+            continue
+        load, part = heapq.heappop(loads)
+        groups[part].append(item)
+        heapq.heappush(loads, (load + size, part))
+    for group in groups:
+        group.sort()
+    return groups
@@ -0,0 +1,338 @@
+"""Collate glyph samples into padded or packed batch tensors.
+
+Notes:
+    :class:`GlyphCollate` concatenates the variable-length samples of a batch
+    once and scatters them into preallocated padded tensors, instead of
+    padding ``types`` and ``coords`` separately and building label tensors from
+    Python lists. :class:`PackedCollate` stops after the concatenation and
+    keeps per-sample offsets, which :func:`to_nested` turns into jagged nested
+    tensors. Batches drawn with :meth:`FontFolder.get_batch` are already
+    concatenated and skip that step. Compact samples from
+    ``NativeTransform(compact=True)`` stay compact through
+    :class:`PackedCollate`, so the point stream is what crosses worker
+    boundaries, and :class:`GlyphCollate` expands them before padding.
+
+Examples:
+    Pad every batch to a multiple of 64 steps::
+
+        from torch.utils.data import DataLoader
+
+        from torchfont.data import GlyphCollate
+
+        loader = DataLoader(
+            dataset,
+            batch_size=64,
+            collate_fn=GlyphCollate(pad_to_multiple=64),
+        )
+
+"""
+
+from collections.abc import Sequence
+from typing import NamedTuple
+
+import torch
+from torch import Tensor
+
+from torchfont.datasets.folder import GlyphBatch
+from torchfont.io.outline import (
+    COORD_DIM,
+    expand_points,
+    point_counts,
+    point_offsets,
+)
+
+
+class PaddedGlyphBatch(NamedTuple):
+    """Padded batch returned by :class:`GlyphCollate`.
+
+    ``types`` and ``coords`` have shape ``(B, L, ...)`` and are zero-filled
+    past each sample's length, which is the ``pad`` command. ``padding_mask``
+    has shape ``(B, L)`` and is ``True`` at padded positions, matching the
+    ``key_padding_mask`` convention of :mod:`torch.nn` attention layers.
+    """
+
+    types: Tensor
+    coords: Tensor
+    padding_mask: Tensor
+    style_idx: Tensor
+    content_idx: Tensor
+
+
+class GlyphCollate:
+    """Collate function that pads glyph samples into one batch.
+
+    Samples are padded along their first dimension, so both raw sequences of
+    shape ``(seq_len,)`` / ``(seq_len, 6)`` and :class:`~torchfont.transforms.Patchify`
+    output of shape ``(num_patches, patch_size)`` / ``(num_patches,
+    patch_size, 6)`` are accepted. In the patched case ``padding_mask`` marks
+    whole padded patches.
+
+    See Also:
+        torchfont.transforms.Patchify: Produces the patched layout.
+
+    """
+
+    def __init__(
+        self,
+        *,
+        length: int | None = None,
+        pad_to_multiple: int | None = None,
+    ) -> None:
+        """Configure the padded length ``L`` of every batch.
+
+        Args:
+            length (int | None): Fixed padded length. Longer samples are
+                truncated, like :class:`~torchfont.transforms.LimitSequenceLength`.
+                ``None`` pads to the longest sample of each batch.
+            pad_to_multiple (int | None): Round ``L`` up to a multiple of this
+                value, which bounds the number of distinct batch shapes seen by
+                compiled models.
+
+        Raises:
+            ValueError: If ``length`` or ``pad_to_multiple`` is not positive.
+
+        Examples:
+            Emit batches of exactly 512 steps::
+
+                collate_fn = GlyphCollate(length=512)
+
+        """
+        if length is not None and length < 1:
+            msg = f"length must be positive, got {length}"
+            raise ValueError(msg)
+        if pad_to_multiple is not None and pad_to_multiple < 1:
+            msg = f"pad_to_multiple must be positive, got {pad_to_multiple}"
+            raise ValueError(msg)
+
+        self.length = length
+        self.pad_to_multiple = pad_to_multiple
+
+    def __call__(
+        self,
+        batch: Sequence[tuple[Tensor, Tensor, int, int]],
+    ) -> PaddedGlyphBatch:
+        """Pad a list of dataset samples.
+
+        Args:
+            batch (Sequence[tuple[Tensor, Tensor, int, int]]): Samples in the
+                format of :meth:`FontFolder.__getitem__`, optionally
+                transformed.
+
+        Returns:
+            PaddedGlyphBatch: Padded tensors, mask, and long label columns.
+
+        Raises:
+            ValueError: If ``batch`` is empty.
+
+        """
+        return self.pad(_concat(batch))
+
+    def pad(self, batch: GlyphBatch) -> PaddedGlyphBatch:
+        """Pad a batch drawn with :meth:`FontFolder.get_batch`.
+
+        The packed buffers are scattered into the padded tensors directly,
+        without splitting them into per-sample tensors first.
+
+        Args:
+            batch (GlyphBatch): Packed batch with ``offsets`` of shape
+                ``(B + 1,)``. Compact batches are expanded with
+                :func:`~torchfont.io.outline.expand_points` first.
+
+        Returns:
+            PaddedGlyphBatch: Padded tensors, mask, and label columns.
+
+        Examples:
+            Draw and pad a batch in the main process::
+
+                batch = collate_fn.pad(dataset.get_batch(indices))
+
+        """
+        if _is_compact(batch):
+            batch = batch._replace(coords=expand_points(batch.types, batch.coords))
+        lengths = batch.offsets.diff()
+        batch_size = lengths.numel()
+        longest = int(lengths.max()) if batch_size else 0
+        length = self.length if self.length is not None else longest
+        if self.pad_to_multiple is not None:
+            length = -(-length // self.pad_to_multiple) * self.pad_to_multiple
+
+        if longest > length:
+            batch = _truncate(batch, length)
+            lengths = batch.offsets.diff()
+        rows, cols = _positions(batch.offsets)
+        types, coords = batch.types, batch.coords
+
+        padded_types = types.new_zeros((batch_size, length, *types.shape[1:]))
+        padded_coords = coords.new_zeros((batch_size, length, *coords.shape[1:]))
+        padded_types[rows, cols] = types
+        padded_coords[rows, cols] = coords
+        padding_mask = torch.arange(length) >= lengths.unsqueeze(1)
+
+        return PaddedGlyphBatch(
+            types=padded_types,
+            coords=padded_coords,
+            padding_mask=padding_mask,
+            style_idx=batch.style_idx.long(),
+            content_idx=batch.content_idx.long(),
+        )
+
+
+class PackedCollate:
+    """Collate function that keeps a batch packed as values plus offsets.
+
+    Glyph lengths are heavily skewed, so padding every batch to its longest
+    sample wastes memory and compute. The returned
+    :class:`~torchfont.datasets.folder.GlyphBatch` holds the concatenated
+    ``types`` and ``coords`` together with per-sample ``offsets``, which cross
+    DataLoader worker boundaries as plain tensors. Call :func:`to_nested` in
+    the main process to view them as jagged nested tensors.
+
+    See Also:
+        GlyphCollate: Padded counterpart for models without nested support.
+
+    """
+
+    def __init__(self, *, max_len: int | None = None) -> None:
+        """Configure optional truncation of the packed samples.
+
+        Args:
+            max_len (int | None): Maximum number of steps kept per sample,
+                applied to the packed buffers like
+                :class:`~torchfont.transforms.LimitSequenceLength`. ``None``
+                keeps samples whole.
+
+        Raises:
+            ValueError: If ``max_len`` is not positive.
+
+        Examples:
+            Cap samples at 512 steps without padding them::
+
+                collate_fn = PackedCollate(max_len=512)
+
+        """
+        if max_len is not None and max_len < 1:
+            msg = f"max_len must be positive, got {max_len}"
+            raise ValueError(msg)
+
+        self.max_len = max_len
+
+    def __call__(
+        self,
+        batch: Sequence[tuple[Tensor, Tensor, int, int]],
+    ) -> GlyphBatch:
+        """Concatenate a list of dataset samples.
+
+        Args:
+            batch (Sequence[tuple[Tensor, Tensor, int, int]]): Samples in the
+                format of :meth:`FontFolder.__getitem__`, optionally
+                transformed.
+
+        Returns:
+            GlyphBatch: Concatenated samples, ``offsets`` of shape ``(B + 1,)``,
+            and long label columns.
+
+        Raises:
+            ValueError: If ``batch`` is empty.
+
+        """
+        return self.pack(_concat(batch))
+
+    def pack(self, batch: GlyphBatch) -> GlyphBatch:
+        """Apply ``max_len`` to a batch drawn with :meth:`FontFolder.get_batch`.
+
+        Args:
+            batch (GlyphBatch): Packed batch with ``offsets`` of shape
+                ``(B + 1,)``.
+
+        Returns:
+            GlyphBatch: The batch, truncated when any sample exceeds
+            ``max_len``. Compact batches stay compact.
+
+        Examples:
+            Draw a batch and view it as nested tensors::
+
+                types, coords = to_nested(collate_fn.pack(dataset.get_batch(indices)))
+
+        """
+        lengths = batch.offsets.diff()
+        if self.max_len is None or not bool((lengths > self.max_len).any()):
+            return batch
+        return _truncate(batch, self.max_len)
+
+
+def to_nested(batch: GlyphBatch) -> tuple[Tensor, Tensor]:
+    """View a packed batch as jagged nested tensors without copying.
+
+    Both tensors share ``batch.offsets``, so their ragged dimension matches
+    and nested-aware attention can consume them directly. Compact batches are
+    the exception: their points are delimited by
+    :func:`~torchfont.io.outline.point_offsets` and get a ragged dimension of
+    their own.
+
+    Args:
+        batch (GlyphBatch): Packed batch such as the output of
+            :class:`PackedCollate` or :meth:`FontFolder.get_batch`.
+
+    Returns:
+        tuple[Tensor, Tensor]: ``types`` of shape ``(B, j)`` and ``coords`` of
+        shape ``(B, j, 6)`` with ``torch.jagged`` layout. Patched samples keep
+        their trailing patch dimensions.
+
+    Examples:
+        Recover per-sample lengths from the nested view::
+
+            types, coords = to_nested(batch)
+            lengths = types.offsets().diff()
+
+    """
+    offsets = batch.offsets.long()
+    coord_offsets = offsets
+    if _is_compact(batch):
+        coord_offsets = point_offsets(batch.types, offsets)
+    return (
+        torch.nested.nested_tensor_from_jagged(batch.types, offsets=offsets),
+        torch.nested.nested_tensor_from_jagged(batch.coords, offsets=coord_offsets),
+    )
+
+
+def _concat(batch: Sequence[tuple[Tensor, Tensor, int, int]]) -> GlyphBatch:
+    if not batch:
+        msg = "cannot collate an empty batch"
+        raise ValueError(msg)
+
+    types, coords, style_idx, content_idx = zip(*batch, strict=True)
+    lengths = torch.tensor([sample.size(0) for sample in types])
+    return GlyphBatch(
+        types=torch.cat(types),
+        coords=torch.cat(coords),
+        offsets=torch.cat((lengths.new_zeros(1), lengths.cumsum(0))),
+        style_idx=torch.tensor(style_idx, dtype=torch.long),
+        content_idx=torch.tensor(content_idx, dtype=torch.long),
+    )
+
+
+def _positions(offsets: Tensor) -> tuple[Tensor, Tensor]:
+    # Sample row and step column of every concatenated step.
+    lengths = offsets.diff()
+    rows = torch.arange(lengths.numel()).repeat_interleave(lengths)
+    cols = torch.arange(rows.numel()) - offsets[:-1].repeat_interleave(lengths)
+    return rows, cols
+
+
+def _is_compact(batch: GlyphBatch) -> bool:
+    return batch.coords.size(-1) != COORD_DIM
+
+
+def _truncate(batch: GlyphBatch, max_len: int) -> GlyphBatch:
+    _, cols = _positions(batch.offsets)
+    keep = cols < max_len
+    lengths = batch.offsets.diff().clamp(max=max_len)
+    keep_coords = keep
+    if _is_compact(batch):
+        counts = point_counts(batch.types).reshape(keep.numel(), -1).sum(1)
+        keep_coords = keep.repeat_interleave(counts)
+    return batch._replace(
+        types=batch.types[keep],
+        coords=batch.coords[keep_coords],
+        offsets=torch.cat((lengths.new_zeros(1), lengths.cumsum(0))),
+    )
@@ -0,0 +1,203 @@
+"""Thread-based batch loading for datasets backed by the native glyph renderer.
+
+Notes:
+    The compiled backend releases the GIL while drawing glyphs, so a single
+    dataset instance can be shared by many threads. This avoids the memory
+    duplication and per-worker index rebuilds of multiprocessing workers.
+
+Examples:
+    Keep eight batches in flight from one shared dataset::
+
+        from torchfont.data import GlyphCollate
+
+        loader = ThreadedLoader(
+            dataset,
+            batch_size=256,
+            collate_fn=GlyphCollate(),
+            num_threads=4,
+        )
+
+        for types, coords, padding_mask, style_idx, content_idx in loader:
+            ...
+
+"""
+
+import os
+from collections import deque
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Protocol
+
+import torch
+from torch.utils.data import (
+    BatchSampler,
+    RandomSampler,
+    Sampler,
+    SequentialSampler,
+    default_collate,
+)
+
+from torchfont.datasets._threads import draw_threads
+
+
+class _MapDataset(Protocol):
+    def __len__(self) -> int: ...
+
+    def __getitem__(self, idx: int, /) -> object: ...
+
+
+class ThreadedLoader:
+    """Iterate over collated batches prefetched by a pool of threads.
+
+    Batches are produced in sampler order. Each thread fetches a whole batch,
+    using :meth:`__getitems__` when the dataset provides it, and applies
+    ``collate_fn`` before handing the result back to the consumer. Datasets
+    drawing natively, such as :class:`~torchfont.datasets.FontFolder`, give
+    each fetch an equal share of the CPUs instead of a full-size pool.
+
+    See Also:
+        torch.utils.data.DataLoader: Process-based alternative for datasets
+        whose loading code holds the GIL.
+
+    """
+
+    def __init__(
+        self,
+        dataset: _MapDataset,
+        *,
+        batch_size: int = 1,
+        shuffle: bool = False,
+        sampler: Sampler[int] | None = None,
+        batch_sampler: Sampler[list[int]] | None = None,
+        drop_last: bool = False,
+        collate_fn: Callable[[list], Any] | None = None,
+        num_threads: int = 4,
+        prefetch_factor: int = 2,
+        generator: torch.Generator | None = None,
+    ) -> None:
+        """Configure batch sampling and the prefetching thread pool.
+
+        Args:
+            dataset (Dataset): Map-style dataset shared by every loader thread.
+            batch_size (int): Number of samples per batch.
+            shuffle (bool): Whether to draw samples in random order when no
+                ``sampler`` is given.
+            sampler (Sampler[int] | None): Optional sampler yielding sample
+                indices.
+            batch_sampler (Sampler[list[int]] | None): Optional sampler
+                yielding lists of sample indices. Mutually exclusive with
+                ``batch_size``, ``shuffle``, ``sampler``, and ``drop_last``.
+            drop_last (bool): Whether to drop the last incomplete batch.
+            collate_fn (Callable[[list], Any] | None): Function merging a
+                list of samples into a batch. Defaults to
+                :func:`torch.utils.data.default_collate`.
+            num_threads (int): Number of threads fetching batches concurrently.
+            prefetch_factor (int): Number of batches kept in flight per thread.
+            generator (torch.Generator | None): Random generator used by the
+                default shuffling sampler.
+
+        Raises:
+            ValueError: If ``num_threads`` or ``prefetch_factor`` is not
+                positive, or if ``batch_sampler`` is combined with options it
+                replaces.
+
+        Examples:
+            Shuffle samples and collate with a custom function::
+
+                loader = ThreadedLoader(
+                    dataset,
+                    batch_size=64,
+                    shuffle=True,
+                    collate_fn=collate_fn,
+                    num_threads=8,
+                )
+
+        """
+        if num_threads < 1:
+            msg = f"num_threads must be positive, got {num_threads}"
+            raise ValueError(msg)
+        if prefetch_factor < 1:
+            msg = f"prefetch_factor must be positive, got {prefetch_factor}"
+            raise ValueError(msg)
+
+        if batch_sampler is not None:
+            if batch_size != 1 or shuffle or sampler is not None or drop_last:
+                msg = (
+                    "batch_sampler option is mutually exclusive with batch_size, "
+                    "shuffle, sampler, and drop_last"
+                )
+                raise ValueError(msg)
+        else:
+            if sampler is None:
+                sampler = (
+                    RandomSampler(dataset, generator=generator)
+                    if shuffle
+                    else SequentialSampler(dataset)
+                )
+            batch_sampler = BatchSampler(sampler, batch_size, drop_last)
+
+        self.dataset = dataset
+        self.batch_size = batch_size
+        self.sampler = sampler
+        self.batch_sampler = batch_sampler
+        self.collate_fn = collate_fn if collate_fn is not None else default_collate
+        self.num_threads = num_threads
+        self.prefetch_factor = prefetch_factor
+        self._draw_threads = max(1, (os.cpu_count() or 1) // num_threads)
+
+    def __len__(self) -> int:
+        """Return the number of batches produced per iteration.
+
+        Returns:
+            int: Length of the underlying batch sampler.
+
+        """
+        return len(self.batch_sampler)  # ty: ignore[invalid-argument-type]
+
+    def __iter__(self) -> Iterator[Any]:
+        """Yield collated batches while later batches load in the background.
+
+        Returns:
+            Iterator[Any]: Iterator over collated batches in sampler order.
+
+        Examples:
+            Consume a single batch::
+
+                batch = next(iter(loader))
+
+        """
+        batches = iter(self.batch_sampler)
+        in_flight = self.num_threads * self.prefetch_factor
+
+        with ThreadPoolExecutor(
+            max_workers=self.num_threads,
+            thread_name_prefix="torchfont-loader",
+        ) as executor:
+            pending: deque[Future[Any]] = deque(
+                executor.submit(self._fetch, indices)
+                for indices in islice(batches, in_flight)
+            )
+            try:
+                while pending:
+                    batch = pending.popleft().result()
+                    pending.extend(
+                        executor.submit(self._fetch, indices)
+                        for indices in islice(batches, 1)
+                    )
+                    yield batch
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _fetch(self, indices: Sequence[int]) -> Any:  # noqa: ANN401
+        token = draw_threads.set(self._draw_threads)
+        try:
+            getitems = getattr(self.dataset, "__getitems__", None)
+            if getitems is not None:
+                samples = getitems(list(indices))
+            else:
+                samples = [self.dataset[idx] for idx in indices]
+        finally:
+            draw_threads.reset(token)
+        return self.collate_fn(samples)
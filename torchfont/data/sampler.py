@@ -0,0 +1,451 @@
+"""Samplers that follow the font layout of the native glyph index.
+
+Notes:
+    Samples of one font face occupy a contiguous index range, exposed as
+    ``sample_offsets`` and ``inst_offsets`` on
+    :class:`~torchfont.datasets.FontFolder`. The samplers here keep those
+    ranges together so that each process only touches a subset of the font
+    files.
+
+Examples:
+    Give each rank its own share of the font files::
+
+        sampler = FontShardSampler(dataset, seed=0)
+        loader = DataLoader(dataset, batch_size=64, sampler=sampler)
+
+"""
+
+import itertools
+import math
+from collections.abc import Iterator
+from typing import Literal, Protocol
+
+import torch
+from torch import Tensor
+from torch.utils.data import Sampler
+
+from torchfont.data._sharding import balance, resolve_replicas
+
+
+class _IndexedDataset(Protocol):
+    @property
+    def sample_offsets(self) -> Tensor: ...
+
+    @property
+    def inst_offsets(self) -> Tensor: ...
+
+
+class _LengthDataset(Protocol):
+    @property
+    def sequence_lengths(self) -> Tensor: ...
+
+
+class FontShardSampler(Sampler[int]):
+    """Distributed sampler that assigns whole fonts to ranks.
+
+    Font faces, or single variation instances with ``group_by="style"``, are
+    split into ``num_replicas`` partitions of near-equal sample count. With
+    ``shuffle``, partitions rotate across ranks every epoch and samples are
+    shuffled within the rank, so every sample is still visited by every rank
+    over ``num_replicas`` epochs while each epoch only reads a
+    ``1 / num_replicas`` share of the font files per rank.
+
+    Like :class:`torch.utils.data.DistributedSampler`, every rank yields the
+    same number of indices: shorter partitions repeat their own samples and
+    longer ones are trimmed. Without ``shuffle``, each epoch of a trimmed
+    partition starts where the previous one stopped, so its tail is still
+    visited in later epochs. Partitions left empty because there are fewer
+    fonts than ranks draw their samples from the whole dataset instead.
+
+    See Also:
+        torch.utils.data.DistributedSampler: Sample-level sharding that ignores
+        font boundaries.
+
+    """
+
+    def __init__(
+        self,
+        dataset: _IndexedDataset,
+        *,
+        num_replicas: int | None = None,
+        rank: int | None = None,
+        shuffle: bool = True,
+        seed: int = 0,
+        drop_last: bool = False,
+        group_by: Literal["font", "style"] = "font",
+    ) -> None:
+        """Partition the fonts of ``dataset`` across ranks.
+
+        Args:
+            dataset (FontFolder): Indexed dataset providing ``sample_offsets``
+                and ``inst_offsets``.
+            num_replicas (int | None): Number of distributed ranks. Defaults to
+                the world size of the default process group, or ``1``.
+            rank (int | None): Rank of the current process. Defaults to the
+                rank in the default process group, or ``0``.
+            shuffle (bool): Whether to rotate partitions across ranks and
+                shuffle samples every epoch.
+            seed (int): Base seed combined with the epoch set through
+                :meth:`set_epoch`.
+            drop_last (bool): Whether to trim every rank to ``N //
+                num_replicas`` samples instead of padding to ``ceil(N /
+                num_replicas)``.
+            group_by (Literal["font", "style"]): Unit kept together on one
+                rank: a whole font face or a single variation instance.
+
+        Raises:
+            ValueError: If ``group_by`` is unknown or ``rank`` is out of range.
+
+        """
+        if group_by not in {"font", "style"}:
+            msg = f"group_by must be 'font' or 'style', got {group_by!r}"
+            raise ValueError(msg)
+        num_replicas, rank = resolve_replicas(num_replicas, rank)
+
+        self.num_replicas = num_replicas
+        self.rank = rank
+        self.shuffle = shuffle
+        self.seed = seed
+        self.drop_last = drop_last
+        self.group_by = group_by
+        self.epoch = 0
+
+        self._unit_offsets = _unit_offsets(dataset, group_by)
+        self._partitions = balance(self._unit_offsets.diff(), num_replicas)
+        total = int(self._unit_offsets[-1])
+        self.num_samples = (
+            total // num_replicas if drop_last else math.ceil(total / num_replicas)
+        )
+
+    def set_epoch(self, epoch: int) -> None:
+        """Set the epoch that rotates partitions and seeds shuffling.
+
+        Args:
+            epoch (int): Epoch number.
+
+        """
+        self.epoch = epoch
+
+    def __len__(self) -> int:
+        """Return the number of indices yielded by this rank per epoch.
+
+        Returns:
+            int: Per-rank sample count.
+
+        """
+        return self.num_samples
+
+    def __iter__(self) -> Iterator[int]:
+        """Yield the sample indices of this rank's partition.
+
+        Returns:
+            Iterator[int]: Sample indices for the current epoch.
+
+        """
+        partition = self.rank
+        if self.shuffle:
+            partition = (self.rank + self.epoch) % self.num_replicas
+
+        offsets = self._unit_offsets.tolist()
+        indices = torch.tensor(
+            [
+                idx
+                for unit in self._partitions[partition]
+                for idx in range(offsets[unit], offsets[unit + 1])
+            ],
+            dtype=torch.long,
+        )
+        if len(indices) == 0:
+            # Offset the global index so empty partitions get distinct samples.
+            indices = torch.arange(offsets[-1]).roll(-partition * self.num_samples)
+        if self.shuffle:
+            generator = torch.Generator().manual_seed(self.seed + self.epoch)
+            indices = indices[torch.randperm(len(indices), generator=generator)]
+        elif len(indices) > self.num_samples:
+            # Resume where the previous epoch stopped so trimmed tails are
+            # visited in later epochs.
+            indices = indices.roll(-self.epoch * self.num_samples)
+
+        if 0 < len(indices) < self.num_samples:
+            repeats = math.ceil(self.num_samples / len(indices))
+            indices = indices.repeat(repeats)
+        return iter(indices[: self.num_samples].tolist())
+
+
+class BlockShuffleSampler(Sampler[int]):
+    """Sampler that shuffles contiguous blocks of same-font samples.
+
+    The samples of every variation instance of every font face are cut into
+    blocks of at most ``block_size`` consecutive indices. Each epoch the block
+    order is shuffled, and the samples of ``window`` consecutive blocks are
+    shuffled together. Larger blocks and smaller windows keep more draws on
+    the same font file; ``block_size=1`` degrades to a uniform shuffle.
+
+    See Also:
+        torch.utils.data.RandomSampler: Uniform shuffling without locality.
+
+    """
+
+    def __init__(
+        self,
+        dataset: _IndexedDataset,
+        *,
+        block_size: int = 256,
+        window: int = 4,
+        seed: int = 0,
+    ) -> None:
+        """Cut the index of ``dataset`` into font-local blocks.
+
+        Args:
+            dataset (FontFolder): Indexed dataset providing ``sample_offsets``
+                and ``inst_offsets``.
+            block_size (int): Maximum number of consecutive samples per block.
+            window (int): Number of shuffled blocks whose samples are
+                interleaved with each other.
+            seed (int): Base seed combined with the epoch set through
+                :meth:`set_epoch`.
+
+        Raises:
+            ValueError: If ``block_size`` or ``window`` is not positive.
+
+        """
+        if block_size < 1:
+            msg = f"block_size must be positive, got {block_size}"
+            raise ValueError(msg)
+        if window < 1:
+            msg = f"window must be positive, got {window}"
+            raise ValueError(msg)
+
+        self.block_size = block_size
+        self.window = window
+        self.seed = seed
+        self.epoch = 0
+
+        offsets = _unit_offsets(dataset, "style").tolist()
+        self._blocks = [
+            (start, min(start + block_size, stop))
+            for unit_start, stop in itertools.pairwise(offsets)
+            for start in range(unit_start, stop, block_size)
+        ]
+        self._num_samples = offsets[-1]
+
+    def set_epoch(self, epoch: int) -> None:
+        """Set the epoch that seeds the next shuffle.
+
+        Args:
+            epoch (int): Epoch number.
+
+        """
+        self.epoch = epoch
+
+    def __len__(self) -> int:
+        """Return the number of sample indices yielded per epoch.
+
+        Returns:
+            int: Number of samples in the dataset.
+
+        """
+        return self._num_samples
+
+    def __iter__(self) -> Iterator[int]:
+        """Yield every sample index once, shuffled block by block.
+
+        Returns:
+            Iterator[int]: Sample indices for the current epoch.
+
+        """
+        generator = torch.Generator().manual_seed(self.seed + self.epoch)
+        order = torch.randperm(len(self._blocks), generator=generator).tolist()
+        for group_start in range(0, len(order), self.window):
+            indices = torch.tensor(
+                [
+                    idx
+                    for block in order[group_start : group_start + self.window]
+                    for idx in range(*self._blocks[block])
+                ],
+                dtype=torch.long,
+            )
+            perm = torch.randperm(len(indices), generator=generator)
+            yield from indices[perm].tolist()
+
+
+class BucketBatchSampler(Sampler[list[int]]):
+    """Batch sampler that groups samples of similar sequence length.
+
+    Each epoch the dataset is shuffled, split into pools of ``pool_size``
+    samples, and every pool is sorted by ``sequence_lengths`` before being cut
+    into batches. Batches hold at most ``batch_size`` samples and, with
+    ``max_tokens``, at most ``max_tokens`` padded commands (batch size times
+    its longest sample). The batch order is shuffled and dealt round-robin to
+    distributed ranks.
+
+    See Also:
+        torch.utils.data.BatchSampler: Fixed-size batches in sampler order.
+
+    """
+
+    def __init__(
+        self,
+        dataset: _LengthDataset,
+        *,
+        batch_size: int | None = None,
+        max_tokens: int | None = None,
+        pool_size: int | None = None,
+        shuffle: bool = True,
+        drop_last: bool = False,
+        seed: int = 0,
+        num_replicas: int | None = None,
+        rank: int | None = None,
+    ) -> None:
+        """Configure bucketing over the sequence lengths of ``dataset``.
+
+        Args:
+            dataset (FontFolder): Dataset providing ``sequence_lengths``.
+            batch_size (int | None): Maximum number of samples per batch.
+            max_tokens (int | None): Maximum padded commands per batch. A
+                sample longer than the budget forms a batch of its own.
+            pool_size (int | None): Number of shuffled samples sorted together.
+                ``None`` sorts the whole dataset, which minimizes padding.
+            shuffle (bool): Whether to shuffle samples before pooling and the
+                resulting batch order. Equal lengths are still tie-broken by
+                index when ``False``.
+            drop_last (bool): Whether to trim, rather than pad, the batch
+                count so every rank receives the same number of batches.
+                Without ``max_tokens``, batches smaller than ``batch_size`` are
+                dropped as well.
+            seed (int): Base seed combined with the epoch set through
+                :meth:`set_epoch`.
+            num_replicas (int | None): Number of distributed ranks. Defaults to
+                the world size of the default process group, or ``1``.
+            rank (int | None): Rank of the current process. Defaults to the
+                rank in the default process group, or ``0``.
+
+        Raises:
+            ValueError: If neither ``batch_size`` nor ``max_tokens`` is given,
+                if a limit is not positive, or if ``rank`` is out of range.
+
+        """
+        if batch_size is None and max_tokens is None:
+            msg = "either batch_size or max_tokens must be given"
+            raise ValueError(msg)
+        for name, value in (
+            ("batch_size", batch_size),
+            ("max_tokens", max_tokens),
+            ("pool_size", pool_size),
+        ):
+            if value is not None and value < 1:
+                msg = f"{name} must be positive, got {value}"
+                raise ValueError(msg)
+        num_replicas, rank = resolve_replicas(num_replicas, rank)
+
+        self.lengths = dataset.sequence_lengths
+        self.batch_size = batch_size
+        self.max_tokens = max_tokens
+        self.pool_size = pool_size
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+        self.seed = seed
+        self.num_replicas = num_replicas
+        self.rank = rank
+        self.epoch = 0
+        self._cached: tuple[int, list[list[int]]] | None = None
+
+    def set_epoch(self, epoch: int) -> None:
+        """Set the epoch that seeds the next shuffle.
+
+        Args:
+            epoch (int): Epoch number.
+
+        """
+        self.epoch = epoch
+
+    def __len__(self) -> int:
+        """Return the number of batches this rank yields in the current epoch.
+
+        With ``max_tokens`` the count depends on the epoch's shuffle, so it is
+        computed from the same batches :meth:`__iter__` yields.
+
+        Returns:
+            int: Per-rank batch count.
+
+        """
+        return len(self._rank_batches())
+
+    def __iter__(self) -> Iterator[list[int]]:
+        """Yield the batches assigned to this rank.
+
+        Returns:
+            Iterator[list[int]]: Lists of sample indices.
+
+        """
+        return iter(self._rank_batches())
+
+    def _rank_batches(self) -> list[list[int]]:
+        if self._cached is None or self._cached[0] != self.epoch:
+            self._cached = (self.epoch, self._build_batches())
+        return self._cached[1]
+
+    def _build_batches(self) -> list[list[int]]:
+        generator = torch.Generator().manual_seed(self.seed + self.epoch)
+        total = len(self.lengths)
+        order = (
+            torch.randperm(total, generator=generator)
+            if self.shuffle
+            else torch.arange(total)
+        )
+
+        batches: list[list[int]] = []
+        pool_size = self.pool_size or max(total, 1)
+        for pool in order.split(pool_size):
+            lengths = self.lengths[pool]
+            ranking = torch.argsort(lengths, stable=True)
+            batches.extend(self._cut(pool[ranking].tolist(), lengths[ranking].tolist()))
+
+        if self.shuffle:
+            perm = torch.randperm(len(batches), generator=generator).tolist()
+            batches = [batches[idx] for idx in perm]
+
+        if self.drop_last:
+            usable = len(batches) - len(batches) % self.num_replicas
+            batches = batches[:usable]
+        elif batches and len(batches) % self.num_replicas:
+            missing = self.num_replicas - len(batches) % self.num_replicas
+            batches += (batches * math.ceil(missing / len(batches)))[:missing]
+        return batches[self.rank :: self.num_replicas]
+
+    def _cut(self, indices: list[int], lengths: list[int]) -> list[list[int]]:
+        batches: list[list[int]] = []
+        batch: list[int] = []
+        for idx, length in zip(indices, lengths, strict=True):
+            # Lengths are ascending, so the newest sample is the longest.
+            full = self.batch_size is not None and len(batch) >= self.batch_size
+            over = (
+                self.max_tokens is not None
+                and (len(batch) + 1) * length > self.max_tokens
+            )
+            if batch and (full or over):
+                batches.append(batch)
+                batch = []
+            batch.append(idx)
+        if batch:
+            batches.append(batch)
+
+        if self.drop_last and self.max_tokens is None:
+            batches = [batch for batch in batches if len(batch) == self.batch_size]
+        return batches
+
+
+def _unit_offsets(dataset: _IndexedDataset, group_by: str) -> Tensor:
+    sample_offsets = dataset.sample_offsets
+    if group_by == "font":
+        return sample_offsets
+
+    # Samples of a face are ordered by instance, then by code point, so every
+    # instance covers an equal, contiguous slice of the face's range.
+    instances = dataset.inst_offsets.diff()
+    per_instance = sample_offsets.diff() // instances.clamp(min=1)
+    starts = torch.repeat_interleave(sample_offsets[:-1], instances)
+    steps = torch.repeat_interleave(per_instance, instances)
+    first = torch.repeat_interleave(dataset.inst_offsets[:-1], instances)
+    local = torch.arange(len(starts)) - first
+    return torch.cat((starts + local * steps, sample_offsets[-1:]))
@@ -11,10 +11,15 @@ Examples:
 
 from torchfont.datasets.folder import FontFolder
 from torchfont.datasets.google_fonts import GoogleFonts
+from torchfont.datasets.packed import PackedGlyphDataset, pack_dataset
 from torchfont.datasets.repo import FontRepo
+from torchfont.datasets.stream import FontStream
 
 __all__ = [
     "FontFolder",
     "FontRepo",
+    "FontStream",
     "GoogleFonts",
+    "PackedGlyphDataset",
+    "pack_dataset",
 ]
@@ -0,0 +1,11 @@
+"""Native thread budget shared by datasets and the loaders that drive them."""
+
+from contextvars import ContextVar
+
+draw_threads: ContextVar[int | None] = ContextVar("draw_threads", default=None)
+"""Native threads each batch may draw with in the current context.
+
+Loaders that fetch several batches concurrently set this around every fetch so
+the concurrent native pools together stay within the available CPUs. ``None``
+leaves the choice to the dataset.
+"""
@@ -2,8 +2,8 @@
 
 Notes:
     Glyph data is cached inside the native backend for the lifetime of each
-    dataset instance. Recreate the dataset when editing font files on disk to
-    ensure changes are observed.
+    dataset instance. Call :meth:`FontFolder.refresh` after editing font files
+    on disk to re-index only the files that changed.
 
 Examples:
     Iterate glyph samples from a directory of fonts::
@@ -18,15 +18,86 @@ Examples:
 import warnings
 from collections import Counter
 from collections.abc import Callable, Sequence
+from functools import cached_property
 from pathlib import Path
-from typing import SupportsIndex
+from typing import NamedTuple, SupportsIndex
 
 import torch
 from torch import Tensor
-from torch.utils.data import Dataset
+from torch.utils.data import Dataset, get_worker_info
 
 from torchfont import _torchfont
-from torchfont.io.outline import COORD_DIM
+from torchfont.datasets._threads import draw_threads
+from torchfont.io.outline import COORD_DIM, point_offsets
+from torchfont.transforms.transforms import NativeTransform
+
+_COORD_FORMATS: dict[torch.dtype, str] = {
+    torch.float32: "float32",
+    torch.float16: "float16",
+    torch.bfloat16: "bfloat16",
+    torch.int16: "int16",
+}
+_TYPES_DTYPES = (torch.long, torch.int32, torch.uint8, torch.int8)
+
+
+class GlyphCacheInfo(NamedTuple):
+    """Statistics of the native outline cache returned by ``cache_info()``."""
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+    capacity: int
+
+
+class IndexDiff(NamedTuple):
+    """Font files that changed during :meth:`FontFolder.refresh`."""
+
+    added: list[Path]
+    modified: list[Path]
+    removed: list[Path]
+
+
+class GlyphBatch(NamedTuple):
+    """Packed samples returned by :meth:`FontFolder.get_batch`.
+
+    Sample ``i`` spans ``types[offsets[i]:offsets[i + 1]]`` and the matching
+    rows of ``coords``. Compact batches hold an ``(num_points, 2)`` point stream
+    in ``coords`` instead, delimited by
+    :func:`~torchfont.io.outline.point_offsets`.
+    """
+
+    types: Tensor
+    coords: Tensor
+    offsets: Tensor
+    style_idx: Tensor
+    content_idx: Tensor
+
+
+class GlyphMetrics(NamedTuple):
+    """Per-sample outline measurements returned by ``FontFolder.glyph_metrics``.
+
+    Counts use ``torch.long``. ``bbox`` holds the control box of the source
+    outline as ``(x_min, y_min, x_max, y_max)`` in em units, and is zero for
+    empty glyphs.
+    """
+
+    commands: Tensor
+    contours: Tensor
+    points: Tensor
+    bbox: Tensor
+    empty: Tensor
+
+
+class SampleLocations(NamedTuple):
+    """Columnar result of :meth:`FontFolder.locate`, one entry per index."""
+
+    font_idx: Tensor
+    instance_idx: Tensor
+    codepoint: Tensor
+    style_idx: Tensor
+    content_idx: Tensor
 
 
 class FontFolder(Dataset[tuple[Tensor, Tensor, int, int]]):
@@ -37,9 +108,17 @@ class FontFolder(Dataset[tuple[Tensor, Tensor, int, int]]):
     style and content targets.
 
     Attributes:
-        targets (torch.LongTensor): Label matrix of shape ``(N, 2)`` where
-            column 0 holds the style class index and column 1 holds the
-            content class index for every sample.
+        targets (Tensor): Cached label matrix of shape ``(N, 2)`` and dtype
+            ``targets_dtype`` where column 0 holds the style class index and
+            column 1 holds the content class index for every sample.
+        sample_offsets (Tensor): Cached ``(F + 1,)`` boundaries of the samples
+            of each indexed font face.
+        inst_offsets (Tensor): Cached ``(F + 1,)`` boundaries of the style
+            classes of each indexed font face.
+        sequence_lengths (Tensor): Cached ``(N,)`` command counts of every
+            sample.
+        glyph_metrics (GlyphMetrics): Cached per-sample command, contour, and
+            point counts, bounding boxes, and empty flags.
         content_classes (list[str]): List of Unicode character strings, one per
             content class, sorted by index. Use len(content_classes) to get
             the total number of content classes.
@@ -57,6 +136,20 @@ class FontFolder(Dataset[tuple[Tensor, Tensor, int, int]]):
 
     """
 
+    # Cached properties derived from the native index; dropped on pickling and
+    # recomputed after refresh().
+    _DERIVED_ATTRS = (
+        "targets",
+        "sample_offsets",
+        "inst_offsets",
+        "sequence_lengths",
+        "glyph_metrics",
+        "content_classes",
+        "content_class_to_idx",
+        "style_classes",
+        "style_class_to_idx",
+    )
+
     def __init__(
         self,
         root: Path | str,
@@ -64,6 +157,16 @@ class FontFolder(Dataset[tuple[Tensor, Tensor, int, int]]):
         codepoint_filter: Sequence[SupportsIndex] | None = None,
         patterns: Sequence[str] | None = None,
         transform: (Callable[[Tensor, Tensor], tuple[Tensor, Tensor]] | None) = None,
+        cache_bytes: int | None = None,
+        num_threads: int | None = None,
+        index_cache: Path | str | None = None,
+        lazy: bool = False,
+        targets_dtype: torch.dtype = torch.long,
+        max_commands: int | None = None,
+        min_contours: int | None = None,
+        drop_empty: bool = False,
+        coords_dtype: torch.dtype = torch.float32,
+        types_dtype: torch.dtype = torch.long,
     ) -> None:
         """Initialize the dataset by scanning font files and indexing samples.
 
@@ -76,7 +179,65 @@ class FontFolder(Dataset[tuple[Tensor, Tensor, int, int]]):
                 describing which font paths to include.
             transform (Callable[[Tensor, Tensor], tuple[Tensor, Tensor]] | None):
                 Optional transformation applied to each loader output before the
-                item is returned.
+                item is returned. A
+                :class:`~torchfont.transforms.NativeTransform` is fused into
+                the native backend instead, so glyphs are truncated, normalized,
+                and patched while they are drawn.
+            cache_bytes (int | None): Optional memory budget in bytes for an
+                in-process LRU cache of drawn outlines. Repeated accesses to the
+                same sample skip drawing while the outline stays cached.
+                ``None`` or ``0`` disables the cache.
+            num_threads (int | None): Number of native threads used to walk the
+                directory, parse font files, and draw batches. Defaults to the
+                number of available CPUs, except that DataLoader workers draw
+                their batches on a single thread and
+                :class:`~torchfont.data.ThreadedLoader` threads split the CPUs
+                between them, since both already run in parallel. Sample
+                ordering does not depend on this value.
+            index_cache (Path | str | None): Optional file used to persist the
+                built index. When the file matches ``root``, ``patterns``,
+                ``codepoint_filter``, and the size and modification time of
+                every discovered font, the index is loaded from it instead of
+                re-parsing each font; otherwise it is rebuilt and rewritten.
+            lazy (bool): Whether to defer parsing character maps and variation
+                instances. Construction then only discovers the files and reads
+                their glyph counts; the index is built in parallel on the first
+                call that needs it, such as ``len()``, indexing, or
+                :attr:`targets`, or explicitly via :meth:`materialize`.
+            targets_dtype (torch.dtype): Integer dtype of :attr:`targets`,
+                either ``torch.long`` or ``torch.int32``. ``torch.int32``
+                halves the memory of the label matrix.
+            max_commands (int | None): Drop code points whose outline has more
+                commands than this, counting the trailing ``eos``.
+            min_contours (int | None): Drop code points whose outline has fewer
+                contours than this.
+            drop_empty (bool): Whether to drop code points without any contour,
+                such as whitespace.
+            coords_dtype (torch.dtype): Dtype the backend encodes ``coords``
+                in: ``torch.float32``, ``torch.float16``, ``torch.bfloat16``,
+                or ``torch.int16`` fixed point with
+                :data:`~torchfont.io.outline.FIXED_POINT_SCALE` steps per em
+                unit. The 16-bit formats halve the size of drawn samples, the
+                outline cache, and host-to-device copies.
+            types_dtype (torch.dtype): Dtype of ``types``, one of
+                ``torch.long``, ``torch.int32``, ``torch.uint8``, or
+                ``torch.int8``. Commands always travel from the backend as
+                single bytes and are only widened to this dtype.
+
+        Raises:
+            ValueError: If ``cache_bytes`` is negative, ``num_threads`` is not
+                positive, ``targets_dtype``, ``coords_dtype``, or
+                ``types_dtype`` is not supported, or a pruning limit is
+                negative.
+
+        Notes:
+            Pruning options measure every glyph while the index is built and
+            remove a code point from a face when any of its variation instances
+            is rejected. The measurements are stored in ``index_cache``.
+
+            A Python ``transform`` receives the reduced-precision tensors; put
+            :class:`~torchfont.transforms.Dequantize` first to get
+            ``torch.float32`` coordinates back.
 
         Examples:
             Restrict the dataset to uppercase ASCII glyphs::
@@ -87,8 +248,51 @@ class FontFolder(Dataset[tuple[Tensor, Tensor, int, int]]):
                 )
 
         """
+        if cache_bytes is not None and cache_bytes < 0:
+            msg = f"cache_bytes must be non-negative, got {cache_bytes}"
+            raise ValueError(msg)
+        if num_threads is not None and num_threads < 1:
+            msg = f"num_threads must be positive, got {num_threads}"
+            raise ValueError(msg)
+        if targets_dtype not in (torch.long, torch.int32):
+            msg = (
+                f"targets_dtype must be torch.long or torch.int32, got {targets_dtype}"
+            )
+            raise ValueError(msg)
+        if coords_dtype not in _COORD_FORMATS:
+            msg = (
+                "coords_dtype must be torch.float32, torch.float16, "
+                f"torch.bfloat16, or torch.int16, got {coords_dtype}"
+            )
+            raise ValueError(msg)
+        if types_dtype not in _TYPES_DTYPES:
+            msg = (
+                "types_dtype must be torch.long, torch.int32, torch.uint8, "
+                f"or torch.int8, got {types_dtype}"
+            )
+            raise ValueError(msg)
+        for name, limit in (
+            ("max_commands", max_commands),
+            ("min_contours", min_contours),
+        ):
+            if limit is not None and limit < 0:
+                msg = f"{name} must be non-negative, got {limit}"
+                raise ValueError(msg)
+
         self.root = Path(root).expanduser().resolve()
-        self.transform = transform
+        self._transform = transform
+        self.cache_bytes = cache_bytes
+        self.num_threads = num_threads
+        self.lazy = lazy
+        self.targets_dtype = targets_dtype
+        self.max_commands = max_commands
+        self.min_contours = min_contours
+        self.drop_empty = drop_empty
+        self.coords_dtype = coords_dtype
+        self.types_dtype = types_dtype
+        self.index_cache = (
+            Path(index_cache).expanduser() if index_cache is not None else None
+        )
         self.patterns = (
             tuple(str(pattern) for pattern in patterns)
             if patterns is not None
@@ -100,26 +304,148 @@ class FontFolder(Dataset[tuple[Tensor, Tensor, int, int]]):
             else None
         )
 
-        self._dataset = _torchfont.FontDataset(
+        self._dataset = self._build_backend()
+
+    @property
+    def transform(self) -> Callable[[Tensor, Tensor], tuple[Tensor, Tensor]] | None:
+        """Transformation applied to each loader output.
+
+        Assigning a :class:`~torchfont.transforms.NativeTransform`, or
+        replacing one, re-creates the native backend from a snapshot of the
+        current index so the new spec is fused the same way as when it is
+        passed to the constructor.
+        """
+        return self._transform
+
+    @transform.setter
+    def transform(
+        self,
+        transform: Callable[[Tensor, Tensor], tuple[Tensor, Tensor]] | None,
+    ) -> None:
+        previous = self._outline_spec()
+        self._transform = transform
+        if self._outline_spec() != previous:
+            self._dataset = self._restore_backend(self._dataset.to_bytes())
+
+    def _native_transform(self) -> NativeTransform | None:
+        if isinstance(self._transform, NativeTransform):
+            return self._transform
+        return None
+
+    def _outline_spec(
+        self,
+    ) -> tuple[int | None, int | None, bool, bool, bool, bool] | None:
+        spec = self._native_transform()
+        if spec is None:
+            return None
+        return (
+            spec.max_len,
+            spec.patch_size,
+            spec.normalize,
+            spec.close_path,
+            spec.eos,
+            spec.compact,
+        )
+
+    def _python_transform(self, types: Tensor, coords: Tensor) -> tuple[Tensor, Tensor]:
+        if self._transform is None or self._native_transform() is not None:
+            return types, coords
+        return self._transform(types, coords)
+
+    def _layout(self, types: Tensor, coords: Tensor) -> tuple[Tensor, Tensor]:
+        spec = self._native_transform()
+        if spec is not None and spec.compact:
+            coords = coords.view(-1, 2)
+            if spec.patch_size is not None:
+                types = types.view(-1, spec.patch_size)
+            return types, coords
+        if spec is None or spec.patch_size is None:
+            return types, coords.view(-1, COORD_DIM)
+        return (
+            types.view(-1, spec.patch_size),
+            coords.view(-1, spec.patch_size, COORD_DIM),
+        )
+
+    def _build_backend(self) -> _torchfont.FontDataset:
+        return _torchfont.FontDataset(
             str(self.root),
             self.codepoint_filter,
             self.patterns,
+            self.cache_bytes,
+            self.num_threads,
+            str(self.index_cache) if self.index_cache is not None else None,
+            self._index_revision(),
+            self.lazy,
+            self.max_commands,
+            self.min_contours,
+            self.drop_empty,
+            self._outline_spec(),
+            _COORD_FORMATS[self.coords_dtype],
         )
 
+    def _batch_threads(self) -> int | None:
+        # Loader threads and workers already draw in parallel; splitting the
+        # CPUs between them avoids oversubscription unless num_threads was
+        # set explicitly.
+        if self.num_threads is not None:
+            return None
+        budget = draw_threads.get()
+        if budget is not None:
+            return budget
+        if get_worker_info() is not None:
+            return 1
+        return None
+
+    def _index_revision(self) -> str | None:
+        """Return a revision that identifies the font tree, if one is known.
+
+        A revision stored alongside the index cache lets warm starts skip the
+        directory walk and file checks entirely.
+        """
+        return None
+
     def __getstate__(self) -> dict[str, object]:
-        """Return state without the native backend for worker reconstruction."""
+        """Return state carrying a binary snapshot of the native index.
+
+        The snapshot is stored as a ``uint8`` tensor, so DataLoader workers
+        started with ``spawn`` or ``forkserver`` receive it through shared
+        memory and only re-map the font files instead of re-indexing them.
+        It also records the font source, so restored datasets can still
+        :meth:`refresh`.
+        """
         state = self.__dict__.copy()
         state.pop("_dataset", None)
+        for name in self._DERIVED_ATTRS:
+            state.pop(name, None)
+        snapshot = bytearray(self._dataset.to_bytes())
+        state["_index_snapshot"] = torch.frombuffer(snapshot, dtype=torch.uint8)
         return state
 
     def __setstate__(self, state: dict[str, object]) -> None:
-        """Restore state and recreate the native backend after unpickling."""
+        """Restore state and the native backend from the index snapshot.
+
+        The font files are stat'ed first; if any changed since the snapshot
+        was taken, the index is rebuilt from the font source instead.
+        """
+        state = dict(state)
+        snapshot = state.pop("_index_snapshot", None)
         self.__dict__.update(state)
-        self._dataset = _torchfont.FontDataset(
-            str(self.root),
-            self.codepoint_filter,
-            self.patterns,
-        )
+        if isinstance(snapshot, Tensor):
+            self._dataset = self._restore_backend(snapshot.numpy().tobytes())
+        else:
+            self._dataset = self._build_backend()
+
+    def _restore_backend(self, snapshot: bytes) -> _torchfont.FontDataset:
+        try:
+            return _torchfont.FontDataset.from_bytes(
+                snapshot,
+                self.cache_bytes,
+                self.num_threads,
+                self._outline_spec(),
+                _COORD_FORMATS[self.coords_dtype],
+            )
+        except ValueError:
+            return self._build_backend()
 
     def __len__(self) -> int:
         """Return the total number of glyph samples discoverable in the dataset.
@@ -154,6 +480,262 @@ class FontFolder(Dataset[tuple[Tensor, Tensor, int, int]]):
                 types, coords, style_idx, content_idx = dataset[-1]
 
         """
+        idx = self._resolve_index(idx)
+        raw_types, raw_coords, style_idx, content_idx = self._dataset.item(idx)
+        types, coords = self._layout(
+            _from_buffer(raw_types, torch.uint8).to(self.types_dtype),
+            _from_buffer(raw_coords, self.coords_dtype),
+        )
+        types, coords = self._python_transform(types, coords)
+
+        return types, coords, style_idx, content_idx
+
+    def __getitems__(
+        self,
+        indices: Sequence[int],
+    ) -> list[tuple[Tensor, Tensor, int, int]]:
+        """Load a batch of glyph samples with a single backend call.
+
+        :class:`torch.utils.data.DataLoader` calls this method with the whole
+        list of sampled indices, so the backend draws every glyph of the batch
+        in parallel and returns them as one packed buffer.
+
+        Args:
+            indices (Sequence[int]): Sample indices to load. Negative indices
+                are supported and count from the end of the dataset.
+
+        Returns:
+            list[tuple[Tensor, Tensor, int, int]]: One ``(types, coords,
+            style_idx, content_idx)`` tuple per index, matching
+            :meth:`__getitem__`. ``types`` and ``coords`` are views into the
+            packed batch buffers.
+
+        Examples:
+            Fetch three samples at once::
+
+                samples = dataset.__getitems__([0, 5, -1])
+
+        """
+        if not indices:
+            return []
+
+        batch = self.get_batch(indices)
+        lengths = batch.offsets.diff().tolist()
+        coord_lengths = lengths
+        spec = self._native_transform()
+        if spec is not None and spec.compact:
+            # Compact samples hold a varying number of points per command.
+            coord_lengths = point_offsets(batch.types, batch.offsets).diff().tolist()
+        samples = []
+        for types_view, coords_view, style_idx, content_idx in zip(
+            batch.types.split(lengths),
+            batch.coords.split(coord_lengths),
+            batch.style_idx.tolist(),
+            batch.content_idx.tolist(),
+            strict=True,
+        ):
+            sample = self._python_transform(types_view, coords_view)
+            samples.append((*sample, style_idx, content_idx))
+        return samples
+
+    def get_batch(self, indices: Sequence[int]) -> GlyphBatch:
+        """Draw a batch of samples into packed tensors.
+
+        Unlike :meth:`__getitems__`, ``transform`` is not applied and the
+        samples are not split, which suits consumers that operate on the whole
+        batch at once. A :class:`~torchfont.transforms.NativeTransform` is the
+        exception: it runs while drawing, and with ``patch_size`` the batch is
+        laid out in patches with ``offsets`` counting patches. With ``compact``
+        the whole batch expands back to the ``COORD_DIM`` layout with a single
+        :func:`~torchfont.io.outline.expand_points` call.
+
+        Args:
+            indices (Sequence[int]): Sample indices to load. Negative indices
+                are supported and count from the end of the dataset.
+
+        Returns:
+            GlyphBatch: Concatenated ``types`` and ``coords`` of every sample,
+            the ``offsets`` delimiting them, and the per-sample labels.
+
+        Examples:
+            >>> batch = dataset.get_batch([0, 1, 2])
+            >>> batch.offsets
+            tensor([ 0, 12, 30, 41])
+
+        """
+        positions = [self._resolve_index(idx) for idx in indices]
+        if not positions:
+            types, coords = self._layout(
+                torch.empty(0, dtype=self.types_dtype),
+                torch.empty(0, dtype=self.coords_dtype),
+            )
+            return GlyphBatch(
+                types=types,
+                coords=coords,
+                offsets=torch.zeros(1, dtype=torch.long),
+                style_idx=torch.empty(0, dtype=torch.long),
+                content_idx=torch.empty(0, dtype=torch.long),
+            )
+
+        raw_types, raw_coords, raw_offsets, raw_styles, raw_contents = (
+            self._dataset.items(positions, self._batch_threads())
+        )
+        types, coords = self._layout(
+            _from_buffer(raw_types, torch.uint8).to(self.types_dtype),
+            _from_buffer(raw_coords, self.coords_dtype),
+        )
+        offsets = _from_buffer(raw_offsets, torch.long)
+        spec = self._native_transform()
+        if spec is not None and spec.patch_size is not None:
+            offsets = offsets // spec.patch_size
+        return GlyphBatch(
+            types=types,
+            coords=coords,
+            offsets=offsets,
+            style_idx=_from_buffer(raw_styles, torch.long),
+            content_idx=_from_buffer(raw_contents, torch.long),
+        )
+
+    def refresh(self) -> IndexDiff:
+        """Re-index font files that were added, modified, or removed on disk.
+
+        Files are compared by size and modification time against the current
+        index. Only added or modified files are parsed again; entries of
+        unchanged files are reused, sample offsets and class lists are
+        recomputed, and the outline cache is cleared when anything changed.
+
+        Returns:
+            IndexDiff: Paths of the added, modified, and removed font files.
+
+        Notes:
+            Sample indices and class indices may shift after a refresh. Existing
+            DataLoader workers keep the index they were started with.
+
+        Examples:
+            >>> diff = dataset.refresh()
+            >>> diff.added
+            [PosixPath('fonts/NewFont-Regular.ttf')]
+
+        """
+        added, modified, removed = self._dataset.refresh(self._index_revision())
+        for name in self._DERIVED_ATTRS:
+            self.__dict__.pop(name, None)
+        return IndexDiff(
+            added=[Path(path) for path in added],
+            modified=[Path(path) for path in modified],
+            removed=[Path(path) for path in removed],
+        )
+
+    def materialize(self) -> None:
+        """Parse every font file and build the sample index if still pending.
+
+        Lazily constructed datasets call this implicitly on first use; calling
+        it up front moves the cost to a point of your choosing. It is a no-op
+        once the index exists.
+        """
+        self._dataset.materialize()
+
+    @property
+    def is_materialized(self) -> bool:
+        """Whether the sample index has been built."""
+        return bool(self._dataset.is_materialized)
+
+    @property
+    def font_files(self) -> list[Path]:
+        """Discovered font files in index order, available without materializing.
+
+        Returns:
+            list[Path]: Paths of every indexed font file.
+
+        """
+        return [Path(path) for path in self._dataset.font_files]
+
+    @property
+    def glyph_counts(self) -> list[int]:
+        """Number of glyphs stored in each font file, summed over its faces.
+
+        The counts come from each font's ``maxp`` table and do not require
+        parsing character maps, so they are cheap to obtain before
+        :meth:`materialize`. They bound the samples a file can contribute per
+        variation instance.
+
+        Returns:
+            list[int]: Glyph counts aligned with :attr:`font_files`.
+
+        """
+        return list(self._dataset.glyph_counts())
+
+    def locate(self, indices: Tensor | Sequence[int] | range) -> SampleLocations:
+        """Resolve many sample indices to their font, instance, and labels.
+
+        The lookup runs natively without the GIL. A contiguous ``range`` walks
+        the font offsets once instead of searching them per index.
+
+        Args:
+            indices (Tensor | Sequence[int] | range): Sample indices to
+                resolve. Negative indices count from the end of the dataset.
+
+        Returns:
+            SampleLocations: ``torch.long`` tensors aligned with ``indices``.
+            ``instance_idx`` is ``-1`` for samples of static fonts.
+
+        Raises:
+            IndexError: If any index is out of range.
+
+        Examples:
+            Count samples per font without touching glyph outlines::
+
+                locations = dataset.locate(range(len(dataset)))
+                per_font = locations.font_idx.bincount()
+
+        """
+        dataset_len = len(self)
+        if (
+            isinstance(indices, range)
+            and indices.step == 1
+            and 0 <= indices.start <= indices.stop <= dataset_len
+        ):
+            columns = self._dataset.locate_range(indices.start, indices.stop)
+        else:
+            positions = torch.as_tensor(indices, dtype=torch.long).flatten()
+            positions = torch.where(positions < 0, positions + dataset_len, positions)
+            invalid = (positions < 0) | (positions >= dataset_len)
+            if invalid.any():
+                bad = int(torch.as_tensor(indices).flatten()[invalid][0])
+                msg = f"index {bad} is out of range for dataset of length {dataset_len}"
+                raise IndexError(msg)
+            columns = self._dataset.locate_many(positions.numpy().tobytes())
+
+        return SampleLocations(
+            *(_from_buffer(column, torch.long) for column in columns)
+        )
+
+    def cache_info(self) -> GlyphCacheInfo:
+        """Report statistics of the native outline cache.
+
+        Returns:
+            GlyphCacheInfo: Hit, miss, and eviction counters together with the
+            number of cached outlines, their size in bytes, and the configured
+            capacity. All fields are zero when the cache is disabled.
+
+        Notes:
+            Each DataLoader worker process owns a separate cache, so the
+            counters only reflect accesses made through this instance.
+
+        Examples:
+            >>> dataset = FontFolder(root="fonts", cache_bytes=1 << 30)
+            >>> _ = dataset[0], dataset[0]
+            >>> dataset.cache_info().hits
+            1
+
+        """
+        return GlyphCacheInfo(*self._dataset.cache_info())
+
+    def cache_clear(self) -> None:
+        """Drop every cached outline and reset the cache statistics."""
+        self._dataset.cache_clear()
+
+    def _resolve_index(self, idx: int) -> int:
         idx = int(idx)
         original_idx = idx
         dataset_len = len(self)
@@ -165,21 +747,19 @@ class FontFolder(Dataset[tuple[Tensor, Tensor, int, int]]):
                 f"{dataset_len}"
             )
             raise IndexError(msg)
-        raw_types, raw_coords, style_idx, content_idx = self._dataset.item(idx)
-        types = torch.as_tensor(raw_types, dtype=torch.long)
-        coords = torch.as_tensor(raw_coords, dtype=torch.float32).view(-1, COORD_DIM)
-        if self.transform is not None:
-            types, coords = self.transform(types, coords)
+        return idx
 
-        return types, coords, style_idx, content_idx
-
-    @property
+    @cached_property
     def targets(self) -> Tensor:
         """Label matrix pairing every sample with its style and content class.
 
+        The matrix is built once by the native backend and cached; the tensor
+        is a view over that buffer, so repeated accesses do not copy it.
+
         Returns:
-            torch.LongTensor: Tensor of shape ``(N, 2)`` where column 0 holds
-            the style class index and column 1 holds the content class index.
+            Tensor: Tensor of shape ``(N, 2)`` and dtype ``targets_dtype``
+            where column 0 holds the style class index and column 1 holds the
+            content class index.
 
         Examples:
             >>> dataset = FontFolder(root="fonts", codepoint_filter=range(0x41, 0x44))
@@ -189,17 +769,83 @@ class FontFolder(Dataset[tuple[Tensor, Tensor, int, int]]):
             tensor([style_idx, content_idx])
 
         """
-        raw = self._dataset.targets()
-        if not raw:
-            return torch.empty(0, 2, dtype=torch.long)
-        return torch.frombuffer(bytearray(raw), dtype=torch.long).view(-1, 2)
+        raw = self._dataset.targets(self.targets_dtype == torch.long)
+        return _from_buffer(raw, self.targets_dtype).view(-1, 2)
 
-    @property
+    @cached_property
+    def sample_offsets(self) -> Tensor:
+        """Boundaries of the samples contributed by each indexed font face.
+
+        Samples of face ``f`` occupy ``range(sample_offsets[f],
+        sample_offsets[f + 1])``, ordered by variation instance and then by
+        code point. Face indices match ``SampleLocations.font_idx``.
+
+        Returns:
+            Tensor: Long tensor of shape ``(F + 1,)`` for ``F`` indexed faces.
+
+        """
+        return _from_buffer(self._dataset.sample_offsets(), torch.long)
+
+    @cached_property
+    def inst_offsets(self) -> Tensor:
+        """Boundaries of the style classes contributed by each font face.
+
+        Face ``f`` owns style indices ``range(inst_offsets[f],
+        inst_offsets[f + 1])``, one per variation instance, or a single one
+        for static faces.
+
+        Returns:
+            Tensor: Long tensor of shape ``(F + 1,)`` for ``F`` indexed faces.
+
+        """
+        return _from_buffer(self._dataset.inst_offsets(), torch.long)
+
+    @cached_property
+    def sequence_lengths(self) -> Tensor:
+        """Number of commands of every sample, including the trailing ``eos``.
+
+        The counts come from the same metadata pass as :attr:`glyph_metrics`,
+        which measures outlines natively without producing coordinates.
+        Lengths describe the untransformed outline returned by the backend.
+
+        Returns:
+            Tensor: Long tensor of shape ``(N,)``.
+
+        """
+        return _from_buffer(self._dataset.sequence_lengths(), torch.long)
+
+    @cached_property
+    def glyph_metrics(self) -> GlyphMetrics:
+        """Outline measurements of every sample, as column tensors.
+
+        The metadata pass walks every outline in parallel without producing
+        coordinates. Its results are kept with the index, so they are written
+        to ``index_cache`` and shipped to DataLoader workers.
+
+        Returns:
+            GlyphMetrics: Columns aligned with the sample indices.
+
+        Examples:
+            >>> metrics = dataset.glyph_metrics
+            >>> long_glyphs = (metrics.commands > 512).nonzero().flatten()
+
+        """
+        commands, contours, points, bbox, empty = self._dataset.glyph_metrics()
+        return GlyphMetrics(
+            commands=_from_buffer(commands, torch.long),
+            contours=_from_buffer(contours, torch.long),
+            points=_from_buffer(points, torch.long),
+            bbox=_from_buffer(bbox, torch.float32).view(-1, 4),
+            empty=_from_buffer(empty, torch.bool),
+        )
+
+    @cached_property
     def content_classes(self) -> list[str]:
         """List of unique characters (Unicode strings) in the dataset.
 
         Returns class names sorted by their index. Each name is a single
-        Unicode character corresponding to a codepoint in the dataset.
+        Unicode character corresponding to a codepoint in the dataset. The list
+        is built once and cached.
 
         Returns:
             list[str]: Character strings for each content class.
@@ -213,10 +859,12 @@ class FontFolder(Dataset[tuple[Tensor, Tensor, int, int]]):
         codepoints = self._dataset.content_classes
         return [chr(cp) for cp in codepoints]
 
-    @property
+    @cached_property
     def content_class_to_idx(self) -> dict[str, int]:
         """Mapping from character strings to content class indices.
 
+        Built once from :attr:`content_classes` and cached.
+
         Returns:
             dict[str, int]: Dictionary mapping character to index.
 
@@ -227,13 +875,34 @@ class FontFolder(Dataset[tuple[Tensor, Tensor, int, int]]):
         """
         return {char: idx for idx, char in enumerate(self.content_classes)}
 
-    @property
+    def content_index(self, char: str) -> int | None:
+        """Look up the content class index of a single character.
+
+        The lookup runs against the native index, so it does not build
+        :attr:`content_classes` or :attr:`content_class_to_idx`.
+
+        Args:
+            char (str): Single Unicode character.
+
+        Returns:
+            int | None: Content class index, or ``None`` if the dataset has no
+            such character.
+
+        Examples:
+            >>> dataset.content_index("A")
+            0
+
+        """
+        return self._dataset.content_index(ord(char))
+
+    @cached_property
     def style_classes(self) -> list[str]:
         """List of style variation instance names in the dataset.
 
         Returns class names sorted by their index. For variable fonts, names
         come from the font's named instances. For static fonts, names are
-        derived from the font's family and subfamily names.
+        derived from the font's family and subfamily names. Names are read
+        from the fonts while indexing, and the list is cached.
 
         Returns:
             list[str]: Descriptive names for each style class.
@@ -245,10 +914,12 @@ class FontFolder(Dataset[tuple[Tensor, Tensor, int, int]]):
         """
         return list(self._dataset.style_classes)
 
-    @property
+    @cached_property
     def style_class_to_idx(self) -> dict[str, int]:
         """Mapping from style instance names to style class indices.
 
+        Built once from :attr:`style_classes` and cached.
+
         Returns:
             dict[str, int]: Dictionary mapping style name to index.
 
@@ -275,3 +946,31 @@ class FontFolder(Dataset[tuple[Tensor, Tensor, int, int]]):
                 stacklevel=2,
             )
         return mapping
+
+    def style_index(self, name: str) -> int | None:
+        """Look up the style class index of a style name.
+
+        The lookup runs against the native index, so it does not build
+        :attr:`style_classes` or :attr:`style_class_to_idx`. Duplicate names
+        resolve to the last occurrence, as in :attr:`style_class_to_idx`.
+
+        Args:
+            name (str): Style instance name.
+
+        Returns:
+            int | None: Style class index, or ``None`` if no style has that
+            name.
+
+        Examples:
+            >>> dataset.style_index("Roboto Regular")
+            0
+
+        """
+        return self._dataset.style_index(name)
+
+
+def _from_buffer(raw: bytearray, dtype: torch.dtype) -> Tensor:
+    # torch.frombuffer rejects empty buffers.
+    if not raw:
+        return torch.empty(0, dtype=dtype)
+    return torch.frombuffer(raw, dtype=dtype)
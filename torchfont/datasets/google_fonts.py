@@ -14,6 +14,7 @@ Examples:
 from collections.abc import Callable, Sequence
 from pathlib import Path
 
+import torch
 from torch import Tensor
 
 from torchfont.datasets.repo import FontRepo
@@ -45,6 +46,16 @@ class GoogleFonts(FontRepo):
         codepoint_filter: Sequence[int] | None = None,
         transform: (Callable[[Tensor, Tensor], tuple[Tensor, Tensor]] | None) = None,
         download: bool = False,
+        cache_bytes: int | None = None,
+        num_threads: int | None = None,
+        index_cache: Path | str | None = None,
+        lazy: bool = False,
+        targets_dtype: torch.dtype = torch.long,
+        max_commands: int | None = None,
+        min_contours: int | None = None,
+        drop_empty: bool = False,
+        coords_dtype: torch.dtype = torch.float32,
+        types_dtype: torch.dtype = torch.long,
     ) -> None:
         """Initialize a shallow clone of Google Fonts and index glyph samples.
 
@@ -64,6 +75,26 @@ class GoogleFonts(FontRepo):
                 backend.
             download (bool): Whether to perform the clone and checkout when the
                 directory is missing or empty.
+            cache_bytes (int | None): Optional memory budget in bytes for the
+                native LRU cache of drawn outlines. ``None`` disables the cache.
+            num_threads (int | None): Number of native threads used for
+                indexing and batch drawing. Defaults to the available CPUs.
+            index_cache (Path | str | None): Optional file used to persist the
+                built index. The cache is keyed on the checked-out commit, so
+                warm starts on the same revision skip indexing entirely.
+            lazy (bool): Whether to defer parsing fonts until the index is first
+                needed. See :class:`~torchfont.datasets.folder.FontFolder`.
+            targets_dtype (torch.dtype): Integer dtype of ``targets``, either
+                ``torch.long`` or ``torch.int32``.
+            max_commands (int | None): Drop code points whose outline has more
+                commands than this.
+            min_contours (int | None): Drop code points whose outline has fewer
+                contours than this.
+            drop_empty (bool): Whether to drop code points without any contour.
+            coords_dtype (torch.dtype): Dtype of ``coords``. See
+                :class:`~torchfont.datasets.folder.FontFolder`.
+            types_dtype (torch.dtype): Dtype of ``types``. See
+                :class:`~torchfont.datasets.folder.FontFolder`.
 
         Examples:
             Reuse an existing checkout without hitting the network::
@@ -82,4 +113,14 @@ class GoogleFonts(FontRepo):
             codepoint_filter=codepoint_filter,
             transform=transform,
             download=download,
+            cache_bytes=cache_bytes,
+            num_threads=num_threads,
+            index_cache=index_cache,
+            lazy=lazy,
+            targets_dtype=targets_dtype,
+            max_commands=max_commands,
+            min_contours=min_contours,
+            drop_empty=drop_empty,
+            coords_dtype=coords_dtype,
+            types_dtype=types_dtype,
         )
@@ -0,0 +1,342 @@
+"""Pre-packed glyph shards that can be served without drawing outlines.
+
+Notes:
+    A packed directory holds one ``meta.json`` file plus four flat binary
+    arrays per shard: ``types`` (int8), ``coords`` (``COORD_DIM`` values per
+    command in the ``coords_dtype`` of the source dataset, float32 by
+    default), per-sample ``offsets`` (int64), and the ``targets`` matrix
+    (int64). Files are written in native byte order and memory-mapped
+    when read, so packed datasets should be consumed on machines with the same
+    endianness as the one that produced them.
+
+Examples:
+    Pack a font folder once and train from the shards afterwards::
+
+        from torchfont.datasets import FontFolder, PackedGlyphDataset, pack_dataset
+
+        pack_dataset(FontFolder(root="~/fonts"), "data/packed")
+        dataset = PackedGlyphDataset("data/packed")
+        types, coords, style_idx, content_idx = dataset[0]
+
+"""
+
+import bisect
+import json
+import math
+from collections.abc import Callable
+from pathlib import Path
+from typing import NamedTuple
+
+import torch
+from torch import Tensor
+from torch.utils.data import Dataset
+
+from torchfont.datasets.folder import FontFolder
+from torchfont.io.outline import COORD_DIM, expand_points
+
+PACKED_FORMAT = "torchfont-packed"
+PACKED_VERSION = 1
+META_FILE = "meta.json"
+
+_ARRAYS: dict[str, torch.dtype] = {
+    "types": torch.int8,
+    "coords": torch.float32,
+    "offsets": torch.long,
+    "targets": torch.long,
+}
+_COORD_DTYPES: dict[str, torch.dtype] = {
+    "float32": torch.float32,
+    "float16": torch.float16,
+    "bfloat16": torch.bfloat16,
+    "int16": torch.int16,
+}
+
+
+class _Shard(NamedTuple):
+    prefix: str
+    samples: int
+    commands: int
+
+
+def pack_dataset(
+    dataset: FontFolder,
+    root: Path | str,
+    *,
+    shard_size: int | None = None,
+    batch_size: int = 4096,
+) -> Path:
+    """Draw every sample of ``dataset`` and write it as packed shards.
+
+    Samples are drawn in batches through :meth:`FontFolder.get_batch`, which
+    renders each batch in parallel inside the native backend. The dataset's
+    ``transform`` is not applied; pass one to :class:`PackedGlyphDataset`
+    instead. A :class:`~torchfont.transforms.NativeTransform` already runs
+    while drawing; its patched samples are stored flat and compact samples are
+    expanded to the ``COORD_DIM`` layout. Coordinates keep the dataset's
+    ``coords_dtype``, so 16-bit datasets produce shards half the size.
+
+    Args:
+        dataset (FontFolder): Dataset to export. ``FontRepo`` and
+            ``GoogleFonts`` instances are accepted as well.
+        root (Path | str): Output directory. It is created if needed, and
+            existing packed files inside it are overwritten.
+        shard_size (int | None): Maximum number of samples per shard. ``None``
+            writes a single shard.
+        batch_size (int): Number of samples drawn per backend call.
+
+    Returns:
+        Path: The resolved output directory.
+
+    Raises:
+        ValueError: If ``shard_size`` or ``batch_size`` is not positive.
+
+    Examples:
+        Split a large corpus into shards of one million samples::
+
+            pack_dataset(dataset, "data/packed", shard_size=1_000_000)
+
+    """
+    if shard_size is not None and shard_size < 1:
+        msg = f"shard_size must be positive, got {shard_size}"
+        raise ValueError(msg)
+    if batch_size < 1:
+        msg = f"batch_size must be positive, got {batch_size}"
+        raise ValueError(msg)
+
+    out_dir = Path(root).expanduser().resolve()
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    total = len(dataset)
+    shard_size = shard_size or max(total, 1)
+    shards = []
+    for shard_idx, shard_start in enumerate(range(0, max(total, 1), shard_size)):
+        shard_stop = min(shard_start + shard_size, total)
+        shards.append(
+            _write_shard(
+                dataset,
+                out_dir,
+                shard_idx=shard_idx,
+                start=shard_start,
+                stop=shard_stop,
+                batch_size=batch_size,
+            ),
+        )
+
+    meta = {
+        "format": PACKED_FORMAT,
+        "version": PACKED_VERSION,
+        "coord_dim": COORD_DIM,
+        "coords_dtype": str(dataset.coords_dtype).removeprefix("torch."),
+        "content_classes": dataset.content_classes,
+        "style_classes": dataset.style_classes,
+        "shards": [shard._asdict() for shard in shards],
+    }
+    (out_dir / META_FILE).write_text(json.dumps(meta), encoding="utf-8")
+    return out_dir
+
+
+def _write_shard(
+    dataset: FontFolder,
+    out_dir: Path,
+    *,
+    shard_idx: int,
+    start: int,
+    stop: int,
+    batch_size: int,
+) -> _Shard:
+    prefix = f"shard-{shard_idx:05d}"
+    paths = {name: out_dir / f"{prefix}.{name}.bin" for name in _ARRAYS}
+    handles = {name: path.open("wb") for name, path in paths.items()}
+    commands = 0
+    try:
+        handles["offsets"].write(torch.zeros(1, dtype=torch.long).numpy().tobytes())
+        for batch_start in range(start, stop, batch_size):
+            batch = dataset.get_batch(
+                range(batch_start, min(batch_start + batch_size, stop))
+            )
+            targets = torch.stack((batch.style_idx, batch.content_idx), dim=1)
+            if batch.coords.size(-1) != COORD_DIM:
+                batch = batch._replace(coords=expand_points(batch.types, batch.coords))
+            # Patched batches from a native transform are stored flat.
+            steps = math.prod(batch.types.shape[1:])
+            offsets = batch.offsets[1:] * steps + commands
+            handles["types"].write(batch.types.to(torch.int8).numpy().tobytes())
+            # NumPy has no bfloat16, so coordinates are written as raw bytes.
+            coords = batch.coords.contiguous().view(torch.uint8)
+            handles["coords"].write(coords.numpy().tobytes())
+            handles["offsets"].write(offsets.numpy().tobytes())
+            handles["targets"].write(targets.numpy().tobytes())
+            commands = int(offsets[-1])
+    finally:
+        for handle in handles.values():
+            handle.close()
+
+    return _Shard(prefix=prefix, samples=stop - start, commands=commands)
+
+
+class PackedGlyphDataset(Dataset[tuple[Tensor, Tensor, int, int]]):
+    """Dataset that serves glyph samples from shards written by :func:`pack_dataset`.
+
+    Every array is memory-mapped copy-on-write, so ``coords`` are returned as
+    zero-copy views and only the small ``types`` slices are widened to
+    ``torch.long``. Shards are opened read-only; in-place edits of returned
+    tensors stay private to the process and never reach the files.
+    Items and class attributes match :class:`~torchfont.datasets.FontFolder`.
+
+    Attributes:
+        targets (Tensor): Label matrix of shape ``(N, 2)`` holding the style
+            and content class index of every sample.
+        content_classes (list[str]): Content class characters sorted by index.
+        content_class_to_idx (dict[str, int]): Mapping from characters to
+            content class indices.
+        style_classes (list[str]): Style names sorted by index.
+        style_class_to_idx (dict[str, int]): Mapping from style names to style
+            class indices.
+        coords_dtype (torch.dtype): Dtype of the stored coordinates.
+
+    """
+
+    def __init__(
+        self,
+        root: Path | str,
+        *,
+        transform: (Callable[[Tensor, Tensor], tuple[Tensor, Tensor]] | None) = None,
+    ) -> None:
+        """Open a packed directory.
+
+        Args:
+            root (Path | str): Directory produced by :func:`pack_dataset`.
+            transform (Callable[[Tensor, Tensor], tuple[Tensor, Tensor]] | None):
+                Optional transformation applied to each ``(types, coords)``
+                pair before the item is returned.
+
+        Raises:
+            ValueError: If the directory does not contain a supported packed
+                dataset.
+
+        """
+        self.root = Path(root).expanduser().resolve()
+        self.transform = transform
+
+        meta = json.loads((self.root / META_FILE).read_text(encoding="utf-8"))
+        if meta.get("format") != PACKED_FORMAT or meta.get("version") != PACKED_VERSION:
+            msg = f"'{self.root}' does not contain a supported packed glyph dataset"
+            raise ValueError(msg)
+        if meta["coord_dim"] != COORD_DIM:
+            msg = f"packed coord_dim {meta['coord_dim']} does not match {COORD_DIM}"
+            raise ValueError(msg)
+        coords_dtype = meta.get("coords_dtype", "float32")
+        if coords_dtype not in _COORD_DTYPES:
+            msg = f"unsupported packed coords_dtype '{coords_dtype}'"
+            raise ValueError(msg)
+
+        self.coords_dtype = _COORD_DTYPES[coords_dtype]
+        self.content_classes: list[str] = list(meta["content_classes"])
+        self.style_classes: list[str] = list(meta["style_classes"])
+        self.content_class_to_idx = {
+            char: idx for idx, char in enumerate(self.content_classes)
+        }
+        self.style_class_to_idx = {
+            name: idx for idx, name in enumerate(self.style_classes)
+        }
+        self._shards = [_Shard(**shard) for shard in meta["shards"]]
+
+        self._sample_starts = [0]
+        for shard in self._shards:
+            self._sample_starts.append(self._sample_starts[-1] + shard.samples)
+        self._map_shards()
+
+    def _map_shards(self) -> None:
+        self._arrays = [self._map_shard(shard) for shard in self._shards]
+
+    def _map_shard(self, shard: _Shard) -> dict[str, Tensor]:
+        sizes = {
+            "types": shard.commands,
+            "coords": shard.commands * COORD_DIM,
+            "offsets": shard.samples + 1,
+            "targets": shard.samples * 2,
+        }
+        arrays = {}
+        dtypes = {**_ARRAYS, "coords": self.coords_dtype}
+        for name, dtype in dtypes.items():
+            path = self.root / f"{shard.prefix}.{name}.bin"
+            if sizes[name] == 0:
+                arrays[name] = torch.empty(0, dtype=dtype)
+            else:
+                arrays[name] = torch.from_file(
+                    str(path),
+                    shared=False,
+                    size=sizes[name],
+                    dtype=dtype,
+                )
+        arrays["coords"] = arrays["coords"].view(-1, COORD_DIM)
+        arrays["targets"] = arrays["targets"].view(-1, 2)
+        return arrays
+
+    def __getstate__(self) -> dict[str, object]:
+        """Return state without the memory maps, which workers re-open."""
+        state = self.__dict__.copy()
+        state.pop("_arrays", None)
+        return state
+
+    def __setstate__(self, state: dict[str, object]) -> None:
+        """Restore state and re-map the shard files."""
+        self.__dict__.update(state)
+        self._map_shards()
+
+    def __len__(self) -> int:
+        """Return the total number of packed samples.
+
+        Returns:
+            int: Number of samples across all shards.
+
+        """
+        return self._sample_starts[-1]
+
+    def __getitem__(self, idx: int) -> tuple[Tensor, Tensor, int, int]:
+        """Load a packed glyph sample and its targets.
+
+        Args:
+            idx (int): Zero-based sample index. Negative indices count from the
+                end of the dataset.
+
+        Returns:
+            tuple[Tensor, Tensor, int, int]: ``(types, coords, style_idx,
+            content_idx)`` as produced by :class:`FontFolder` at packing time.
+
+        Raises:
+            IndexError: If ``idx`` is out of range.
+
+        """
+        idx = int(idx)
+        dataset_len = len(self)
+        position = idx + dataset_len if idx < 0 else idx
+        if position < 0 or position >= dataset_len:
+            msg = f"index {idx} is out of range for dataset of length {dataset_len}"
+            raise IndexError(msg)
+
+        shard_idx = bisect.bisect_right(self._sample_starts, position) - 1
+        arrays = self._arrays[shard_idx]
+        local = position - self._sample_starts[shard_idx]
+        start, stop = arrays["offsets"][local : local + 2].tolist()
+        types = arrays["types"][start:stop].long()
+        coords = arrays["coords"][start:stop]
+        if self.transform is not None:
+            types, coords = self.transform(types, coords)
+
+        style_idx, content_idx = arrays["targets"][local].tolist()
+        return types, coords, style_idx, content_idx
+
+    @property
+    def targets(self) -> Tensor:
+        """Label matrix pairing every sample with its style and content class.
+
+        Returns:
+            Tensor: Long tensor of shape ``(N, 2)``. A single shard is returned
+            as a view over the memory map; several shards are concatenated.
+
+        """
+        parts = [arrays["targets"] for arrays in self._arrays]
+        if len(parts) == 1:
+            return parts[0]
+        return torch.cat(parts) if parts else torch.empty(0, 2, dtype=torch.long)
@@ -22,9 +22,10 @@ from collections.abc import Callable, Sequence
 from pathlib import Path
 from typing import SupportsIndex
 
+import torch
 from torch import Tensor
 
-from torchfont.datasets.folder import FontFolder
+from torchfont.datasets.folder import FontFolder, IndexDiff
 from torchfont.io.git import ensure_repo
 
 
@@ -51,6 +52,16 @@ class FontRepo(FontFolder):
         codepoint_filter: Sequence[SupportsIndex] | None = None,
         transform: (Callable[[Tensor, Tensor], tuple[Tensor, Tensor]] | None) = None,
         download: bool = False,
+        cache_bytes: int | None = None,
+        num_threads: int | None = None,
+        index_cache: Path | str | None = None,
+        lazy: bool = False,
+        targets_dtype: torch.dtype = torch.long,
+        max_commands: int | None = None,
+        min_contours: int | None = None,
+        drop_empty: bool = False,
+        coords_dtype: torch.dtype = torch.float32,
+        types_dtype: torch.dtype = torch.long,
     ) -> None:
         """Clone and index a Git repository of fonts.
 
@@ -66,6 +77,26 @@ class FontRepo(FontFolder):
                 Optional transformation applied to each sample from the backend.
             download (bool): Whether to clone and check out the repository
                 contents when the working tree is empty or stale.
+            cache_bytes (int | None): Optional memory budget in bytes for the
+                native LRU cache of drawn outlines. ``None`` disables the cache.
+            num_threads (int | None): Number of native threads used for
+                indexing and batch drawing. Defaults to the available CPUs.
+            index_cache (Path | str | None): Optional file used to persist the
+                built index. The cache is keyed on the checked-out commit, so
+                warm starts on the same revision skip indexing entirely.
+            lazy (bool): Whether to defer parsing fonts until the index is first
+                needed. See :class:`~torchfont.datasets.folder.FontFolder`.
+            targets_dtype (torch.dtype): Integer dtype of ``targets``, either
+                ``torch.long`` or ``torch.int32``.
+            max_commands (int | None): Drop code points whose outline has more
+                commands than this.
+            min_contours (int | None): Drop code points whose outline has fewer
+                contours than this.
+            drop_empty (bool): Whether to drop code points without any contour.
+            coords_dtype (torch.dtype): Dtype of ``coords``. See
+                :class:`~torchfont.datasets.folder.FontFolder`.
+            types_dtype (torch.dtype): Dtype of ``types``. See
+                :class:`~torchfont.datasets.folder.FontFolder`.
 
         Raises:
             FileNotFoundError: If the repository does not exist locally and
@@ -99,4 +130,44 @@ class FontRepo(FontFolder):
             codepoint_filter=codepoint_filter,
             patterns=patterns,
             transform=transform,
+            cache_bytes=cache_bytes,
+            num_threads=num_threads,
+            index_cache=index_cache,
+            lazy=lazy,
+            targets_dtype=targets_dtype,
+            max_commands=max_commands,
+            min_contours=min_contours,
+            drop_empty=drop_empty,
+            coords_dtype=coords_dtype,
+            types_dtype=types_dtype,
         )
+
+    def sync(self, ref: str | None = None) -> IndexDiff:
+        """Fetch ``ref`` and re-index only the font files that changed.
+
+        Args:
+            ref (str | None): Git reference to move to. Defaults to the
+                reference the dataset was created with.
+
+        Returns:
+            IndexDiff: Font files added, modified, or removed by the checkout.
+
+        Examples:
+            Follow a branch between training runs without rebuilding::
+
+                diff = ds.sync()
+                print(len(diff.added), "new fonts")
+
+        """
+        if ref is not None:
+            self.ref = ref
+        self.commit_hash = ensure_repo(
+            root=self.root,
+            url=self.url,
+            ref=self.ref,
+            download=True,
+        )
+        return self.refresh()
+
+    def _index_revision(self) -> str | None:
+        return self.commit_hash
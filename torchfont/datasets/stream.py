@@ -0,0 +1,204 @@
+"""Streaming access to indexed fonts for sequential, page-cache friendly reads.
+
+Notes:
+    :class:`FontStream` walks whole font faces instead of random samples, so
+    each worker touches a bounded set of font files and draws every glyph of a
+    face with the same parsed outline handle. Randomness comes from shuffling
+    the face order and from a bounded shuffle buffer over the drawn samples.
+
+Examples:
+    Stream a local font folder through four workers::
+
+        from torch.utils.data import DataLoader
+
+        from torchfont.datasets import FontFolder, FontStream
+
+        stream = FontStream(FontFolder(root="~/fonts"), seed=0)
+        loader = DataLoader(stream, batch_size=64, num_workers=4)
+
+"""
+
+import itertools
+import math
+from collections.abc import Iterator
+
+import torch
+from torch import Tensor
+from torch.utils.data import IterableDataset, get_worker_info
+
+from torchfont.data._sharding import balance, resolve_replicas
+from torchfont.datasets.folder import FontFolder
+
+
+class FontStream(IterableDataset[tuple[Tensor, Tensor, int, int]]):
+    """Iterable dataset that shards font faces across ranks and workers.
+
+    Faces are assigned to distributed ranks once, balanced by sample count.
+    Like :class:`~torchfont.data.FontShardSampler`, every rank yields the same
+    number of samples: ranks with fewer samples repeat their own faces, ranks
+    with more are trimmed, and ranks left without a face draw from the whole
+    index. Within a rank the face order is reshuffled per epoch and dealt
+    round-robin to DataLoader workers. Items match
+    :meth:`FontFolder.__getitem__`, including the dataset's ``transform``.
+
+    See Also:
+        torchfont.datasets.folder.FontFolder: Map-style dataset whose index the
+        stream reads.
+
+    """
+
+    def __init__(
+        self,
+        dataset: FontFolder,
+        *,
+        shuffle: bool = True,
+        buffer_size: int = 4096,
+        seed: int = 0,
+        num_replicas: int | None = None,
+        rank: int | None = None,
+        drop_last: bool = False,
+    ) -> None:
+        """Configure sharding and shuffling over ``dataset``.
+
+        Args:
+            dataset (FontFolder): Indexed dataset to stream. ``FontRepo`` and
+                ``GoogleFonts`` instances are accepted as well.
+            shuffle (bool): Whether to shuffle the face order and pass samples
+                through the shuffle buffer. When ``False``, each worker yields
+                its faces in index order.
+            buffer_size (int): Number of samples held in the shuffle buffer.
+                Faces are also drawn in chunks of at most this many samples.
+            seed (int): Base seed combined with the epoch, set through
+                :meth:`set_epoch`, and the worker id.
+            num_replicas (int | None): Number of distributed ranks. Defaults to
+                the world size of the default process group, or ``1``.
+            rank (int | None): Rank of the current process. Defaults to the
+                rank in the default process group, or ``0``.
+            drop_last (bool): Whether to trim every rank to ``N //
+                num_replicas`` samples instead of padding to ``ceil(N /
+                num_replicas)``.
+
+        Raises:
+            ValueError: If ``buffer_size`` is not positive or ``rank`` is out
+                of range.
+
+        """
+        if buffer_size < 1:
+            msg = f"buffer_size must be positive, got {buffer_size}"
+            raise ValueError(msg)
+        num_replicas, rank = resolve_replicas(num_replicas, rank)
+
+        self.dataset = dataset
+        self.shuffle = shuffle
+        self.buffer_size = buffer_size
+        self.seed = seed
+        self.num_replicas = num_replicas
+        self.rank = rank
+        self.drop_last = drop_last
+        self.epoch = 0
+
+        total = len(dataset)
+        self.num_samples = (
+            total // num_replicas if drop_last else math.ceil(total / num_replicas)
+        )
+        partitions = balance(dataset.sample_offsets.diff(), num_replicas)
+        self._faces = partitions[rank]
+        self._start = 0
+        if not self._faces:
+            # Ranks without a face of their own borrow the whole index, each
+            # from a distinct sample offset.
+            self._faces = sorted(itertools.chain.from_iterable(partitions))
+            self._start = rank * self.num_samples
+
+    def set_epoch(self, epoch: int) -> None:
+        """Set the epoch that seeds the next iteration.
+
+        Call this before creating the DataLoader iterator of every epoch. With
+        persistent workers, the epoch must be set before the workers start.
+
+        Args:
+            epoch (int): Epoch number.
+
+        """
+        self.epoch = epoch
+
+    def __len__(self) -> int:
+        """Return the number of samples this rank yields per epoch.
+
+        Returns:
+            int: Per-rank sample count, summed over all of its DataLoader
+            workers.
+
+        """
+        return self.num_samples
+
+    def __iter__(self) -> Iterator[tuple[Tensor, Tensor, int, int]]:
+        """Yield samples of the faces assigned to this rank and worker.
+
+        Returns:
+            Iterator[tuple[Tensor, Tensor, int, int]]: Samples in the same
+            format as :meth:`FontFolder.__getitem__`.
+
+        """
+        info = get_worker_info()
+        worker_id, num_workers = (0, 1) if info is None else (info.id, info.num_workers)
+
+        faces = torch.tensor(self._faces, dtype=torch.long)
+        generator = torch.Generator().manual_seed(self.seed + self.epoch)
+        if self.shuffle:
+            faces = faces[torch.randperm(len(faces), generator=generator)]
+        spans = self._spans(faces.tolist())[worker_id::num_workers]
+
+        samples = self._draw(spans)
+        if not self.shuffle:
+            yield from samples
+            return
+
+        # Workers share the face order but need distinct buffer streams.
+        base_seed = int(torch.randint(2**62, (), generator=generator))
+        generator.manual_seed(base_seed + worker_id)
+        buffer: list[tuple[Tensor, Tensor, int, int]] = []
+        for sample in samples:
+            if len(buffer) < self.buffer_size:
+                buffer.append(sample)
+                continue
+            slot = int(torch.randint(len(buffer), (), generator=generator))
+            yield buffer[slot]
+            buffer[slot] = sample
+
+        order = torch.randperm(len(buffer), generator=generator).tolist()
+        for slot in order:
+            yield buffer[slot]
+
+    def _spans(self, faces: list[int]) -> list[tuple[int, int]]:
+        # Sample ranges of the faces, repeated or cut to exactly num_samples.
+        offsets = self.dataset.sample_offsets.tolist()
+        ranges = [(offsets[face], offsets[face + 1]) for face in faces]
+        total = sum(stop - start for start, stop in ranges)
+        if total == 0:
+            return []
+
+        spans: list[tuple[int, int]] = []
+        skip = self._start % total
+        remaining = self.num_samples
+        for face_start, face_stop in itertools.cycle(ranges):
+            if remaining == 0:
+                break
+            if skip >= face_stop - face_start:
+                skip -= face_stop - face_start
+                continue
+            start = face_start + skip
+            stop = min(face_stop, start + remaining)
+            spans.append((start, stop))
+            remaining -= stop - start
+            skip = 0
+        return spans
+
+    def _draw(
+        self,
+        spans: list[tuple[int, int]],
+    ) -> Iterator[tuple[Tensor, Tensor, int, int]]:
+        for span_start, span_stop in spans:
+            for start in range(span_start, span_stop, self.buffer_size):
+                stop = min(start + self.buffer_size, span_stop)
+                yield from self.dataset.__getitems__(range(start, stop))
@@ -1,4 +1,17 @@
-"""Shared constants for glyph outline command encoding."""
+"""Shared constants and helpers for glyph outline command encoding.
+
+Notes:
+    The default layout stores ``COORD_DIM`` values per command, most of them
+    zeros: ``moveTo`` and ``lineTo`` only fill their last coordinate pair and
+    ``closePath``, ``eos``, and ``pad`` none at all. The compact layout keeps
+    just the points, as an ``(num_points, 2)`` stream in command order. The
+    number of points of every command follows from its type through
+    :data:`POINTS_PER_TYPE`, so ``types`` alone describes the stream.
+
+"""
+
+import torch
+from torch import Tensor
 
 TYPE_TO_IDX: dict[str, int] = {
     "pad": 0,
@@ -11,5 +24,119 @@ TYPE_TO_IDX: dict[str, int] = {
 
 TYPE_DIM: int = len(TYPE_TO_IDX)
 COORD_DIM: int = 6
+# Steps per em unit of coordinates encoded as ``torch.int16`` fixed point.
+FIXED_POINT_SCALE: int = 4096
+# Points stored per command in the compact layout, indexed by command type.
+POINTS_PER_TYPE: tuple[int, ...] = (0, 1, 1, 3, 0, 0)
+
+
+def compact_points(types: Tensor, coords: Tensor) -> Tensor:
+    """Drop the zero-filled coordinate pairs of a sample.
+
+    Args:
+        types (Tensor): Command types of any shape, such as ``(seq_len,)``,
+            patched ``(num_patches, patch_size)``, or a concatenated batch.
+        coords (Tensor): Coordinates of shape ``(*types.shape, COORD_DIM)``.
+
+    Returns:
+        Tensor: Points of shape ``(num_points, 2)`` in command order.
+
+    Examples:
+        >>> points = compact_points(types, coords)
+        >>> points.size(0) == point_counts(types).sum()
+        True
+
+    """
+    return coords.reshape(-1, 3, 2)[_point_pairs(types).reshape(-1, 3)]
+
+
+def expand_points(types: Tensor, points: Tensor) -> Tensor:
+    """Scatter a compact point stream back into the ``COORD_DIM`` layout.
+
+    Points are written into the pairs that hold them in the default layout,
+    which is the last pair for ``moveTo`` and ``lineTo`` and all three pairs
+    for ``curveTo``; every other value is zero. The result matches what the
+    backend draws without ``compact``.
+
+    Args:
+        types (Tensor): Command types of any shape. A concatenated batch such
+            as :meth:`FontFolder.get_batch` output expands in one call.
+        points (Tensor): Points of shape ``(num_points, 2)`` matching
+            ``types``.
+
+    Returns:
+        Tensor: Coordinates of shape ``(*types.shape, COORD_DIM)`` with the
+        dtype and device of ``points``.
+
+    Raises:
+        ValueError: If the number of points does not match ``types``.
+
+    Examples:
+        Expand a compact batch before padding it::
+
+            batch = dataset.get_batch(indices)
+            coords = expand_points(batch.types, batch.coords)
+
+    """
+    pairs = _point_pairs(types)
+    expected = int(pairs.sum())
+    if points.size(0) != expected:
+        msg = f"types describe {expected} points, got {points.size(0)}"
+        raise ValueError(msg)
+
+    coords = points.new_zeros((*types.shape, 3, 2))
+    coords[pairs] = points
+    return coords.view(*types.shape, COORD_DIM)
+
+
+def point_counts(types: Tensor) -> Tensor:
+    """Return the number of points each command holds in the compact layout.
+
+    Args:
+        types (Tensor): Command types of any shape.
+
+    Returns:
+        Tensor: Long tensor with the shape of ``types``.
+
+    """
+    table = torch.tensor(POINTS_PER_TYPE, device=types.device)
+    return table[types.long()]
+
+
+def point_offsets(types: Tensor, offsets: Tensor) -> Tensor:
+    """Convert per-sample command offsets into offsets into the point stream.
+
+    Args:
+        types (Tensor): Concatenated command types whose first dimension is
+            delimited by ``offsets``; patched types count whole patches.
+        offsets (Tensor): Offsets of shape ``(B + 1,)`` into ``types``.
+
+    Returns:
+        Tensor: Long offsets of shape ``(B + 1,)`` into the point stream.
+
+    """
+    counts = point_counts(types).reshape(types.size(0), -1).sum(1)
+    ends = torch.cat((counts.new_zeros(1), counts.cumsum(0)))
+    return ends[offsets.long()]
+
+
+def _point_pairs(types: Tensor) -> Tensor:
+    # Which of the three coordinate pairs of every command hold a point.
+    pairs = torch.zeros(TYPE_DIM, 3, dtype=torch.bool, device=types.device)
+    pairs[TYPE_TO_IDX["moveTo"], 2] = True
+    pairs[TYPE_TO_IDX["lineTo"], 2] = True
+    pairs[TYPE_TO_IDX["curveTo"]] = True
+    return pairs[types.long()]
+
 
-__all__ = ["COORD_DIM", "TYPE_DIM", "TYPE_TO_IDX"]
+__all__ = [
+    "COORD_DIM",
+    "FIXED_POINT_SCALE",
+    "POINTS_PER_TYPE",
+    "TYPE_DIM",
+    "TYPE_TO_IDX",
+    "compact_points",
+    "expand_points",
+    "point_counts",
+    "point_offsets",
+]
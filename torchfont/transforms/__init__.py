@@ -14,14 +14,34 @@ Examples:
 
 """
 
+from torchfont.transforms.batch import (
+    BatchCompose,
+    BatchLimitSequenceLength,
+    BatchNormalize,
+    BatchPatchify,
+    BatchRandomAffine,
+    BatchRandomFlip,
+    BatchRandomJitter,
+)
 from torchfont.transforms.transforms import (
     Compose,
+    Dequantize,
     LimitSequenceLength,
+    NativeTransform,
     Patchify,
 )
 
 __all__ = [
+    "BatchCompose",
+    "BatchLimitSequenceLength",
+    "BatchNormalize",
+    "BatchPatchify",
+    "BatchRandomAffine",
+    "BatchRandomFlip",
+    "BatchRandomJitter",
     "Compose",
+    "Dequantize",
     "LimitSequenceLength",
+    "NativeTransform",
     "Patchify",
 ]
@@ -0,0 +1,458 @@
+"""Vectorized transforms and augmentations for padded glyph batches.
+
+Notes:
+    Every transform here takes and returns ``(types, coords, padding_mask)``
+    as produced by :class:`~torchfont.data.GlyphCollate`: ``types`` of shape
+    ``(B, L)``, ``coords`` of shape ``(B, L, 6)``, and a boolean
+    ``padding_mask`` of shape ``(B, L)`` that is ``True`` at padded steps.
+    Geometric transforms only touch coordinate pairs that hold points, so the
+    zero columns of ``moveTo``, ``lineTo``, ``closePath``, and ``eos`` rows
+    stay zero. Random transforms draw one set of parameters per glyph from an
+    optional :class:`torch.Generator`, which lets augmentation run once per
+    batch in the main process or on an accelerator instead of per sample in
+    every DataLoader worker.
+
+Examples:
+    Augment padded batches on the GPU::
+
+        augment = BatchCompose([
+            BatchNormalize(),
+            BatchRandomAffine(degrees=10.0, scale=(0.9, 1.1)),
+            BatchRandomJitter(std=0.01),
+        ])
+
+        for types, coords, padding_mask, style_idx, content_idx in loader:
+            types, coords, padding_mask = augment(
+                types.cuda(), coords.cuda(), padding_mask.cuda()
+            )
+
+"""
+
+import math
+from collections.abc import Callable, Sequence
+
+import torch
+from torch import Tensor
+
+from torchfont.io.outline import TYPE_TO_IDX
+
+BatchTransform = Callable[[Tensor, Tensor, Tensor], tuple[Tensor, Tensor, Tensor]]
+
+
+class BatchCompose:
+    """Apply a list of batch transforms in order.
+
+    See Also:
+        torchfont.transforms.Compose: Per-sample counterpart.
+
+    """
+
+    def __init__(self, transforms: Sequence[BatchTransform]) -> None:
+        """Store the ordered batch pipeline.
+
+        Args:
+            transforms (Sequence[BatchTransform]): Callables mapping
+                ``(types, coords, padding_mask)`` to the same triple.
+
+        Examples:
+            Truncate and patch padded batches::
+
+                BatchCompose([BatchLimitSequenceLength(512), BatchPatchify(32)])
+
+        """
+        self.transforms = transforms
+
+    def __call__(
+        self,
+        types: Tensor,
+        coords: Tensor,
+        padding_mask: Tensor,
+    ) -> tuple[Tensor, Tensor, Tensor]:
+        """Apply every transform in order.
+
+        Args:
+            types (Tensor): Padded command types.
+            coords (Tensor): Padded command coordinates.
+            padding_mask (Tensor): Boolean mask, ``True`` at padded steps.
+
+        Returns:
+            tuple[Tensor, Tensor, Tensor]: Batch after all transformations.
+
+        """
+        for t in self.transforms:
+            types, coords, padding_mask = t(types, coords, padding_mask)
+        return types, coords, padding_mask
+
+
+class BatchLimitSequenceLength:
+    """Trim padded batches to at most ``max_len`` steps.
+
+    See Also:
+        torchfont.transforms.LimitSequenceLength: Per-sample counterpart.
+
+    """
+
+    def __init__(self, max_len: int) -> None:
+        """Initialize the transform with the desired maximum length.
+
+        Args:
+            max_len (int): Maximum number of steps kept per glyph.
+
+        """
+        self.max_len = max_len
+
+    def __call__(
+        self,
+        types: Tensor,
+        coords: Tensor,
+        padding_mask: Tensor,
+    ) -> tuple[Tensor, Tensor, Tensor]:
+        """Slice the step dimension of every tensor.
+
+        Args:
+            types (Tensor): Command types of shape ``(B, L)``.
+            coords (Tensor): Coordinates of shape ``(B, L, 6)``.
+            padding_mask (Tensor): Mask of shape ``(B, L)``.
+
+        Returns:
+            tuple[Tensor, Tensor, Tensor]: Views holding at most ``max_len``
+            steps.
+
+        """
+        return (
+            types[:, : self.max_len],
+            coords[:, : self.max_len],
+            padding_mask[:, : self.max_len],
+        )
+
+
+class BatchPatchify:
+    """Pad padded batches to whole patches and reshape them.
+
+    See Also:
+        torchfont.transforms.Patchify: Per-sample counterpart.
+
+    """
+
+    def __init__(self, patch_size: int) -> None:
+        """Configure the patch length.
+
+        Args:
+            patch_size (int): Number of steps captured in each patch.
+
+        """
+        self.patch_size = patch_size
+
+    def __call__(
+        self,
+        types: Tensor,
+        coords: Tensor,
+        padding_mask: Tensor,
+    ) -> tuple[Tensor, Tensor, Tensor]:
+        """Reshape the step dimension into patches.
+
+        Args:
+            types (Tensor): Command types of shape ``(B, L)``.
+            coords (Tensor): Coordinates of shape ``(B, L, 6)``.
+            padding_mask (Tensor): Mask of shape ``(B, L)``.
+
+        Returns:
+            tuple[Tensor, Tensor, Tensor]: ``types`` of shape ``(B, N,
+            patch_size)``, ``coords`` of shape ``(B, N, patch_size, 6)``, and a
+            ``(B, N)`` mask that is ``True`` for patches made only of padding.
+
+        """
+        batch_size, seq_len = types.shape
+        pad = (-seq_len) % self.patch_size
+        num_patches = (seq_len + pad) // self.patch_size
+
+        types = torch.cat([types, types.new_zeros(batch_size, pad)], 1)
+        coords = torch.cat(
+            [coords, coords.new_zeros(batch_size, pad, coords.size(-1))], 1
+        )
+        padding_mask = torch.cat(
+            [padding_mask, padding_mask.new_ones(batch_size, pad)], 1
+        )
+
+        return (
+            types.view(batch_size, num_patches, self.patch_size),
+            coords.view(batch_size, num_patches, self.patch_size, -1),
+            padding_mask.view(batch_size, num_patches, self.patch_size).all(-1),
+        )
+
+
+class BatchNormalize:
+    """Fit every glyph's control box into ``[-1, 1]`` around its center.
+
+    The longer side of the box spans ``[-1, 1]`` and the aspect ratio is kept.
+    Glyphs without points, or whose points coincide, are left unchanged. This
+    matches ``NativeTransform(normalize=True)`` when no steps were truncated.
+
+    See Also:
+        torchfont.transforms.NativeTransform: Applies the same normalization
+        while glyphs are drawn.
+
+    """
+
+    def __call__(
+        self,
+        types: Tensor,
+        coords: Tensor,
+        padding_mask: Tensor,
+    ) -> tuple[Tensor, Tensor, Tensor]:
+        """Normalize the coordinates of every glyph in the batch.
+
+        Args:
+            types (Tensor): Command types of shape ``(B, ...)``.
+            coords (Tensor): Coordinates of shape ``(B, ..., 6)``.
+            padding_mask (Tensor): Padding mask, returned unchanged.
+
+        Returns:
+            tuple[Tensor, Tensor, Tensor]: Batch with normalized coordinates.
+
+        """
+        points, pairs = _points(types, coords)
+        low, high = _bounds(points, pairs)
+        half = (high - low).amax(-1, keepdim=True) / 2
+        center = (low + high) / 2
+        valid = half > 0
+        scale = torch.where(valid, half, torch.ones_like(half))
+        center = torch.where(valid, center, torch.zeros_like(center))
+
+        moved = (points - center.unsqueeze(1)) / scale.unsqueeze(1)
+        return types, _update(coords, points, pairs, moved), padding_mask
+
+
+class BatchRandomAffine:
+    """Apply a random rotation, scale, shear, and translation to every glyph.
+
+    Parameters are drawn independently for each glyph. The transform is
+    applied around the origin, so combine it with :class:`BatchNormalize`
+    first when glyphs should rotate about their own center.
+
+    """
+
+    def __init__(
+        self,
+        *,
+        degrees: float = 0.0,
+        scale: tuple[float, float] = (1.0, 1.0),
+        shear: float = 0.0,
+        translate: float = 0.0,
+        generator: torch.Generator | None = None,
+    ) -> None:
+        """Configure the sampling ranges.
+
+        Args:
+            degrees (float): Rotation is drawn from ``[-degrees, degrees]``.
+            scale (tuple[float, float]): Isotropic scale range.
+            shear (float): Horizontal shear angle in degrees, drawn from
+                ``[-shear, shear]``.
+            translate (float): Offsets along each axis are drawn from
+                ``[-translate, translate]``.
+            generator (torch.Generator | None): Source of randomness.
+
+        Examples:
+            Rotate by up to 15 degrees and scale by up to 10 percent::
+
+                BatchRandomAffine(degrees=15.0, scale=(0.9, 1.1))
+
+        """
+        self.degrees = degrees
+        self.scale = scale
+        self.shear = shear
+        self.translate = translate
+        self.generator = generator
+
+    def __call__(
+        self,
+        types: Tensor,
+        coords: Tensor,
+        padding_mask: Tensor,
+    ) -> tuple[Tensor, Tensor, Tensor]:
+        """Transform the coordinates of every glyph in the batch.
+
+        Args:
+            types (Tensor): Command types of shape ``(B, ...)``.
+            coords (Tensor): Coordinates of shape ``(B, ..., 6)``.
+            padding_mask (Tensor): Padding mask, returned unchanged.
+
+        Returns:
+            tuple[Tensor, Tensor, Tensor]: Batch with transformed coordinates.
+
+        """
+        batch_size = types.size(0)
+        draw = _Sampler(batch_size, coords, self.generator)
+        angle = draw.uniform(-self.degrees, self.degrees) * (math.pi / 180)
+        shear = draw.uniform(-self.shear, self.shear) * (math.pi / 180)
+        factor = draw.uniform(*self.scale)
+        offset = torch.stack(
+            [draw.uniform(-self.translate, self.translate) for _ in range(2)], -1
+        )
+
+        cos, sin = torch.cos(angle), torch.sin(angle)
+        rotation = torch.stack([cos, -sin, sin, cos], -1).view(batch_size, 2, 2)
+        shearing = torch.eye(2, dtype=coords.dtype, device=coords.device).repeat(
+            batch_size, 1, 1
+        )
+        shearing[:, 0, 1] = torch.tan(shear)
+        matrix = factor.view(-1, 1, 1) * rotation @ shearing
+
+        points, pairs = _points(types, coords)
+        moved = points @ matrix.transpose(1, 2) + offset.unsqueeze(1)
+        return types, _update(coords, points, pairs, moved), padding_mask
+
+
+class BatchRandomJitter:
+    """Add independent Gaussian noise to every point."""
+
+    def __init__(
+        self,
+        std: float,
+        *,
+        generator: torch.Generator | None = None,
+    ) -> None:
+        """Configure the noise level.
+
+        Args:
+            std (float): Standard deviation of the noise, in coordinate units.
+            generator (torch.Generator | None): Source of randomness.
+
+        """
+        self.std = std
+        self.generator = generator
+
+    def __call__(
+        self,
+        types: Tensor,
+        coords: Tensor,
+        padding_mask: Tensor,
+    ) -> tuple[Tensor, Tensor, Tensor]:
+        """Perturb the coordinates of every glyph in the batch.
+
+        Args:
+            types (Tensor): Command types of shape ``(B, ...)``.
+            coords (Tensor): Coordinates of shape ``(B, ..., 6)``.
+            padding_mask (Tensor): Padding mask, returned unchanged.
+
+        Returns:
+            tuple[Tensor, Tensor, Tensor]: Batch with perturbed coordinates.
+
+        """
+        points, pairs = _points(types, coords)
+        noise = _Sampler(types.size(0), coords, self.generator).normal(points.shape)
+        moved = points + self.std * noise
+        return types, _update(coords, points, pairs, moved), padding_mask
+
+
+class BatchRandomFlip:
+    """Mirror glyphs about the center of their control box.
+
+    Each glyph is flipped horizontally with probability ``p_x`` and vertically
+    with probability ``p_y``. Flipping reverses the winding direction of the
+    contours, which matters for models that rely on it.
+
+    """
+
+    def __init__(
+        self,
+        *,
+        p_x: float = 0.5,
+        p_y: float = 0.0,
+        generator: torch.Generator | None = None,
+    ) -> None:
+        """Configure the flip probabilities.
+
+        Args:
+            p_x (float): Probability of a horizontal flip.
+            p_y (float): Probability of a vertical flip.
+            generator (torch.Generator | None): Source of randomness.
+
+        """
+        self.p_x = p_x
+        self.p_y = p_y
+        self.generator = generator
+
+    def __call__(
+        self,
+        types: Tensor,
+        coords: Tensor,
+        padding_mask: Tensor,
+    ) -> tuple[Tensor, Tensor, Tensor]:
+        """Flip the selected glyphs of the batch.
+
+        Args:
+            types (Tensor): Command types of shape ``(B, ...)``.
+            coords (Tensor): Coordinates of shape ``(B, ..., 6)``.
+            padding_mask (Tensor): Padding mask, returned unchanged.
+
+        Returns:
+            tuple[Tensor, Tensor, Tensor]: Batch with flipped coordinates.
+
+        """
+        draw = _Sampler(types.size(0), coords, self.generator)
+        flip = torch.stack(
+            [draw.uniform(0.0, 1.0) < p for p in (self.p_x, self.p_y)], -1
+        )
+
+        points, pairs = _points(types, coords)
+        low, high = _bounds(points, pairs)
+        center = (low + high).nan_to_num(0.0) / 2
+        mirrored = 2 * center.unsqueeze(1) - points
+        moved = torch.where(flip.unsqueeze(1), mirrored, points)
+        return types, _update(coords, points, pairs, moved), padding_mask
+
+
+class _Sampler:
+    # Draws per-glyph parameters on the generator's device, then moves them to
+    # the batch device so CPU generators work with accelerator batches.
+    def __init__(
+        self,
+        batch_size: int,
+        like: Tensor,
+        generator: torch.Generator | None,
+    ) -> None:
+        self.batch_size = batch_size
+        self.like = like
+        self.generator = generator
+        self.device = generator.device if generator is not None else like.device
+
+    def uniform(self, low: float, high: float) -> Tensor:
+        values = torch.rand(
+            self.batch_size,
+            generator=self.generator,
+            device=self.device,
+            dtype=self.like.dtype,
+        )
+        return (low + (high - low) * values).to(self.like.device)
+
+    def normal(self, shape: torch.Size) -> Tensor:
+        values = torch.randn(
+            shape,
+            generator=self.generator,
+            device=self.device,
+            dtype=self.like.dtype,
+        )
+        return values.to(self.like.device)
+
+
+def _points(types: Tensor, coords: Tensor) -> tuple[Tensor, Tensor]:
+    # Returns every coordinate pair as ``(B, K, 2)`` points together with a
+    # ``(B, K)`` mask of the pairs that hold points.
+    pairs = torch.zeros(*types.shape, 3, dtype=torch.bool, device=types.device)
+    pairs[..., 2] = (types == TYPE_TO_IDX["moveTo"]) | (types == TYPE_TO_IDX["lineTo"])
+    pairs[types == TYPE_TO_IDX["curveTo"]] = True
+    batch_size = types.size(0)
+    return coords.reshape(batch_size, -1, 2), pairs.view(batch_size, -1)
+
+
+def _bounds(points: Tensor, pairs: Tensor) -> tuple[Tensor, Tensor]:
+    mask = pairs.unsqueeze(-1)
+    low = torch.where(mask, points, math.inf).amin(1)
+    high = torch.where(mask, points, -math.inf).amax(1)
+    return low, high
+
+
+def _update(coords: Tensor, points: Tensor, pairs: Tensor, moved: Tensor) -> Tensor:
+    updated = torch.where(pairs.unsqueeze(-1), moved, points)
+    return updated.view_as(coords)
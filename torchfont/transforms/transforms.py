@@ -17,6 +17,8 @@ from collections.abc import Callable, Sequence
 import torch
 from torch import Tensor
 
+from torchfont.io.outline import FIXED_POINT_SCALE, TYPE_TO_IDX, compact_points
+
 
 class Compose:
     """Apply a curated list of transform callables to every sample.
@@ -177,3 +179,184 @@ class Patchify:
         patch_coords = pad_coords.view(num_patches, self.patch_size, coords.size(1))
 
         return patch_types, patch_coords
+
+
+class Dequantize:
+    """Widen reduced-precision samples back to training dtypes.
+
+    Undoes the ``coords_dtype`` and ``types_dtype`` options of
+    :class:`~torchfont.datasets.FontFolder`: ``torch.int16`` fixed-point
+    coordinates are divided by
+    :data:`~torchfont.io.outline.FIXED_POINT_SCALE`, and half-precision
+    coordinates are cast. The transform is elementwise, so it applies equally
+    to single samples, patched samples, and whole padded batches, for example
+    after moving a batch to the GPU.
+
+    """
+
+    def __init__(
+        self,
+        *,
+        dtype: torch.dtype = torch.float32,
+        types_dtype: torch.dtype = torch.long,
+    ) -> None:
+        """Configure the output dtypes.
+
+        Args:
+            dtype (torch.dtype): Floating-point dtype of the returned
+                coordinates.
+            types_dtype (torch.dtype): Integer dtype of the returned command
+                types.
+
+        Examples:
+            Decode fixed-point samples on the GPU::
+
+                types, coords = Dequantize()(types.cuda(), coords.cuda())
+
+        """
+        self.dtype = dtype
+        self.types_dtype = types_dtype
+
+    def __call__(self, types: Tensor, coords: Tensor) -> tuple[Tensor, Tensor]:
+        """Convert a sample or batch.
+
+        Args:
+            types (Tensor): Tensor of pen command types.
+            coords (Tensor): Tensor of pen command coordinates.
+
+        Returns:
+            tuple[Tensor, Tensor]: ``types`` in ``types_dtype`` and ``coords``
+            in ``dtype``, scaled back to em units when they were fixed point.
+
+        """
+        types = types.to(self.types_dtype)
+        if coords.is_floating_point():
+            return types, coords.to(self.dtype)
+        return types, coords.to(self.dtype) / FIXED_POINT_SCALE
+
+
+class NativeTransform:
+    """Declarative glyph transform that the native backend can fuse into drawing.
+
+    Passed as the ``transform`` of :class:`~torchfont.datasets.FontFolder` (or
+    its subclasses), the spec is applied by the outline pen itself: drawing
+    stops storing commands past ``max_len``, coordinates are normalized in
+    place, and samples are written directly in the patched layout. Anywhere
+    else, calling the instance applies the same steps with tensor ops, so the
+    results match.
+
+    Steps run in a fixed order: drop ``closePath`` and ``eos`` commands when
+    disabled, normalize, truncate to ``max_len``, patch, then compact.
+
+    See Also:
+        Compose: Fallback for pipelines with arbitrary callables.
+
+    """
+
+    def __init__(
+        self,
+        *,
+        max_len: int | None = None,
+        patch_size: int | None = None,
+        normalize: bool = False,
+        close_path: bool = True,
+        eos: bool = True,
+        compact: bool = False,
+    ) -> None:
+        """Configure the fused transform.
+
+        Args:
+            max_len (int | None): Maximum number of commands kept, like
+                :class:`LimitSequenceLength`. ``None`` keeps every command.
+            patch_size (int | None): Pad and reshape samples into patches of
+                this many steps, like :class:`Patchify`. ``None`` keeps the
+                flat ``(seq_len,)`` layout.
+            normalize (bool): Whether to fit the control box of every glyph
+                into ``[-1, 1]`` around its center, preserving the aspect
+                ratio. The box covers the whole outline, including commands
+                dropped by ``max_len``.
+            close_path (bool): Whether to keep ``closePath`` commands.
+            eos (bool): Whether to keep the trailing ``eos`` command.
+            compact (bool): Whether to return ``coords`` as an
+                ``(num_points, 2)`` point stream without the zero-filled
+                pairs, like :func:`~torchfont.io.outline.compact_points`.
+                :func:`~torchfont.io.outline.expand_points` restores the
+                ``COORD_DIM`` layout.
+
+        Raises:
+            ValueError: If ``max_len`` or ``patch_size`` is not positive.
+
+        Examples:
+            Replace ``Compose([LimitSequenceLength(512), Patchify(32)])``::
+
+                NativeTransform(max_len=512, patch_size=32)
+
+        """
+        for name, value in (("max_len", max_len), ("patch_size", patch_size)):
+            if value is not None and value < 1:
+                msg = f"{name} must be positive, got {value}"
+                raise ValueError(msg)
+
+        self.max_len = max_len
+        self.patch_size = patch_size
+        self.normalize = normalize
+        self.close_path = close_path
+        self.eos = eos
+        self.compact = compact
+
+    def __call__(self, types: Tensor, coords: Tensor) -> tuple[Tensor, Tensor]:
+        """Apply the transform to an untransformed sample.
+
+        Args:
+            types (Tensor): Tensor of pen command types.
+            coords (Tensor): Tensor of pen command coordinates.
+
+        Returns:
+            tuple[Tensor, Tensor]: Transformed sample, patched when
+            ``patch_size`` is set and with compact ``coords`` when
+            ``compact`` is set.
+
+        Examples:
+            Apply the spec outside the native backend::
+
+                types, coords = NativeTransform(max_len=256)(types, coords)
+
+        """
+        dropped = [
+            TYPE_TO_IDX[name]
+            for name, keep in (("closePath", self.close_path), ("eos", self.eos))
+            if not keep
+        ]
+        if dropped:
+            keep = ~torch.isin(types, types.new_tensor(dropped))
+            types, coords = types[keep], coords[keep]
+        if self.normalize:
+            coords = _normalize(types, coords)
+        if self.max_len is not None:
+            types, coords = LimitSequenceLength(self.max_len)(types, coords)
+        if self.patch_size is not None:
+            types, coords = Patchify(self.patch_size)(types, coords)
+        if self.compact:
+            coords = compact_points(types, coords)
+        return types, coords
+
+
+def _normalize(types: Tensor, coords: Tensor) -> Tensor:
+    # Only the trailing pair of moveTo/lineTo rows and all pairs of curveTo
+    # rows hold points; the remaining zeros must stay untouched.
+    pairs = coords.new_zeros(types.size(0), 3, dtype=torch.bool)
+    pairs[:, 2] = (types == TYPE_TO_IDX["moveTo"]) | (types == TYPE_TO_IDX["lineTo"])
+    pairs[types == TYPE_TO_IDX["curveTo"]] = True
+
+    points = coords.view(-1, 3, 2)[pairs]
+    if points.size(0) == 0:
+        return coords
+    low, high = points.amin(0), points.amax(0)
+    half = (high - low).max() / 2
+    if half <= 0:
+        return coords
+
+    center = (low + high) / 2
+    normalized = coords.clone().view(-1, 3, 2)
+    normalized[pairs] = (points - center) / half
+    return normalized.view_as(coords)